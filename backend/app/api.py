@@ -1,5 +1,5 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -10,15 +10,23 @@ import uvicorn
 import json
 import time
 import sqlite3
+import hashlib
+import logging
 
 # Add backend to path
 SQLITE_DB_PATH = Path("backend/data/legali.db")
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from backend.app.correspondence import CorrespondenceTable
+from backend.app.profiler import PROFILE_ENABLED, PROFILE_HEADER, request_profile, reset_profile_request
 from backend.app.rag import LegalRAG
+from backend.app.streaming import guard_stream, sse_event
+from backend.app.tracing import render_metrics
 
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger("LEGALI")
+
 app = FastAPI(
     title="LEGALI API",
     description="API for Indian Criminal Law RAG System",
@@ -34,6 +42,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in profiling of single requests (only when LEGALI_PROFILE=1; see app/profiler.py)
+if PROFILE_ENABLED:
+    @app.middleware("http")
+    async def profile_header(request: Request, call_next):
+        if request.headers.get(PROFILE_HEADER, "").lower() not in ("1", "true", "yes"):
+            return await call_next(request)
+        token = request_profile()
+        try:
+            return await call_next(request)
+        finally:
+            reset_profile_request(token)
+
 # Initialize RAG System
 # We initialize it at module level so it persists across requests
 try:
@@ -55,6 +75,11 @@ class StreamRequest(BaseModel):
     query: str
     session_id: str
 
+class BatchRequest(BaseModel):
+    questions: List[str]
+    top_k: int = 5
+    concurrency: int = 4
+
 class Citation(BaseModel):
     act: str
     section: str
@@ -103,8 +128,14 @@ def get_session_messages(session_id: str):
     except Exception as e:
         return {"error": str(e)}
 
+# Headers for SSE responses: stop proxies (nginx etc.) from buffering frames
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
 @app.post("/chat")
-def query_rag(request: QueryRequest):
+def query_rag(request: QueryRequest, http_request: Request):
     if not rag:
         raise HTTPException(status_code=500, detail="RAG system not initialized")
     
@@ -112,19 +143,20 @@ def query_rag(request: QueryRequest):
     history = getattr(request, 'history', []) 
     
     return StreamingResponse(
-        rag.stream_search(query, history=history),
-        media_type="text/event-stream"
+        guard_stream(rag.stream_search(query, history=history), http_request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
     )
 
 @app.post("/chat/stream")
-def chat_stream(request: StreamRequest):
+def chat_stream(request: StreamRequest, http_request: Request):
     if not rag:
         raise HTTPException(status_code=500, detail="RAG system not initialized")
     
     session_id = request.session_id
     query = request.query
     
-    print(f"Incoming Stream Request: {query} (Session: {session_id})")
+    logger.info("Incoming Stream Request", extra={"fields": {"query": query, "session_id": session_id}})
     
     # 1. Get History (Now handled primarily by DB logic on frontend/rag sides, but sticking with payload history if needed)
     # The frontend is sending history in the /chat route, but not in StreamRequest.
@@ -132,17 +164,110 @@ def chat_stream(request: StreamRequest):
     history = []
     
     # 2. Generator Wrapper
-    def iter_stream():
+    async def iter_stream():
         try:
             # Call RAG Generator
-            for chunk_str in rag.stream_search(query, history=history, session_id=session_id):
+            async for chunk_str in rag.stream_search(query, history=history, session_id=session_id):
                 yield chunk_str
         except Exception as e:
             # Yield error in SSE format
-            err_json = json.dumps({"type": "error", "data": str(e)})
-            yield f"data: {err_json}\\n\\n"
+            yield sse_event({"type": "error", "data": str(e)})
+
+    return StreamingResponse(
+        guard_stream(iter_stream(), http_request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+MAX_BATCH_QUESTIONS = 64
+
+@app.post("/chat/batch")
+def chat_batch(request: BatchRequest):
+    """
+    Answers many questions in one request with shared batched retrieval.
+    Streams one JSON object per line (NDJSON) in completion order; each carries its "index".
+    """
+    if not rag:
+        raise HTTPException(status_code=500, detail="RAG system not initialized")
+    if not request.questions:
+        raise HTTPException(status_code=400, detail="questions must not be empty")
+    if len(request.questions) > MAX_BATCH_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUESTIONS} questions per batch")
+
+    async def iter_ndjson():
+        async for result in rag.batch_query(
+            request.questions, top_k=request.top_k, concurrency=request.concurrency
+        ):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(iter_ndjson(), media_type="application/x-ndjson")
+
+# /search responses only change when the corpus does, so let CDNs/proxies cache them
+SEARCH_CACHE_MAX_AGE = 3600
+MAX_SEARCH_K = 50
+
+@app.get("/search")
+def search(http_request: Request, q: str, act: Optional[str] = None, k: int = 10):
+    """
+    Retrieval-only endpoint: ranked statute chunks without an LLM answer.
+    The ETag is derived from the corpus digest and the normalized query parameters.
+    """
+    if not rag:
+        raise HTTPException(status_code=500, detail="RAG system not initialized")
+
+    query = " ".join(q.split())
+    act = act.strip() if act and act.strip() else None
+    if not query:
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    if not 1 <= k <= MAX_SEARCH_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_SEARCH_K}")
+
+    key = json.dumps([rag.corpus_digest, query, act, k])
+    etag = '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={SEARCH_CACHE_MAX_AGE}",
+    }
+
+    if_none_match = http_request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    results = rag.search(query, act=act, k=k)
+    return JSONResponse({"query": query, "act": act, "k": k, "results": results}, headers=headers)
+
+@app.get("/sections/{act}/{number}/neighbours")
+def section_neighbours(act: str, number: str):
+    """Sections cited by and citing one statute section (from the cross-reference graph)."""
+    if not rag:
+        raise HTTPException(status_code=500, detail="RAG system not initialized")
+
+    act, number = act.strip().upper(), number.strip().upper()
+    result = rag.section_neighbours(act, number)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Unknown section: {act} {number}")
+    return result
+
+@app.get("/correspondence/{code}/{section}")
+def correspondence(code: str, section: str):
+    """
+    New-code section(s) for a repealed-code section, e.g. /correspondence/IPC/302 -> BNS 103.
+    Pure table lookup: no embedding, search or LLM call.
+    """
+    table = rag.correspondence if rag else CorrespondenceTable.load()
+    code, section = code.strip().upper(), section.strip().upper()
+    if code not in table.codes:
+        raise HTTPException(status_code=404, detail=f"Unknown code: {code}. Expected one of {sorted(table.codes)}")
+
+    targets = table.lookup(code, section)
+    if not targets:
+        raise HTTPException(status_code=404, detail=f"No correspondence for {code} section {section}")
+    return {"code": code, "name": table.codes[code].get("name", code), "section": section, "targets": targets}
 
-    return StreamingResponse(iter_stream(), media_type="text/event-stream")
+@app.get("/metrics")
+def metrics():
+    """Per-stage and per-request latency histograms plus request counters, in the Prometheus text format."""
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # Mount frontend directory to serve static UI
 frontend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../frontend"))
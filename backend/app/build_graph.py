@@ -0,0 +1,267 @@
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from backend.app.pdf_extract import file_sha256
+
+# Each stage writes <first output dir>/<stage>.manifest.json with the hashes it was built from
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+# Directories (e.g. the Chroma store) are tracked by existence only
+DIRECTORY_DIGEST = "directory"
+
+# Final states of a stage after BuildGraph.run
+BUILT = "built"
+FRESH = "fresh"
+WOULD_BUILD = "would-build"
+UNAVAILABLE = "unavailable"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+class Stage:
+    """
+    One build step: a command run from the repo root that turns `inputs` into `outputs`.
+    `code` lists the source files whose content versions the stage;
+    `optional` inputs are hashed when present but do not block the stage when absent.
+    """
+
+    def __init__(self, name, cmd, inputs=(), outputs=(), code=(), optional=()):
+        if not outputs:
+            raise ValueError(f"Stage '{name}' declares no outputs")
+        self.name = name
+        self.cmd = [str(c) for c in cmd]
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.code = [Path(p) for p in code]
+        self.optional = [Path(p) for p in optional]
+
+    @property
+    def manifest_path(self):
+        return self.outputs[0].parent / f"{self.name}{MANIFEST_SUFFIX}"
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class BuildGraph:
+    """
+    Content-addressed DAG of stages. Dependencies are inferred from paths:
+    a stage depends on whichever stage produces one of its inputs.
+    A stage re-runs only when the hash of its inputs + code + command differs from its manifest,
+    or when its outputs are missing or were modified since they were built.
+    """
+
+    def __init__(self, stages, root):
+        self.root = Path(root)
+        self.stages = {}
+        producers = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+            for out in stage.outputs:
+                if out in producers:
+                    raise ValueError(f"{out} is produced by both '{producers[out]}' and '{stage.name}'")
+                producers[out] = stage.name
+
+        self.deps = {
+            stage.name: sorted({producers[p] for p in stage.inputs + stage.optional if p in producers})
+            for stage in stages
+        }
+        self._digests = {}
+        self.order = self._toposort()
+
+    def _toposort(self):
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in build graph: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.deps[name]:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def upstream(self, targets):
+        """`targets` plus everything they (transitively) depend on, in build order."""
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise KeyError(f"Unknown stage(s): {sorted(unknown)}")
+        selected, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.deps[name])
+        return [name for name in self.order if name in selected]
+
+    # ---------------- hashing ----------------
+
+    def digest(self, path):
+        """sha256 of a file (memoized on size + mtime), DIRECTORY_DIGEST for directories, None if absent."""
+        full = self.root / path
+        if full.is_dir():
+            return DIRECTORY_DIGEST
+        try:
+            st = full.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self._digests.get(full)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        value = file_sha256(full)
+        self._digests[full] = (stamp, value)
+        return value
+
+    def fingerprint(self, stage):
+        inputs = {str(p): self.digest(p) for p in stage.inputs + stage.optional}
+        code = {str(p): self.digest(p) for p in stage.code}
+        payload = json.dumps({"cmd": stage.cmd[1:], "inputs": inputs, "code": code}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest(), inputs, code
+
+    def load_manifest(self, stage):
+        path = self.root / stage.manifest_path
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def check(self, stage, force=False):
+        """Returns (state, reason): state is FRESH, UNAVAILABLE or None (stale)."""
+        missing = [str(p) for p in stage.inputs if self.digest(p) is None]
+        if missing:
+            return UNAVAILABLE, f"missing inputs: {', '.join(missing)}"
+
+        key, inputs, code = self.fingerprint(stage)
+        if force:
+            return None, "forced"
+
+        manifest = self.load_manifest(stage)
+        if manifest is None:
+            return None, "never built"
+        if manifest.get("key") != key:
+            changed = [p for p, d in inputs.items() if manifest.get("inputs", {}).get(p) != d]
+            changed += [p for p, d in code.items() if manifest.get("code", {}).get(p) != d]
+            return None, f"changed: {', '.join(changed) or 'command'}"
+        for out, recorded in manifest.get("outputs", {}).items():
+            current = self.digest(Path(out))
+            if current is None:
+                return None, f"missing output: {out}"
+            if current != recorded:
+                return None, f"modified output: {out}"
+        return FRESH, "up to date"
+
+    # ---------------- execution ----------------
+
+    def execute(self, stage):
+        """Runs the stage command from the repo root and records its manifest. Returns (ok, log)."""
+        start = time.monotonic()
+        proc = subprocess.run(
+            stage.cmd, cwd=self.root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        elapsed = time.monotonic() - start
+        if proc.returncode != 0:
+            return False, f"exit code {proc.returncode}\n{proc.stdout}"
+
+        missing = [str(p) for p in stage.outputs if self.digest(p) is None]
+        if missing:
+            return False, f"did not produce: {', '.join(missing)}\n{proc.stdout}"
+
+        # Hash inputs after the run so the manifest matches what the command actually read
+        key, inputs, code = self.fingerprint(stage)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "stage": stage.name,
+            "key": key,
+            "cmd": stage.cmd[1:],
+            "inputs": inputs,
+            "code": code,
+            "outputs": {str(p): self.digest(p) for p in stage.outputs},
+            "seconds": round(elapsed, 3),
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        path = self.root / stage.manifest_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return True, proc.stdout
+
+    def run(self, targets=None, jobs=4, dry_run=False, force=(), log=print):
+        """
+        Builds `targets` (default: everything) and their upstream stages.
+        Ready stages run in parallel (up to `jobs`); a stage is checked only once all its
+        dependencies finished, so an upstream rebuild with identical output does not cascade.
+        Returns {stage: state}.
+        """
+        selected = self.upstream(targets) if targets else list(self.order)
+        force = set(force)
+        states, reasons = {}, {}
+        pending = list(selected)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = [d for d in self.deps[name] if d in selected]
+                    if any(d not in states for d in deps):
+                        continue
+                    pending.remove(name)
+                    stage = self.stages[name]
+
+                    if any(states[d] in (FAILED, BLOCKED) for d in deps):
+                        states[name], reasons[name] = BLOCKED, "upstream failed"
+                    elif dry_run and any(states[d] == WOULD_BUILD for d in deps):
+                        states[name], reasons[name] = WOULD_BUILD, "upstream rebuild"
+                    else:
+                        state, reason = self.check(stage, force=name in force)
+                        if state is not None:
+                            states[name], reasons[name] = state, reason
+                        elif dry_run:
+                            states[name], reasons[name] = WOULD_BUILD, reason
+                        else:
+                            log(f"[{name}] building ({reason})")
+                            running[pool.submit(self.execute, stage)] = name
+                            continue
+                    log(f"[{name}] {states[name]} ({reasons[name]})")
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        ok, output = future.result()
+                    except Exception as e:
+                        ok, output = False, repr(e)
+                    states[name] = BUILT if ok else FAILED
+                    for line in output.strip().splitlines():
+                        log(f"[{name}]   {line}")
+                    log(f"[{name}] {states[name]}")
+
+        return {name: states[name] for name in selected}
+
+
+def summarize(states):
+    counts = {}
+    for state in states.values():
+        counts[state] = counts.get(state, 0) + 1
+    return ", ".join(f"{n} {state}" for state, n in sorted(counts.items()))
+
+
+def python_stage(name, script, args=(), **kwargs):
+    """Stage running a repo script with the current interpreter."""
+    return Stage(name, [sys.executable, script, *args], **kwargs)
@@ -0,0 +1,176 @@
+import json
+import re
+from pathlib import Path
+
+CORRESPONDENCE_FILE = Path("backend/data/final/legali_correspondence.json")
+
+SECTION_NUMBER = r"(?P<num>\d+[A-Za-z]{0,2})"
+SUBSECTIONS = r"(?:\s*\(\w+\))*"
+SECTION_WORD = r"(?:sections?|sec\.?|s\.|u/s\.?)"
+# Repealed codes (keys of the table) and the 2023 codes, as users spell them
+LEGACY_CODES = {
+    "IPC": r"I\.?P\.?C\.?|Indian Penal Code",
+    "CRPC": r"Cr\.?\s?P\.?\s?C\.?|Code of Criminal Procedure",
+    "IEA": r"I\.?E\.?A\.?|(?:Indian\s+)?Evidence Act",
+}
+NEW_CODES = {
+    "BNSS": r"BNSS|Bharatiya Nagarik Suraksha Sanhita",
+    "BNS": r"BNS|Bharatiya Nyaya Sanhita",
+    "BSA": r"BSA|Bharatiya Sakshya Adhiniyam",
+}
+CODE_PATTERN = "|".join(f"(?P<{code}>{alias})" for code, alias in {**LEGACY_CODES, **NEW_CODES}.items())
+
+# "section 302 IPC", "s. 438 of the CrPC", "IPC 420", "IPC section 498A", "65B Evidence Act"
+CITATION_PATTERNS = [
+    re.compile(rf"\b{SECTION_WORD}\s*{SECTION_NUMBER}{SUBSECTIONS}\s*(?:of\s+(?:the\s+)?)?(?:{CODE_PATTERN})(?![A-Za-z])", re.I),
+    re.compile(rf"\b(?:{CODE_PATTERN})\s*(?:{SECTION_WORD}\s*)?{SECTION_NUMBER}\b", re.I),
+    re.compile(rf"\b{SECTION_NUMBER}{SUBSECTIONS}\s+(?:of\s+(?:the\s+)?)?(?:{CODE_PATTERN})(?![A-Za-z])", re.I),
+]
+# Words that do not turn a bare citation ("what is section 302 IPC?") into a question needing search
+LOOKUP_FILLER = frozenset(
+    "what is are the a an of under in section sections sec s u/s explain tell me about define "
+    "provision provisions law now new old corresponding equivalent which does say says".split()
+)
+
+
+def normalize_title(title):
+    """Letters and digits only, lower case, without a leading "63." (corpus titles vary in spacing/punctuation)."""
+    title = re.sub(r"^\s*\d+[A-Z]?\.\s*", "", str(title))
+    return re.sub(r"[^a-z0-9]", "", title.lower())
+
+
+def titles_match(expected, actual):
+    a, b = normalize_title(expected), normalize_title(actual)
+    if not (a and b):
+        return False
+    # Corpus titles are sometimes truncated or carry the next heading; a stub like "Saving" is not a match
+    short, long = sorted((a, b), key=len)
+    return long.startswith(short) and len(short) * 2 >= len(long)
+
+
+def find_citations(text):
+    """
+    Section citations naming a code, in order: [(code, number, start, end)].
+    `code` is a key of LEGACY_CODES or NEW_CODES; bare "section 302" is ambiguous and not returned.
+    """
+    found = []
+    for pattern in CITATION_PATTERNS:
+        for m in pattern.finditer(text):
+            if any(m.start() < end and start < m.end() for _, _, start, end in found):
+                continue
+            code = next(name for name, value in m.groupdict().items() if value and name != "num")
+            found.append((code, m.group("num").upper(), m.start(), m.end()))
+    return sorted(found, key=lambda c: c[2])
+
+
+class CorrespondenceTable:
+    """
+    Old-code -> new-code section table (IPC -> BNS, CrPC -> BNSS, IEA -> BSA), held in dicts.
+    Each target carries its official section number and title; `verify` checks those against the
+    corpus and records the corpus section that actually holds the provision.
+    """
+
+    def __init__(self, codes=None, sections=None):
+        self.codes = codes or {}
+        self.sections = sections or {}
+
+    def __len__(self):
+        return sum(len(v) for v in self.sections.values())
+
+    @classmethod
+    def load(cls, path=CORRESPONDENCE_FILE):
+        """Empty table when the file is missing."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("codes"), data.get("sections"))
+
+    def lookup(self, code, section):
+        """New-code targets of an old-code section: [{"act", "section", "subsection", "title", "corpus_section"}]."""
+        code = code.upper()
+        targets = self.sections.get(code, {}).get(str(section).upper(), [])
+        act = self.codes.get(code, {}).get("act")
+        return [
+            {
+                "act": act,
+                "section": t["section"],
+                "subsection": t.get("subsection"),
+                "title": t.get("title", ""),
+                "corpus_section": t.get("corpus_section", t["section"]),
+            }
+            for t in targets
+        ]
+
+    def verify(self, titles):
+        """
+        Checks every target against corpus titles ({(act, number): title}).
+        A target whose title sits under a different corpus number (parser numbering drift) is pointed
+        at that number; returns human-readable issues for targets that could not be confirmed.
+        """
+        by_act = {}
+        for (act, number), title in titles.items():
+            by_act.setdefault(act, []).append((number, title))
+
+        issues = []
+        for code, table in self.sections.items():
+            act = self.codes.get(code, {}).get("act")
+            for old, targets in table.items():
+                for target in targets:
+                    target.pop("corpus_section", None)
+                    actual = titles.get((act, target["section"]))
+                    if actual is not None and titles_match(target["title"], actual):
+                        continue
+                    candidates = by_act.get(act, [])
+                    expected = normalize_title(target["title"])
+                    moved = [n for n, t in candidates if normalize_title(t) == expected]
+                    moved = moved or [n for n, t in candidates if titles_match(target["title"], t)]
+                    if len(moved) == 1:
+                        target["corpus_section"] = moved[0]
+                        issues.append(f"{code} {old} -> {act} {target['section']}: found in corpus as {act} {moved[0]}")
+                    elif actual is None:
+                        issues.append(f"{code} {old} -> {act} {target['section']}: section not in corpus")
+                    else:
+                        issues.append(f"{code} {old} -> {act} {target['section']}: corpus title is {actual!r}")
+        return issues
+
+    def resolve(self, query):
+        """
+        Rewrites legacy citations in `query` to their new-code sections.
+        Returns (rewritten_query, sections, notes): `sections` are corpus (act, number) keys for every
+        cited section (legacy or new), `notes` explain each legacy mapping for the answer prompt.
+        """
+        parts, sections, notes = [], [], []
+        last = 0
+        for code, number, start, end in find_citations(query):
+            if code in NEW_CODES:
+                key = (code, number)
+                if key not in sections:
+                    sections.append(key)
+                continue
+            targets = self.lookup(code, number)
+            if not targets:
+                continue
+            labels = []
+            for t in targets:
+                key = (t["act"], t["corpus_section"])
+                if key not in sections:
+                    sections.append(key)
+                labels.append(f"{t['act']} section {t['section']}{t['subsection'] or ''}")
+            new = " and ".join(labels)
+            parts.append(query[last:start])
+            parts.append(f"{new} (formerly {code} section {number})")
+            last = end
+            notes.append(f"{code} section {number} corresponds to {new} ({'; '.join(t['title'] for t in targets)})")
+        parts.append(query[last:])
+        return "".join(parts), sections, notes
+
+
+def is_section_lookup(query):
+    """True when `query` is only citations plus filler words ("what is section 302 IPC?")."""
+    rest = query
+    for _, _, start, end in reversed(find_citations(query)):
+        rest = rest[:start] + " " + rest[end:]
+    words = re.findall(r"[a-z/]+", rest.lower())
+    return all(w in LOOKUP_FILLER for w in words)
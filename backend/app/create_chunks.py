@@ -14,19 +14,38 @@ CHARS_PER_TOKEN = 4
 MIN_CHARS = MIN_TOKENS * CHARS_PER_TOKEN
 MAX_CHARS = MAX_TOKENS * CHARS_PER_TOKEN
 
+# Precompiled structural delimiters (compiled once, reused at every recursion level)
+# Sentence boundary: [.!?] followed by space and capital letter, digit or "(" (start of next sentence).
+# Legal text has abbreviations "Sec.", "No." etc. - sentences are re-merged afterwards anyway.
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9\(])')
+# Sub-structures: (1), (2), (a), (b), Explanation, Illustration.
+# Capturing group keeps the delimiter so it can start the NEW atom.
+SUBSTRUCTURE = re.compile(r'(Explanation|Illustration|\(\d+\)|\([a-z]\))')
+
 def count_tokens(text):
     return len(text) // CHARS_PER_TOKEN
 
 def split_into_sentences(text):
-    # Basic sentence splitter
-    # Look for [.!?] followed by space and capital letter or digit (start of next sentence)
-    # But legal text has abbreviations "Sec.", "No." etc.
-    # We'll use a slightly robust regex but rely on recombining.
-    return re.split(r'(?<=[.!?])\s+(?=[A-Z0-9\(])', text)
+    return SENTENCE_BOUNDARY.split(text)
+
+def _split_substructures(text):
+    """[Pre, Delim1, Post1, Delim2, Post2...] -> [Pre, Delim1+Post1, Delim2+Post2, ...]"""
+    parts = SUBSTRUCTURE.split(text)
+    blocks = []
+    if parts[0].strip():
+        blocks.append(parts[0].strip())
+    for i in range(1, len(parts), 2):
+        block = (parts[i] + (parts[i + 1] if i + 1 < len(parts) else "")).strip()
+        if block:
+            blocks.append(block)
+    return blocks
 
 def recursive_split(text):
     """
     Splits text into atomic units based on legal structure boundaries.
+    Level 1: newlines, Level 2: sub-structures, Level 3: sentences.
+    Sentences are packed back together up to MAX_CHARS so Level 3 never
+    emits sentence-sized fragments.
     """
     # Base case
     if count_tokens(text) <= MAX_TOKENS:
@@ -34,10 +53,8 @@ def recursive_split(text):
 
     # Level 1: Split by Newlines
     if '\n' in text:
-        parts = text.split('\n')
-        parts = [p.strip() for p in parts if p.strip()]
-        
-        # If splitting by newline didn't change anything (e.g. single line), proceed to Level 2
+        parts = [p.strip() for p in text.split('\n') if p.strip()]
+        # Only recurse if splitting made progress (avoids infinite recursion on a single line)
         if len(parts) > 1 or (len(parts) == 1 and parts[0] != text):
             final_atoms = []
             for p in parts:
@@ -45,89 +62,86 @@ def recursive_split(text):
             return final_atoms
 
     # Level 2: Split by Sub-structures
-    # Usage of capturing group to keep the delimiter
-    # Delimiters: (1), (2), (a), (b), Explanation, Illustration
-    # We want the delimiter to start the NEW chunk.
-    # regex: ( (?:Explanation|Illustration|\(\d+\)|\([a-z]\)) )
-    # Note: \(\d+\) matches (1), (10). \([a-z]\) matches (a).
-    
-    delimiters = r'(Explanation|Illustration|\(\d+\)|\([a-z]\))'
-    # Check if text actually contains these before splitting
-    if re.search(delimiters, text):
-        parts = re.split(delimiters, text)
-        # Result: [Pre, Delim1, Post1, Delim2, Post2...]
-        # We want to combine Delim + Post
-        
-        recombined = []
-        current_atom = ""
-        
-        # The first part is 'Pre' (before first delim). Might be empty or intro text.
-        if parts[0].strip():
-            recombined.append(parts[0].strip())
-            
-        # Iterate pairs
-        for i in range(1, len(parts), 2):
-            delim = parts[i]
-            content = parts[i+1] if i+1 < len(parts) else ""
-            
-            # Form block
-            block = (delim + content).strip()
-            if block:
-                recombined.append(block)
-                
-        # Critical check: Did we actually split?
-        # If recombined has 1 element and it's equal to text, we failed to split effectively -> infinite loop.
-        if len(recombined) > 1 or (len(recombined) == 1 and len(recombined[0]) < len(text)):
+    if SUBSTRUCTURE.search(text):
+        blocks = _split_substructures(text)
+        if len(blocks) > 1 or (len(blocks) == 1 and len(blocks[0]) < len(text)):
             final_atoms = []
-            for p in recombined:
-                final_atoms.extend(recursive_split(p))
+            for b in blocks:
+                final_atoms.extend(recursive_split(b))
             return final_atoms
 
-    # Level 3: Split by Sentences
+    # Level 3: Split by Sentences, then pack them back up to the target size
     sentences = split_into_sentences(text)
     if len(sentences) > 1:
-        # Check progress
-        if len(sentences) > 1:
-             return sentences
-        
+        return merge_chunks(sentences, separator=" ")
+
     return [text]
 
-def merge_chunks(atoms):
+def merge_chunks(atoms, separator="\n"):
     """
-    Merges atomic text units into chunks of valid size (400-700 tokens).
+    Merges atomic text units into chunks of valid size (<= 700 tokens) in one pass.
+    Keeps a running character count instead of re-measuring the growing chunk,
+    so the cost is linear in the total text size.
+    An atom that is alone larger than the limit becomes its own chunk.
     """
     chunks = []
-    current_chunk = ""
-    
+    current = []
+    current_len = 0
+    sep_len = len(separator)
+
     for atom in atoms:
-        # Check size if we add this atom
-        proposed_text = (current_chunk + "\n" + atom).strip()
-        proposed_size = count_tokens(proposed_text)
-        
-        if proposed_size > MAX_TOKENS:
-            # Current chunk is full-ish.
-            # But wait, if current_chunk is EMPTY (atom itself is > MAX), we force add it.
-            if not current_chunk:
+        atom = atom.strip()
+        if not atom:
+            continue
+
+        proposed_len = current_len + sep_len + len(atom) if current else len(atom)
+        if proposed_len // CHARS_PER_TOKEN > MAX_TOKENS:
+            if not current:
                 chunks.append(atom)
-            else:
-                chunks.append(current_chunk)
-                current_chunk = atom
+                continue
+            chunks.append(separator.join(current))
+            current = [atom]
+            current_len = len(atom)
         else:
-            # It fits
-            current_chunk = proposed_text
-            
+            current.append(atom)
+            current_len = proposed_len
+
     # Add remnant
-    if current_chunk:
-        chunks.append(current_chunk)
-        
-    # Optimization pass?
-    # Ensure chunks are at least MIN_TOKENS if possible?
-    # The prompt mainly stressed MAX size (split long sections).
-    # But "Chunk size: 400-700 tokens" implies 400 is desired min.
-    # Simply grouping sequentially is best effort.
-    
+    if current:
+        chunks.append(separator.join(current))
+
     return chunks
 
+def chunk_section(text):
+    """Structural split followed by size-bounded re-merge."""
+    return merge_chunks(recursive_split(text))
+
+def build_chunks(corpus):
+    """
+    Chunks every section. Ids are `<act>-<number>-<index>` with the index counted per
+    (act, number), so they are deterministic and unique even if a section number repeats.
+    """
+    output = []
+    next_index = {}
+
+    for item in corpus:
+        key = (item['act'], item['number'])
+        header = f"ACT: {item['act']} | SECTION: {item['number']} - {item['title']}\n"
+
+        for chunk_txt in chunk_section(item['text']):
+            idx = next_index.get(key, 0) + 1
+            next_index[key] = idx
+            output.append({
+                "id": f"{item['act']}-{item['number']}-{idx}",
+                "act": item['act'],
+                "chapter": item['chapter'],
+                "number": item['number'],
+                "title": item['title'],
+                "chunk_index": idx,
+                "text": header + chunk_txt
+            })
+    return output
+
 def process_corpus():
     if not INPUT_FILE.exists():
         print(f"Input file {INPUT_FILE} missing.")
@@ -135,37 +149,14 @@ def process_corpus():
 
     with open(INPUT_FILE, 'r', encoding='utf-8') as f:
         corpus = json.load(f)
-        
-    final_output = []
-    
+
     print(f"Loaded {len(corpus)} sections. Starting chunking...")
-    
-    for item in corpus:
-        text = item['text']
-        
-        # 1. Break into smallest legal units (Atoms)
-        atoms = recursive_split(text)
-        
-        # 2. Contextual Prepending for Each Atom (1 atom = 1 chunk)
-        for idx, atom_txt in enumerate(atoms, 1):
-            chunk_id = f"{item['act']}-{item['number']}-{idx}"
-            chunk_text = f"ACT: {item['act']} | SECTION: {item['number']} - {item['title']}\n{atom_txt}"
-            
-            chunk_obj = {
-                "id": chunk_id,
-                "act": item['act'],
-                "chapter": item['chapter'],
-                "number": item['number'],
-                "title": item['title'],
-                "chunk_index": idx,
-                "text": chunk_text
-            }
-            final_output.append(chunk_obj)
-            
+    final_output = build_chunks(corpus)
+
     # Write
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         json.dump(final_output, f, indent=2, ensure_ascii=False)
-        
+
     print(f"Generated {len(final_output)} chunks.")
     print(f"Saved to {OUTPUT_FILE}")
 
@@ -0,0 +1,229 @@
+import json
+import re
+from collections import deque
+from pathlib import Path
+
+INPUT_FILE = Path("backend/data/final/legali_corpus.json")
+OUTPUT_FILE = Path("backend/data/final/legali_definitions.json")
+DEFINITIONS_VERSION = 1
+
+# "Definitions." sections are split into clauses; "Cruelty defined." sections define their title
+DEFINITIONS_TITLE = re.compile(r"^(?:\d+\.\s*)?Definitions?\b")
+DEFINED_TITLE = re.compile(r"^(?:\d+\.\s*)?(?P<terms>.+?)\s+defined\.?$")
+# "(3) “child” means ..." / "(b) "bailable offence" means ..."
+CLAUSE_START = re.compile(r"\((?P<clause>\d{1,3}[A-Z]?|[a-z]{1,4})\)\s*[“\"](?P<term>[^”\"]{1,80})[”\"]")
+# Further terms defined inside a clause: ... and "non-bailable offence" means any other offence
+DEFINED_TERM = re.compile(r"[“\"](?P<term>[^”\"]{1,80})[”\"]\s*,?\s*(?:means|includes|denotes|shall mean|shall include)\b")
+# Clause text injected into the answer context is capped (a few clauses run on for pages)
+MAX_CLAUSE_CHARS = 1500
+
+# Everyday words -> the defined statutory term
+ALIASES = {
+    "minor": "child",
+    "minors": "child",
+    "juvenile": "child",
+}
+# Single-word terms ("act", "court", "person") are only injected when a cue sits right next to them
+# (on the normalized query): "what is (a|an|the) <term>", "meaning of <term>", "define <term>", "<term> means"
+CUE_BEFORE = re.compile(
+    r"(?:\b(?P<ask>what|who)\s+(?:is|are)|\b(?:meaning|definition|definitions)\s+of|\bdefin(?:e|es|ed))"
+    r"(?:\s+(?:a|an|the))?\s*$"
+)
+CUE_AFTER = re.compile(r"^\s*(?:means|mean|meant|is\s+defined|defined)\b")
+# "what is a <term>" only asks for the term when nothing but a legal qualifier follows it
+# ("what is a child under the BNS", but not "what is the time limit for ...")
+ASK_TAIL = re.compile(r"^\s*(?:$|(?:under|in|as\s+per|according\s+to|for\s+the\s+purposes?)\b)")
+# Terms listed after one cue share it: "define act, child and cruelty"
+LIST_GAP = re.compile(r"^[\s,]*(?:(?:and|or)\s+)?(?:(?:a|an|the)\s+)?$")
+
+
+def normalize_term(term):
+    return " ".join(re.sub(r"[^\w\s-]", " ", term.lower()).split())
+
+
+def parse_definitions(record):
+    """
+    Definition entries of one corpus section: [{"term", "act", "section", "clause", "text"}].
+    Clause-structured sections yield one entry per defined term; others one entry for the whole text.
+    """
+    act, section = str(record.get("act", "")), str(record.get("number", ""))
+    title, text = str(record.get("title", "")).strip(), str(record.get("text", ""))
+    entries = []
+
+    def add(term, clause, body):
+        term = normalize_term(term)
+        if term and not any(e["term"] == term and e["clause"] == clause for e in entries):
+            entries.append({
+                "term": term, "act": act, "section": section, "clause": clause,
+                "text": " ".join(body.split())[:MAX_CLAUSE_CHARS],
+            })
+
+    if DEFINITIONS_TITLE.match(title):
+        starts = list(CLAUSE_START.finditer(text))
+        for i, m in enumerate(starts):
+            body = text[m.start():starts[i + 1].start() if i + 1 < len(starts) else len(text)]
+            add(m.group("term"), m.group("clause"), body)
+            for extra in DEFINED_TERM.finditer(body, m.end() - m.start()):
+                add(extra.group("term"), m.group("clause"), body)
+        return entries
+
+    m = DEFINED_TITLE.match(title)
+    if m:
+        terms = [t.group("term") for t in DEFINED_TERM.finditer(text)]
+        # "Candidate, electoral right defined." when the text does not quote its terms
+        terms = terms or re.split(r",\s*|\s+and\s+", m.group("terms"))
+        for term in terms:
+            add(term, None, text)
+    return entries
+
+
+def build_definitions(records):
+    """term -> [entries], over every definitions section of the corpus."""
+    terms = {}
+    for record in records:
+        for entry in parse_definitions(record):
+            terms.setdefault(entry["term"], []).append(entry)
+    return {
+        "version": DEFINITIONS_VERSION,
+        "count": sum(len(v) for v in terms.values()),
+        "terms": terms,
+        "aliases": dict(ALIASES),
+    }
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over normalized terms: one pass over the query finds every
+    occurrence of every term. Matches must sit on word boundaries; overlapping matches
+    resolve to the longest, leftmost term.
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term):
+        node = 0
+        for char in term:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = nxt
+        self.output[node].append(term)
+
+    def _link(self):
+        # Breadth-first: a node's failure link points to the longest proper suffix that is also a prefix
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        """Non-overlapping [(start, end, term)] in `text` (already normalized), left to right."""
+        found = []
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for term in self.output[node]:
+                start = i - len(term) + 1
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                after_ok = i + 1 == len(text) or not text[i + 1].isalnum()
+                if before_ok and after_ok:
+                    found.append((start, i + 1, term))
+
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        chosen, last_end = [], 0
+        for start, end, term in found:
+            if start >= last_end:
+                chosen.append((start, end, term))
+                last_end = end
+        return chosen
+
+
+class DefinitionIndex:
+    """Defined terms (and aliases) of the corpus, matched against queries in one automaton pass."""
+
+    def __init__(self, terms=None, aliases=None):
+        self.terms = terms or {}
+        self.aliases = {a: t for a, t in (aliases or {}).items() if t in self.terms}
+        self.matcher = TermMatcher(list(self.terms) + list(self.aliases))
+
+    def __len__(self):
+        return len(self.terms)
+
+    @classmethod
+    def load(cls, path=OUTPUT_FILE):
+        """Empty index when the file has not been built yet."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("terms"), data.get("aliases"))
+
+    def match(self, query, act=None, limit=3):
+        """
+        Definition entries for terms in `query` (aliases resolved), longest terms first, at most `limit`.
+        Single-word terms need an adjacent definitional cue (see CUE_BEFORE / CUE_AFTER).
+        """
+        text = normalize_term(query)
+        matched = []
+        cued_end = None
+        for start, end, found in self.matcher.find(text):
+            term = self.aliases.get(found, found)
+            cued = has_cue(text, start, end) or (cued_end is not None and LIST_GAP.match(text[cued_end:start]))
+            if cued:
+                cued_end = end
+            if (" " in term or "-" in term or cued) and term not in matched:
+                matched.append(term)
+
+        entries = []
+        for term in sorted(matched, key=len, reverse=True):
+            for entry in self.terms[term]:
+                if not act or entry["act"] == act:
+                    entries.append(entry)
+        return entries[:limit]
+
+
+def has_cue(text, start, end):
+    """Whether the term at text[start:end] is asked about, not merely mentioned."""
+    before = CUE_BEFORE.search(text, 0, start)
+    if before:
+        return not before.group("ask") or bool(ASK_TAIL.match(text[end:]))
+    return bool(CUE_AFTER.match(text[end:]))
+
+
+def format_definition(entry):
+    clause = f"({entry['clause']})" if entry["clause"] else ""
+    return f"{entry['act']} section {entry['section']}{clause}: {entry['text']}"
+
+
+def build():
+    print(f"Loading {INPUT_FILE}...")
+    with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        records = json.load(f)
+
+    definitions = build_definitions(records)
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(definitions, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {definitions['count']} definitions of {len(definitions['terms'])} terms to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    build()
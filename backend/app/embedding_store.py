@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+# On-disk layout for an embedding store with stem `legali_vectors_v2`:
+#   legali_vectors_v2.npy        (count x dim) matrix, float16 or float32
+#   legali_vectors_v2.ids.json   row order -> chunk id
+#   legali_vectors_v2.meta.json  header: model, dim, count, normalized, dtype (+ caller extras, e.g. fingerprint)
+FORMAT_VERSION = 1
+DEFAULT_DTYPE = "float16"
+
+
+def store_paths(stem):
+    stem = Path(stem)
+    if stem.suffix in (".npy", ".json"):
+        stem = stem.with_suffix("")
+    return {
+        "matrix": stem.with_suffix(".npy"),
+        "ids": stem.with_suffix(".ids.json"),
+        "meta": stem.with_suffix(".meta.json"),
+    }
+
+
+class EmbeddingStore:
+    """Read-only view over a saved embedding matrix (memory-mapped by default)."""
+
+    def __init__(self, ids, matrix, header):
+        self.ids = ids
+        self.matrix = matrix
+        self.header = header
+        self._row_of = {cid: i for i, cid in enumerate(ids)}
+
+    @property
+    def model(self):
+        return self.header.get("model")
+
+    @property
+    def dim(self):
+        return self.header.get("dim")
+
+    @property
+    def normalized(self):
+        return bool(self.header.get("normalized"))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, cid):
+        return cid in self._row_of
+
+    def get(self, cid, default=None):
+        """Returns the vector for `cid` as float32, or `default`."""
+        row = self._row_of.get(cid)
+        if row is None:
+            return default
+        return np.asarray(self.matrix[row], dtype=np.float32)
+
+    def rows(self, cids):
+        """Returns the float32 sub-matrix for the given ids (KeyError on unknown id)."""
+        return np.asarray(self.matrix[[self._row_of[c] for c in cids]], dtype=np.float32)
+
+
+def save_embeddings(stem, ids, vectors, model, normalized=True, dtype=DEFAULT_DTYPE, extra=None):
+    """Writes matrix, id index and header (plus `extra` header fields) next to each other. Returns the paths written."""
+    paths = store_paths(stem)
+    matrix = np.asarray(vectors, dtype=dtype)
+    if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+        raise ValueError(f"Expected ({len(ids)}, dim) matrix, got {matrix.shape}")
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "model": model,
+        "dim": int(matrix.shape[1]),
+        "count": int(matrix.shape[0]),
+        "normalized": bool(normalized),
+        "dtype": str(matrix.dtype),
+    }
+    header.update(extra or {})
+
+    paths["matrix"].parent.mkdir(parents=True, exist_ok=True)
+    np.save(paths["matrix"], matrix)
+    with open(paths["ids"], "w", encoding="utf-8") as f:
+        json.dump(list(ids), f)
+    with open(paths["meta"], "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2)
+    return paths
+
+
+def load_embeddings(stem, mmap=True):
+    paths = store_paths(stem)
+    with open(paths["meta"], "r", encoding="utf-8") as f:
+        header = json.load(f)
+    with open(paths["ids"], "r", encoding="utf-8") as f:
+        ids = json.load(f)
+    matrix = np.load(paths["matrix"], mmap_mode="r" if mmap else None)
+
+    if matrix.shape != (header["count"], header["dim"]) or len(ids) != header["count"]:
+        raise ValueError(f"Corrupt embedding store at {paths['matrix']}: header/matrix/ids disagree")
+    return EmbeddingStore(ids, matrix, header)
+
+
+def find_stores(data_dir):
+    """Returns the stems of every embedding store in `data_dir`."""
+    return sorted(
+        p.with_name(p.name[: -len(".meta.json")])
+        for p in Path(data_dir).glob("*.meta.json")
+        if store_paths(p.with_name(p.name[: -len(".meta.json")]))["matrix"].exists()
+    )
+
+
+def convert_json_cache(json_path, dtype=DEFAULT_DTYPE):
+    """
+    Converts a legacy `{"meta": {...}, "data": [{"id", "vector"}]}` cache
+    into a binary store with the same stem.
+    """
+    json_path = Path(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+
+    meta = payload.get("meta", {})
+    items = payload.get("data", [])
+    ids = [item["id"] for item in items]
+    vectors = np.asarray([item["vector"] for item in items], dtype=np.float32)
+    if not ids:
+        raise ValueError(f"{json_path} contains no vectors")
+
+    norms = np.linalg.norm(vectors, axis=1)
+    normalized = bool(np.allclose(norms, 1.0, atol=1e-3))
+
+    return save_embeddings(
+        json_path.with_suffix(""), ids, vectors,
+        model=meta.get("model", "unknown"), normalized=normalized, dtype=dtype
+    )
+
@@ -0,0 +1,141 @@
+import hashlib
+import json
+from pathlib import Path
+
+METRICS = ("faithfulness", "relevance", "retrieval_success")
+ZERO_SCORES = {metric: 0.0 for metric in METRICS}
+
+JUDGE_CACHE_FILE = Path("backend/logs/eval_reports/judge_cache.json")
+PARTIAL_RUN_FILE = Path("backend/logs/eval_reports/eval_partial.jsonl")
+REPORT_GLOB = "eval_report_*.json"
+
+
+def answer_hash(answer):
+    return hashlib.sha256((answer or "").encode("utf-8")).hexdigest()
+
+
+def judge_key(question, answer, judge_model):
+    """Cache key of a verdict: an unchanged answer to the same question by the same judge is not re-graded."""
+    raw = json.dumps([question, answer_hash(answer), judge_model])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_scores(content):
+    """Metric scores from a judge reply (tolerates markdown fences and surrounding text)."""
+    clean = content.replace("```json", "").replace("```", "").strip()
+    if "{" in clean and "}" in clean:
+        clean = clean[clean.find("{"):clean.rfind("}") + 1]
+    scores = json.loads(clean)
+    return {metric: float(scores.get(metric, 0.0)) for metric in METRICS}
+
+
+class JudgeCache:
+    """Judge verdicts on disk, keyed by `judge_key`. Failed verdicts are never stored."""
+
+    def __init__(self, path=JUDGE_CACHE_FILE, entries=None):
+        self.path = Path(path)
+        self.entries = entries or {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path=JUDGE_CACHE_FILE):
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    def get(self, question, answer, judge_model):
+        scores = self.entries.get(judge_key(question, answer, judge_model))
+        if scores is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return scores
+
+    def put(self, question, answer, judge_model, scores):
+        self.entries[judge_key(question, answer, judge_model)] = scores
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        tmp.replace(self.path)
+
+
+class PartialRun:
+    """
+    Append-only journal of finished questions (one JSON result per line), so an interrupted
+    run can be resumed. Lines cut off by a crash are ignored.
+    """
+
+    def __init__(self, path=PARTIAL_RUN_FILE):
+        self.path = Path(path)
+
+    def load(self):
+        """Finished results by question."""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[result["question"]] = result
+        return done
+
+    def append(self, result):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def aggregate(results, num_questions):
+    """Mean of each metric over the dataset (questions that failed to run count as 0)."""
+    if not num_questions:
+        return {metric: 0.0 for metric in METRICS}
+    return {metric: sum(r[metric] for r in results) / num_questions for metric in METRICS}
+
+
+def latest_report(reports_dir):
+    """Most recent eval report in `reports_dir` (timestamped names sort chronologically), or None."""
+    reports = sorted(p for p in Path(reports_dir).glob(REPORT_GLOB))
+    return reports[-1] if reports else None
+
+
+def diff_reports(current, previous):
+    """
+    Human-readable differences between two reports: aggregate deltas, then every
+    question whose scores changed, was added or was dropped.
+    """
+    lines = []
+    for metric in METRICS:
+        now = current["aggregate_scores"].get(metric, 0.0)
+        before = previous["aggregate_scores"].get(metric, 0.0)
+        lines.append(f"{metric}: {before * 100:.2f}% -> {now * 100:.2f}% ({(now - before) * 100:+.2f})")
+
+    before_by_q = {r["question"]: r for r in previous.get("details", [])}
+    now_by_q = {r["question"]: r for r in current.get("details", [])}
+    for question, result in now_by_q.items():
+        old = before_by_q.get(question)
+        if old is None:
+            lines.append(f"+ {question}")
+            continue
+        changed = [
+            f"{metric} {old.get(metric, 0.0):.1f} -> {result[metric]:.1f}"
+            for metric in METRICS if result[metric] != old.get(metric, 0.0)
+        ]
+        if changed:
+            lines.append(f"~ {question}: " + ", ".join(changed))
+    for question in before_by_q:
+        if question not in now_by_q:
+            lines.append(f"- {question}")
+    return lines
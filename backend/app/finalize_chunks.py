@@ -1,81 +1,125 @@
 import json
+import os
 import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 INPUT_FILE = Path("backend/data/final/legali_chunks.json")
 OUTPUT_FILE = Path("backend/data/final/legali_ready.json")
 
+# Below this many chunks a process pool costs more than it saves
+MIN_CHUNKS_FOR_POOL = 2000
+# Chunks handed to a worker per task
+CHUNKS_PER_TASK = 64
+
+# Keep newlines and tabs, remove other control characters (like null, backspace, etc)
+KEEP_CONTROL = frozenset('\n\t\r')
+
+# "Page <Num>" on a line by itself.
+# Bare digit lines are left alone: BNS sections go up to 350, so `350` on a line is ambiguous.
+PAGE_LINE = re.compile(r'(?m)^\s*Page\s+\d+\s*$')
+# TOC headings that occasionally slip into a chunk body; always trash there (removed in this order)
+ARRANGEMENT_HEADINGS = ("ARRANGEMENT OF SECTIONS", "ARRANGEMENT OF CLAUSES")
+
+
+class ControlCharTable(dict):
+    """
+    str.translate table deleting Unicode category C* characters (except newline, tab, CR).
+    Code points are classified the first time they are seen and memoized,
+    so unicodedata.category runs once per distinct character instead of once per character.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char not in KEEP_CONTROL and unicodedata.category(char).startswith("C"):
+            value = None
+        else:
+            value = codepoint
+        self[codepoint] = value
+        return value
+
+
+CONTROL_CHARS = ControlCharTable()
+# Pre-seed the Latin-1 range so the common case never reaches __missing__
+for _cp in range(256):
+    CONTROL_CHARS[_cp]
+
+
 def is_control_char(char):
-    # Keep newlines and tabs, remove others (like null, backspace, etc)
-    if char in ('\n', '\t', '\r'):
-        return False
-    return unicodedata.category(char).startswith("C")
+    return CONTROL_CHARS[ord(char)] is None
+
 
 def clean_text(text):
     # 1. Normalize unicode (NFKC)
     text = unicodedata.normalize('NFKC', text)
-    
     # 2. Remove control characters
-    text = "".join(c for c in text if not is_control_char(c))
-    
-    # 3. Check for Page headers/footers
-    # Regex for "Page <Num>" on a line by itself
-    text = re.sub(r'(?m)^\s*Page\s+\d+\s*$', '', text)
-    # Regex for just digits on a line by itself? (Page numbers sometimes)
-    # But be careful about "(1)"
-    # A distinct page number usually is centered or at edges. 
-    # Let's remove lines that are just digits greater than length 3 (unlikely to be a list item "1.")?
-    # Or just lines matching `^\d+$` ? 
-    # BNS sections go up to 350. So `350` on a line is ambiguous.
-    # However, strict instructions say "No page numbers".
-    # We will assume parsing already avoided most, but let's scrub explicit "Page X".
-    
-    # 4. Check for ARRANGEMENT OF SECTIONS
-    # This might have slipped in?
-    if "ARRANGEMENT OF SECTIONS" in text or "ARRANGEMENT OF CLAUSES" in text:
-        # If it's the title of the chunk? Or inside body?
-        # If inside body, it's likely trash.
-        text = text.replace("ARRANGEMENT OF SECTIONS", "")
-        text = text.replace("ARRANGEMENT OF CLAUSES", "")
-        
+    text = text.translate(CONTROL_CHARS)
+    # 3. Page headers/footers
+    text = PAGE_LINE.sub('', text)
+    # 4. ARRANGEMENT OF SECTIONS / CLAUSES
+    for heading in ARRANGEMENT_HEADINGS:
+        text = text.replace(heading, '')
     return text.strip()
 
-def finalize():
+
+def _clean_chunk(chunk):
+    chunk['text'] = clean_text(chunk['text'])
+    return chunk
+
+
+def iter_cleaned(chunks, workers=None):
+    """Yields cleaned chunks in input order, across a process pool for large corpora."""
+    workers = workers or os.cpu_count() or 1
+    if len(chunks) < MIN_CHUNKS_FOR_POOL or workers < 2:
+        yield from map(_clean_chunk, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_clean_chunk, chunks, chunksize=CHUNKS_PER_TASK)
+
+
+def write_json_array(items, f):
+    """
+    Streams `items` as a JSON array, byte-identical to json.dump(items, f, indent=2, ensure_ascii=False),
+    without materializing the whole list. Returns the number of items written.
+    """
+    count = 0
+    for item in items:
+        f.write("[\n  " if count == 0 else ",\n  ")
+        f.write(json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def finalize(workers=None):
     if not INPUT_FILE.exists():
         print(f"Error: {INPUT_FILE} missing.")
         return
 
     with open(INPUT_FILE, 'r', encoding='utf-8') as f:
         chunks = json.load(f)
-        
+
     print(f"Loaded {len(chunks)} chunks. Cleaning...")
-    
-    cleaned_chunks = []
-    skipped_count = 0
-    
-    for chunk in chunks:
-        original_text = chunk['text']
-        cleaned_text = clean_text(original_text)
-        
-        # If text became empty (unlikely), skip
-        if not cleaned_text:
-            print(f"Warning: Chunk {chunk['id']} became empty after cleaning. Skipping.")
-            skipped_count += 1
-            continue
-            
-        # Update text
-        chunk['text'] = cleaned_text
-        cleaned_chunks.append(chunk)
-
-    # Validate output
-    # Ensure UTF-8 compliancy is implicit by using json.dump with ensure_ascii=False
-    
+
+    skipped = []
+
+    def non_empty(cleaned):
+        for chunk in cleaned:
+            # If text became empty (unlikely), skip
+            if not chunk['text']:
+                print(f"Warning: Chunk {chunk['id']} became empty after cleaning. Skipping.")
+                skipped.append(chunk['id'])
+                continue
+            yield chunk
+
+    # Ensure UTF-8 compliancy is implicit by writing with ensure_ascii=False
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_chunks, f, indent=2, ensure_ascii=False)
-        
-    print(f"Finalized {len(cleaned_chunks)} chunks.")
-    print(f"Skipped {skipped_count} empty chunks.")
+        written = write_json_array(non_empty(iter_cleaned(chunks, workers)), f)
+
+    print(f"Finalized {written} chunks.")
+    print(f"Skipped {len(skipped)} empty chunks.")
     print(f"Saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
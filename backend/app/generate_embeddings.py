@@ -1,11 +1,17 @@
 import json
 import os
+import sys
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.embedding_store import save_embeddings
+
 # Paths
 INPUT_FILE = Path("backend/data/final/legali_ready_v2.json")
-OUTPUT_FILE = Path("backend/data/final/legali_vectors_v2.json")
+# Binary store stem: writes legali_vectors_v2.npy / .ids.json / .meta.json
+OUTPUT_STEM = Path("backend/data/final/legali_vectors_v2")
 MODEL_NAME = "BAAI/bge-base-en-v1.5"
 
 def generate_embeddings():
@@ -34,35 +40,10 @@ def generate_embeddings():
     # BGE usually recommends normalize_embeddings=True
     embeddings = model.encode(texts, normalize_embeddings=True, show_progress_bar=True)
     
-    # Structure output
-    # We want to save ID -> Vector mapping or List of Objects?
-    # Common format: List of {id, vector, metadata}
-    # Or just {id: vector}
-    # User didn't specify schema for vectors, but usually we ingest text + vector together.
-    # However, "legali_ready.json" has the text.
-    # Let's create a file that merges them or just has vectors.
-    # To be safe and RAG-ready, let's output a format that includes ID and Vector.
-    
-    output_data = []
-    headers = {"model": MODEL_NAME, "dim": embeddings.shape[1], "count": len(chunks)}
-    
-    vectors = []
-    for i, emb in enumerate(embeddings):
-        vectors.append({
-            "id": ids[i],
-            "vector": emb.tolist()
-        })
-        
-    final_payload = {
-        "meta": headers,
-        "data": vectors
-    }
-    
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(final_payload, f)
+    paths = save_embeddings(OUTPUT_STEM, ids, embeddings, model=MODEL_NAME, normalized=True)
         
-    print(f"Saved {len(vectors)} vectors to {OUTPUT_FILE}")
-    print(f"Dimensions: {headers['dim']}")
+    print(f"Saved {len(ids)} vectors to {paths['matrix']} (index: {paths['ids'].name})")
+    print(f"Dimensions: {embeddings.shape[1]}")
 
 if __name__ == "__main__":
     generate_embeddings()
@@ -0,0 +1,271 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from backend.app.create_chunks import merge_chunks, recursive_split
+from backend.app.pdf_extract import iter_pages
+
+# Pipeline Config
+QUEUE_SIZE = 64         # Max items buffered between two stages (bounds peak memory)
+EMBED_BATCH_SIZE = 64   # Chunks per embedder.encode call
+UPSERT_BATCH_SIZE = 100 # Chunks per collection.upsert call (same as ingest.py)
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+SECTION_START = re.compile(r'(?=\b(?:Section|Sec\.)\s+\d+\b)', re.IGNORECASE)
+SECTION_NUMBER = re.compile(r'\b(?:Section|Sec\.)\s+(\d+[A-Z]?)\b', re.IGNORECASE)
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.started = None
+        self.finished = None
+
+    def tick(self):
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        self.finished = now
+        self.items += 1
+
+    def report(self):
+        elapsed = (self.finished - self.started) if self.started is not None else 0.0
+        rate = self.items / elapsed if elapsed > 0 else float(self.items)
+        return f"{self.name:<10} {self.items:>7} items in {elapsed:7.2f}s ({rate:,.1f}/s)"
+
+
+def threaded(iterable, stats, maxsize=QUEUE_SIZE):
+    """
+    Runs `iterable` in a background thread, handing items over through a bounded queue,
+    so the producing stage keeps working while the consumer processes earlier items.
+    Exceptions in the producer are re-raised in the consumer.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                stats.tick()
+                while not stop.is_set():
+                    try:
+                        q.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            q.put(_DONE)
+        except BaseException as e:
+            q.put(e)
+        finally:
+            # Runs the stage's own cleanup (e.g. temp files) when the consumer stops early
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    worker = threading.Thread(target=produce, name=f"ingest-{stats.name}", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+
+def document_pages(documents):
+    """Stage 1: {"doc", "text"} per page, then {"doc", "end": True} per document."""
+    for doc in documents:
+        for _, text in iter_pages(doc["pdf_path"]):
+            if text:
+                yield {"doc": doc, "text": text}
+        yield {"doc": doc, "end": True}
+
+
+def split_sections(pages):
+    """
+    Stage 2: incremental version of re.split(SECTION_START, full_text).
+    Everything before the last section header seen so far is complete and emitted;
+    the tail stays buffered until the next page (or end of document) arrives.
+    """
+    buffer = ""
+    for item in pages:
+        doc = item["doc"]
+        if item.get("end"):
+            if buffer.strip():
+                yield {"doc": doc, "text": buffer}
+            buffer = ""
+            yield item
+            continue
+
+        buffer += item["text"] + "\n"
+        starts = [m.start() for m in SECTION_START.finditer(buffer)]
+        starts = [s for s in starts if s > 0]
+        if not starts:
+            continue
+
+        cut_points = [0] + starts
+        for begin, end in zip(cut_points, cut_points[1:]):
+            if buffer[begin:end].strip():
+                yield {"doc": doc, "text": buffer[begin:end]}
+        buffer = buffer[starts[-1]:]
+
+
+def chunk_sections(sections):
+    """Stage 3: recursive_split + merge_chunks per section, with per-document chunk ids."""
+    counters = {}
+    for item in sections:
+        doc = item["doc"]
+        if item.get("end"):
+            counters.pop(doc["act"], None)
+            yield item
+            continue
+
+        sec_text = item["text"]
+        match = SECTION_NUMBER.search(sec_text)
+        sec_num = match.group(1) if match else "Unknown"
+
+        for chunk_text in merge_chunks(recursive_split(sec_text)):
+            idx = counters.get(doc["act"], 0)
+            counters[doc["act"]] = idx + 1
+            yield {"doc": doc, "chunk": {
+                "id": f"{doc['act'].upper()}-CHUNK-{idx + 1}",
+                "act": doc["act"],
+                "number": sec_num,
+                "title": f"Section {sec_num}",
+                "chapter": "Unknown",
+                "chunk_index": idx,
+                "text": chunk_text
+            }}
+
+
+def write_ready_json(chunks):
+    """
+    Tee stage: streams each document's chunks into its *_ready_v2.json for the BM25 engine.
+    Chunks go to "<name>.tmp", renamed into place only on the document's end marker, so an
+    interrupted run never leaves a truncated file that auto_ingest would skip as processed.
+    """
+    handles = {}
+    try:
+        for item in chunks:
+            doc = item["doc"]
+            key = str(doc["output_json_path"])
+            if item.get("end"):
+                f = handles.pop(key, None)
+                if f is None:
+                    print(f"Warning: Extracted text from {doc['pdf_path'].name} was empty!")
+                else:
+                    f.write("\n]\n")
+                    f.close()
+                    os.replace(f.name, doc["output_json_path"])
+                    print(f"Saved structural dictionary to: {doc['output_json_path'].name}")
+                continue
+
+            f = handles.get(key)
+            if f is None:
+                f = open(_temp_path(doc["output_json_path"]), "w", encoding="utf-8")
+                f.write("[\n")
+                handles[key] = f
+            else:
+                f.write(",\n")
+            f.write(json.dumps(item["chunk"], indent=4))
+            yield item["chunk"]
+    finally:
+        # Documents without an end marker are incomplete: drop their temp files
+        for f in handles.values():
+            f.close()
+            try:
+                os.remove(f.name)
+            except OSError:
+                pass
+
+
+def _temp_path(path):
+    return f"{path}.tmp"
+
+
+def embed_batches(chunks, embedder, batch_size=EMBED_BATCH_SIZE):
+    """Stage 4: batched encode; yields (ids, documents, embeddings, metadatas)."""
+    batch = []
+
+    def encode(batch):
+        texts = [f"{QUERY_INSTRUCTION}{c['text']}" for c in batch]
+        vectors = embedder.encode(texts, normalize_embeddings=True).tolist()
+        return (
+            [c["id"] for c in batch],
+            [c["text"] for c in batch],
+            vectors,
+            [{"act": c["act"], "chunk_index": c["chunk_index"], "number": str(c.get("number", "Unknown")),
+              "title": str(c.get("title", "Unknown")), "chapter": str(c.get("chapter", "Unknown"))} for c in batch]
+        )
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            yield encode(batch)
+            batch = []
+    if batch:
+        yield encode(batch)
+
+
+def upsert_batches(batches, collection, batch_size=UPSERT_BATCH_SIZE):
+    """Stage 5 (sink): regroups embedded batches into upsert-sized writes."""
+    pending = ([], [], [], [])
+    written = 0
+
+    def flush():
+        try:
+            collection.upsert(ids=pending[0], documents=pending[1], embeddings=pending[2], metadatas=pending[3])
+        except Exception as e:
+            print(f"Database batch upsert failed at {written}-{written + len(pending[0])}: {e}")
+
+    for batch in batches:
+        for target, values in zip(pending, batch):
+            target.extend(values)
+        if len(pending[0]) >= batch_size:
+            flush()
+            written += len(pending[0])
+            pending = ([], [], [], [])
+    if pending[0]:
+        flush()
+        written += len(pending[0])
+    return written
+
+
+def run_pipeline(documents, embedder, collection):
+    """
+    Streams PDFs through extraction -> section split -> chunking -> embedding -> upsert.
+    `documents` is a list of {"pdf_path", "act", "output_json_path"}.
+    Every stage runs concurrently behind a bounded queue; returns the per-stage stats.
+    """
+    stats = [StageStats(name) for name in ("pages", "sections", "chunks", "batches")]
+
+    pages = threaded(document_pages(documents), stats[0])
+    sections = threaded(split_sections(pages), stats[1])
+    chunks = threaded(write_ready_json(chunk_sections(sections)), stats[2])
+    batches = threaded(embed_batches(chunks, embedder), stats[3], maxsize=4)
+
+    start = time.monotonic()
+    written = upsert_batches(batches, collection)
+    elapsed = time.monotonic() - start
+
+    print("\n--- Pipeline Throughput ---")
+    for s in stats:
+        print(s.report())
+    print(f"{'upserted':<10} {written:>7} chunks in {elapsed:7.2f}s total")
+    return stats
@@ -0,0 +1,201 @@
+import hashlib
+import json
+
+import numpy as np
+
+from backend.app.vector_index import CONTENT_HASH_KEY
+
+BATCH_SIZE = 100
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+
+def chunk_metadata(chunk):
+    return {
+        "act": str(chunk.get('act', '')),
+        "chapter": str(chunk.get('chapter', '')),
+        "section_number": str(chunk.get('number', '')),
+        "title": str(chunk.get('title', '')),
+        "chunk_index": int(chunk.get('chunk_index', 0))
+    }
+
+
+def content_hash(text, meta, model):
+    """Hash of everything that ends up in the store: text, metadata and the embedding model."""
+    payload = json.dumps({"model": model, "text": text, "meta": meta}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fetch_existing_hashes(collection, page_size=1000):
+    """Returns {id: content_hash} for everything already in the collection (None if unhashed)."""
+    existing = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        ids = page.get('ids') or []
+        if not ids:
+            break
+        for cid, meta in zip(ids, page.get('metadatas') or [None] * len(ids)):
+            existing[cid] = (meta or {}).get(CONTENT_HASH_KEY)
+        offset += len(ids)
+    return existing
+
+
+def fetch_stored(collection, ids, batch_size=BATCH_SIZE):
+    """Returns {id: (document, metadata)} for the given ids."""
+    stored = {}
+    for i in range(0, len(ids), batch_size):
+        page = collection.get(ids=ids[i:i + batch_size], include=["documents", "metadatas"])
+        for cid, doc, meta in zip(page.get('ids') or [], page.get('documents') or [], page.get('metadatas') or []):
+            stored[cid] = (doc, meta or {})
+    return stored
+
+
+def diff_chunks(chunks, existing, model, stored=None):
+    """
+    Compares the desired corpus against the collection.
+    Returns dict of lists: new / changed / unchanged / backfill (tuples of id, text, meta) and orphaned (ids).
+    `stored` holds {id: (document, metadata)} of rows stored before content hashes existed;
+    those whose text and metadata still match are "backfill": only the hash is added, nothing is re-embedded.
+    """
+    stored = stored or {}
+    diff = {"new": [], "changed": [], "unchanged": [], "backfill": [], "orphaned": []}
+    for cid, chunk in chunks.items():
+        text = chunk['text']
+        meta = chunk_metadata(chunk)
+        meta[CONTENT_HASH_KEY] = content_hash(text, meta, model)
+
+        if cid not in existing:
+            diff["new"].append((cid, text, meta))
+        elif existing[cid] == meta[CONTENT_HASH_KEY]:
+            diff["unchanged"].append((cid, text, meta))
+        elif existing[cid] is None and _matches(stored.get(cid), text, meta):
+            diff["backfill"].append((cid, text, meta))
+        else:
+            diff["changed"].append((cid, text, meta))
+
+    diff["orphaned"] = sorted(cid for cid in existing if cid not in chunks)
+    return diff
+
+
+def _matches(row, text, meta):
+    if row is None:
+        return False
+    doc, stored_meta = row
+    stored_meta = {k: v for k, v in stored_meta.items() if k != CONTENT_HASH_KEY}
+    return doc == text and stored_meta == {k: v for k, v in meta.items() if k != CONTENT_HASH_KEY}
+
+
+def print_report(diff, limit=20):
+    print("\n--- Ingestion Diff ---")
+    for key in ("new", "changed", "unchanged", "backfill", "orphaned"):
+        print(f"{key.capitalize():<10}: {len(diff[key])}")
+    for key in ("new", "changed"):
+        for cid, _, _ in diff[key][:limit]:
+            print(f"  [{key.upper()}] {cid}")
+        if len(diff[key]) > limit:
+            print(f"  ... {len(diff[key]) - limit} more {key}")
+    for cid in diff["orphaned"][:limit]:
+        print(f"  [ORPHANED] {cid}")
+    if len(diff["orphaned"]) > limit:
+        print(f"  ... {len(diff['orphaned']) - limit} more orphaned")
+
+
+def sync_collection(chunks, collection, model, load_embedder, load_vector_cache=dict,
+                    dry_run=False, force=False, batch_size=BATCH_SIZE):
+    """
+    Brings `collection` in line with `chunks` ({id: chunk}): deletes orphaned ids, adds the content
+    hash to matching rows stored without one, and embeds + upserts only new and changed chunks.
+    `load_embedder()` and `load_vector_cache()` ({id: vector}) are only called when needed.
+    Returns the diff; with `dry_run` nothing is written.
+    """
+    existing = fetch_existing_hashes(collection)
+    print(f"Total Chunks Loaded: {len(chunks)}")
+    print(f"Chunks Already Stored: {len(existing)}")
+
+    if force:
+        # Treat every stored hash as stale so all chunks are re-upserted
+        existing = {cid: None for cid in existing}
+        stored = {}
+    else:
+        stored = fetch_stored(collection, [cid for cid, h in existing.items() if h is None and cid in chunks], batch_size)
+    diff = diff_chunks(chunks, existing, model, stored)
+    print_report(diff)
+
+    if dry_run:
+        print("\nDry run: no changes written.")
+        return diff
+
+    # 1. Delete Orphans
+    orphaned = diff["orphaned"]
+    for i in range(0, len(orphaned), batch_size):
+        batch = orphaned[i:i + batch_size]
+        print(f"Deleting {len(batch)} orphaned ids...")
+        collection.delete(ids=batch)
+
+    # 2. Backfill hashes of rows stored before hashing (their vectors are still valid)
+    backfill = diff["backfill"]
+    for i in range(0, len(backfill), batch_size):
+        batch = backfill[i:i + batch_size]
+        print(f"Backfilling content hashes for {len(batch)} unchanged chunks...")
+        collection.update(ids=[c[0] for c in batch], metadatas=[c[2] for c in batch])
+
+    to_write = diff["new"] + diff["changed"]
+    if not to_write:
+        print(f"\nNothing to embed. Vector Database contains [{collection.count()}] items.")
+        return diff
+
+    # 3. Vectors: Cache for new ids only (a cached vector for a changed chunk is stale),
+    #    then encode only what is still missing
+    vec_map = load_vector_cache() if diff["new"] else {}
+    print(f"Cached Vectors Found: {len(vec_map)}")
+
+    ids = []
+    documents = []
+    embeddings = []
+    metadatas = []
+    missing_chunks = list(diff["changed"])
+
+    for cid, text, meta in diff["new"]:
+        vector = vec_map.get(cid)
+        if vector is None:
+            missing_chunks.append((cid, text, meta))
+        else:
+            ids.append(cid)
+            documents.append(text)
+            embeddings.append(np.asarray(vector, dtype=np.float32).tolist())
+            metadatas.append(meta)
+
+    # 4. Dynamically Encode Missing Chunks
+    if missing_chunks:
+        print(f"Generating embeddings dynamically for {len(missing_chunks)} new/changed chunks...")
+        embedder = load_embedder()
+
+        texts_to_encode = [f"{QUERY_INSTRUCTION}{c[1]}" for c in missing_chunks]
+        new_vecs = np.asarray(embedder.encode(texts_to_encode, normalize_embeddings=True, show_progress_bar=True)).tolist()
+
+        for i, (cid, text, meta) in enumerate(missing_chunks):
+            ids.append(cid)
+            documents.append(text)
+            embeddings.append(new_vecs[i])
+            metadatas.append(meta)
+
+    # 5. Upsert only New/Changed Chunks in Batches
+    total = len(ids)
+    print(f"Executing batch up-sert for {total} elements...")
+
+    for i in range(0, total, batch_size):
+        end = min(i + batch_size, total)
+        print(f"Upserting batch {i} -> {end}...")
+        try:
+            collection.upsert(
+                ids=ids[i:end],
+                embeddings=embeddings[i:end],
+                documents=documents[i:end],
+                metadatas=metadatas[i:end]
+            )
+        except Exception as e:
+            print(f"Batch Upsert Error on {i}->{end}: {e}")
+
+    count = collection.count()
+    print(f"\nIngestion Complete! Vector Database contains [{count}] items.")
+    return diff
@@ -0,0 +1,148 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import zlib
+from pathlib import Path
+
+from backend.app.tracing import current_trace
+
+LOG_FILE = Path("backend/logs/audit.log")
+SLOW_LOG_FILE = Path("backend/logs/slow_requests.log")
+LOG_LEVEL = os.getenv("LEGALI_LOG_LEVEL", "INFO").upper()
+CONSOLE_LOG_LEVEL = os.getenv("LEGALI_CONSOLE_LOG_LEVEL", "INFO").upper()
+# Size-based rotation of every log file
+LOG_MAX_BYTES = int(os.getenv("LEGALI_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LEGALI_LOG_BACKUP_COUNT", "5"))
+# Share of traces whose large payloads (context_used, full responses) are written; the rest log a marker
+PAYLOAD_SAMPLE_RATE = float(os.getenv("LEGALI_LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+# Payload strings longer than this are cut when written
+PAYLOAD_MAX_CHARS = int(os.getenv("LEGALI_LOG_PAYLOAD_MAX_CHARS", "20000"))
+
+_listener = None
+
+
+def payload_sampled(trace_id, rate=None):
+    """Same decision for every record of a trace, so a sampled request is logged in full."""
+    rate = PAYLOAD_SAMPLE_RATE if rate is None else rate
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0 or not trace_id:
+        return False
+    return zlib.crc32(str(trace_id).encode("utf-8")) % 10000 < rate * 10000
+
+
+def _truncate(value, limit):
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + f"... [{len(value) - limit} chars truncated]"
+    if isinstance(value, dict):
+        return {k: _truncate(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate(v, limit) for v in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, msg, trace_id, then the record's `fields`
+    (small key/values such as stage timings) and `payload` (large, sampled) entries.
+    """
+
+    def __init__(self, payload_max_chars=PAYLOAD_MAX_CHARS):
+        super().__init__()
+        self.payload_max_chars = payload_max_chars
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "trace_id": getattr(record, "trace_id", None),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        payload = getattr(record, "payload", None)
+        if payload:
+            entry.update(_truncate(payload, self.payload_max_chars))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TraceQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without formatting them: the request thread only attaches the trace_id
+    and applies payload sampling; JSON encoding and file I/O happen on the listener thread.
+    """
+
+    def __init__(self, log_queue, sample_rate=None):
+        super().__init__(log_queue)
+        self.sample_rate = sample_rate
+
+    def prepare(self, record):
+        if getattr(record, "trace_id", None) is None:
+            trace = current_trace()
+            record.trace_id = trace.trace_id if trace is not None else None
+        payload = getattr(record, "payload", None)
+        if payload and not payload_sampled(record.trace_id, self.sample_rate):
+            record.fields = dict(getattr(record, "fields", None) or {}, payload_omitted=sorted(payload))
+            record.payload = None
+        # Resolve %-args now (the objects may change after the call returns); traceback stays in-process
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _rotating_handler(path, formatter):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+    )
+    handler.setFormatter(formatter)
+    return handler
+
+
+def setup_logging(log_file=LOG_FILE, slow_log_file=SLOW_LOG_FILE, console=True):
+    """
+    Routes the "LEGALI" logger through a queue to one listener thread that writes
+    JSON lines to the rotating audit log (plus "LEGALI.slow" records to the slow-request log)
+    and plain messages to stderr. Idempotent; returns the "LEGALI" logger.
+    """
+    global _listener
+    logger = logging.getLogger("LEGALI")
+    if _listener is not None:
+        return logger
+
+    formatter = JsonFormatter()
+    handlers = [_rotating_handler(log_file, formatter)]
+    slow_handler = _rotating_handler(slow_log_file, formatter)
+    slow_handler.addFilter(logging.Filter("LEGALI.slow"))
+    handlers.append(slow_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setLevel(CONSOLE_LOG_LEVEL)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    logger.handlers = [TraceQueueHandler(log_queue)]
+    return logger
+
+
+def stop_logging():
+    """Flushes the queue and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
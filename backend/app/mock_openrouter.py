@@ -0,0 +1,146 @@
+"""
+Local OpenAI-compatible stand-in for OpenRouter, for load tests that should not spend credits.
+
+    python backend/app/mock_openrouter.py --port 8001 --ttft-ms 400 --token-rate 50
+    OPENROUTER_BASE_URL=http://localhost:8001/api/v1 python backend/app/api.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Defaults, overridable per server (CLI) or environment
+MOCK_TTFT_MS = float(os.getenv("MOCK_TTFT_MS", "400"))           # Delay before the first token
+MOCK_TOKEN_RATE = float(os.getenv("MOCK_TOKEN_RATE", "50"))       # Tokens per second after the first
+MOCK_ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))        # Share of requests answered with an error
+MOCK_ERROR_STATUS = int(os.getenv("MOCK_ERROR_STATUS", "503"))
+# Reply to the query router (analyze_query_for_filters). Unset: the user's query is echoed back as the
+# expanded query, so every load-test request retrieves and reranks its own text
+MOCK_ROUTER_JSON = os.getenv("MOCK_ROUTER_JSON")
+# Expanded query when the router prompt carries no recognisable user query
+MOCK_EXPANDED_QUERY = (
+    "What is the punishment for murder under the Bharatiya Nyaya Sanhita. "
+    "Punishment for murder death or imprisonment for life. Murder and culpable homicide."
+)
+MOCK_ANSWER = (
+    "Under Section 103, whoever commits murder shall be punished with death or imprisonment for life, "
+    "and shall also be liable to fine [Section 103]. Under Section 101, culpable homicide is murder when the act "
+    "is done with the intention of causing death [Section 101]."
+)
+# Prompts containing any of these are answered with the router JSON
+ROUTER_MARKERS = ("Triage Agent", "expanded_query")
+# The user's query inside the router prompt
+ROUTER_QUERY = re.compile(r'Analyze the user\'s legal query: "(.*)"\s*$', re.MULTILINE)
+
+
+def _tokens(text, limit=None):
+    """Word-level pseudo tokens (each keeps its trailing space), capped at `limit`."""
+    words = text.split(" ")
+    tokens = [w + " " for w in words[:-1]] + words[-1:]
+    return tokens[:limit] if limit else tokens
+
+
+def echo_router_json(prompt):
+    """Router reply whose expanded query is the user's query from the prompt."""
+    match = ROUTER_QUERY.search(prompt)
+    return json.dumps({"act": "ALL", "expanded_query": match.group(1) if match else MOCK_EXPANDED_QUERY})
+
+
+def _completion_id():
+    return f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+
+
+def create_app(ttft_ms=MOCK_TTFT_MS, token_rate=MOCK_TOKEN_RATE, error_rate=MOCK_ERROR_RATE,
+               error_status=MOCK_ERROR_STATUS, router_json=MOCK_ROUTER_JSON, answer=MOCK_ANSWER, seed=None):
+    app = FastAPI(title="Mock OpenRouter")
+    rng = random.Random(seed)
+    stats = {"requests": 0, "errors": 0, "streams": 0}
+
+    def reply_for(body):
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        if any(marker in prompt for marker in ROUTER_MARKERS):
+            return router_json or echo_router_json(prompt)
+        if body.get("stream"):
+            return answer
+        # generate_response expects a JSON object with the answer and follow-up questions
+        return json.dumps({"answer": answer, "suggested_questions": ["Is murder bailable?", "What is culpable homicide?"]})
+
+    def chunk(cid, model, delta, finish_reason=None):
+        payload = {
+            "id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def stream_tokens(cid, model, tokens):
+        await asyncio.sleep(ttft_ms / 1000)
+        yield chunk(cid, model, {"role": "assistant", "content": ""})
+        for i, token in enumerate(tokens):
+            if i and token_rate > 0:
+                await asyncio.sleep(1.0 / token_rate)
+            yield chunk(cid, model, {"content": token})
+        yield chunk(cid, model, {}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        model = body.get("model", "mock")
+        if error_rate and rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Mock upstream error", "code": error_status}}, status_code=error_status
+            )
+
+        tokens = _tokens(reply_for(body), body.get("max_tokens"))
+        cid = _completion_id()
+        if body.get("stream"):
+            stats["streams"] += 1
+            return StreamingResponse(stream_tokens(cid, model, tokens), media_type="text/event-stream")
+
+        # Non-streaming: the whole generation time is paid before the response
+        await asyncio.sleep(ttft_ms / 1000 + (max(len(tokens) - 1, 0) / token_rate if token_rate > 0 else 0))
+        content = "".join(tokens)
+        return {
+            "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+        }
+
+    # Same path whether the client's base URL is the host root or OpenRouter's "/api/v1"
+    app.add_api_route("/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/api/v1/chat/completions", chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local OpenAI-compatible mock of OpenRouter")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8001)
+    ap.add_argument("--ttft-ms", type=float, default=MOCK_TTFT_MS)
+    ap.add_argument("--token-rate", type=float, default=MOCK_TOKEN_RATE, help="tokens per second (0 = no delay)")
+    ap.add_argument("--error-rate", type=float, default=MOCK_ERROR_RATE)
+    ap.add_argument("--error-status", type=int, default=MOCK_ERROR_STATUS)
+    ap.add_argument("--router-json", default=MOCK_ROUTER_JSON, help="canned reply to the query router (default: echo the user's query)")
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    import uvicorn
+    app = create_app(args.ttft_ms, args.token_rate, args.error_rate, args.error_status, args.router_json, seed=args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
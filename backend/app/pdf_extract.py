@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Page cache: <cache>/<pdf sha256>/<engine>-<page>.txt (+ manifest.json with the page count)
+PAGE_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "cache" / "pages"
+ENGINES = ("pdfplumber", "pypdf")
+DEFAULT_ENGINE = "pdfplumber"
+
+# Below this many uncached pages a process pool costs more than it saves
+MIN_PAGES_FOR_POOL = 16
+# Pages handed to a worker per task; small enough that iter_pages can stream in order
+PAGES_PER_TASK = 8
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_pages(pdf_path, engine=DEFAULT_ENGINE):
+    if engine == "pypdf":
+        from pypdf import PdfReader
+        return len(PdfReader(str(pdf_path)).pages)
+
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_range(pdf_path, engine, start, end):
+    """Worker: opens the PDF once and extracts pages [start, end)."""
+    if engine == "pypdf":
+        from pypdf import PdfReader
+        reader = PdfReader(str(pdf_path))
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _contiguous_ranges(pages, max_len):
+    """[0, 1, 2, 5, 6] -> [(0, 3), (5, 7)] with ranges capped at max_len pages."""
+    ranges = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page and ranges[-1][1] - ranges[-1][0] < max_len:
+            ranges[-1][1] = page + 1
+        else:
+            ranges.append([page, page + 1])
+    return [tuple(r) for r in ranges]
+
+
+def _write_atomic(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def iter_pages(pdf_path, engine=DEFAULT_ENGINE, workers=None, cache_dir=PAGE_CACHE_DIR):
+    """
+    Yields (page_number, text) in page order.
+    Cached pages are read from disk; the rest are extracted across a process pool
+    in contiguous page ranges and written back to the cache as they arrive.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine '{engine}' (expected one of {ENGINES})")
+
+    pdf_path = Path(pdf_path)
+    doc_dir = Path(cache_dir) / file_sha256(pdf_path)
+    doc_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = doc_dir / "manifest.json"
+
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    num_pages = manifest.get("pages")
+    if num_pages is None:
+        num_pages = count_pages(pdf_path, engine)
+        _write_atomic(manifest_path, json.dumps({"pages": num_pages, "source": pdf_path.name}))
+
+    def cache_file(page):
+        return doc_dir / f"{engine}-{page:05d}.txt"
+
+    missing = [p for p in range(num_pages) if not cache_file(p).exists()]
+    workers = workers or os.cpu_count() or 1
+
+    if len(missing) < MIN_PAGES_FOR_POOL or workers < 2:
+        pool = None
+        pending = {}
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        pending = {
+            start: pool.submit(_extract_range, pdf_path, engine, start, end)
+            for start, end in _contiguous_ranges(missing, PAGES_PER_TASK)
+        }
+    missing = set(missing)
+
+    try:
+        buffered = {}
+        for page in range(num_pages):
+            if page not in missing:
+                yield page, cache_file(page).read_text(encoding="utf-8")
+                continue
+
+            if page not in buffered:
+                if pool is None:
+                    end = page + 1
+                    while end in missing and end - page < PAGES_PER_TASK:
+                        end += 1
+                    texts = _extract_range(pdf_path, engine, page, end)
+                else:
+                    texts = pending.pop(page).result()
+                for offset, text in enumerate(texts):
+                    buffered[page + offset] = text
+                    _write_atomic(cache_file(page + offset), text)
+
+            yield page, buffered.pop(page)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pages(pdf_path, engine=DEFAULT_ENGINE, workers=None, cache_dir=PAGE_CACHE_DIR):
+    return [text for _, text in iter_pages(pdf_path, engine, workers, cache_dir)]
+
+
+def extract_text(pdf_path, engine=DEFAULT_ENGINE, workers=None, cache_dir=PAGE_CACHE_DIR):
+    """Full document text: non-empty pages joined by newlines, in page order."""
+    return "\n".join(
+        text for text in extract_pages(pdf_path, engine, workers, cache_dir) if text
+    )
@@ -1,20 +1,22 @@
-import pdfplumber
 import re
+import sys
 from pathlib import Path
 
+try:
+    from backend.app.pdf_extract import extract_text
+except ImportError:
+    # Run as a script from backend/ (e.g. the Docker image): app/ is on sys.path
+    sys.path.append(str(Path(__file__).resolve().parent))
+    from pdf_extract import extract_text
+
 
 # ----------------------------
 # PDF Extraction
 # ----------------------------
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
-    text_pages = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                text_pages.append(text)
-    return "\n".join(text_pages)
+    # Pages are extracted across a process pool and cached by PDF hash
+    return extract_text(pdf_path)
 
 
 # ----------------------------
@@ -91,7 +93,14 @@ if __name__ == "__main__":
     RAW_PDF_DIR = BASE_DIR / "data" / "raw_pdfs"
     CLEAN_TEXT_DIR = BASE_DIR / "data" / "cleaned_text"
 
-    print(f"Reading PDFs from: {RAW_PDF_DIR}")
     print(f"Writing cleaned text to: {CLEAN_TEXT_DIR}")
 
-    clean_all_pdfs(RAW_PDF_DIR, CLEAN_TEXT_DIR)
+    # Optional PDF paths: clean only those (one act at a time from the build pipeline)
+    if len(sys.argv) > 1:
+        for pdf_file in map(Path, sys.argv[1:]):
+            output_file = CLEAN_TEXT_DIR / f"{pdf_file.stem}.txt"
+            clean_pdf(pdf_file, output_file)
+            print(f"Cleaned: {pdf_file.name} → {output_file.name}")
+    else:
+        print(f"Reading PDFs from: {RAW_PDF_DIR}")
+        clean_all_pdfs(RAW_PDF_DIR, CLEAN_TEXT_DIR)
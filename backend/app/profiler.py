@@ -0,0 +1,163 @@
+import contextvars
+import logging
+import os
+import random
+import re
+import sys
+import threading
+from pathlib import Path
+
+# Opt-in sampling profiler. Off by default: with LEGALI_PROFILE unset nothing below runs per request.
+PROFILE_ENABLED = os.getenv("LEGALI_PROFILE", "0").lower() in ("1", "true", "yes")
+# Share of requests profiled when enabled (0 = only requests sending PROFILE_HEADER)
+PROFILE_SAMPLE_RATE = float(os.getenv("LEGALI_PROFILE_SAMPLE_RATE", "0.01"))
+# Seconds between stack samples (10 ms keeps the sampler's own cost small next to rerank/LLM stages)
+PROFILE_INTERVAL = float(os.getenv("LEGALI_PROFILE_INTERVAL", "0.01"))
+PROFILE_DIR = Path("backend/logs/profiles")
+# Request header that forces profiling of one request (still requires LEGALI_PROFILE=1)
+PROFILE_HEADER = "X-Legali-Profile"
+
+# Set by the API for requests carrying PROFILE_HEADER
+_profile_requested = contextvars.ContextVar("legali_profile_requested", default=False)
+
+
+def request_profile(requested=True):
+    """Marks the current request as one to profile; returns the token for `reset_profile_request`."""
+    return _profile_requested.set(requested)
+
+
+def reset_profile_request(token):
+    _profile_requested.reset(token)
+
+
+def should_profile(sample_rate=None):
+    """Per-request decision: forced by the header, otherwise sampled at `sample_rate`."""
+    if _profile_requested.get():
+        return True
+    rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    return rate > 0 and random.random() < rate
+
+
+def _frame_name(code):
+    # Collapsed-stack frames are ";"-separated; the first line number keeps one entry per function.
+    # co_qualname is Python 3.11+; older interpreters fall back to the bare function name
+    name = f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+def collapse(frame):
+    """Root-first ";"-joined stack of a frame."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profile:
+    """
+    Samples the stacks of the threads serving one request from a background thread.
+    The thread that starts the profile is sampled; worker threads join via `attach()`
+    (called by tracing spans, so `asyncio.to_thread` retrieval work is covered).
+    On the event loop thread, samples can include other requests interleaved with this one.
+    """
+
+    def __init__(self, trace_id, endpoint, interval=None):
+        self.trace_id = trace_id
+        self.endpoint = endpoint
+        self.interval = PROFILE_INTERVAL if interval is None else interval
+        self.threads = {threading.get_ident()}
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{trace_id}", daemon=True)
+
+    def start(self):
+        self._sampler.start()
+        return self
+
+    def attach(self):
+        self.threads.add(threading.get_ident())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                # One bad sample must not silently end the profile
+                logging.getLogger("LEGALI").exception(
+                    "Profiler sample failed", extra={"trace_id": self.trace_id}
+                )
+
+    def _sample(self):
+        frames = sys._current_frames()
+        for ident in list(self.threads):
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = collapse(frame)
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        return self
+
+    def path(self, directory=None):
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", str(self.trace_id))
+        return Path(directory or PROFILE_DIR) / f"{self.endpoint}-{safe_id}.collapsed"
+
+    def write(self, directory=None):
+        """Writes the samples in collapsed-stack format (flamegraph.pl, speedscope); returns the path."""
+        path = self.path(directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_collapsed(path, self.stacks)
+        return path
+
+
+def start_profile(trace_id, endpoint):
+    """A started Profile if this request is selected, else None."""
+    if not should_profile():
+        return None
+    return Profile(trace_id, endpoint).start()
+
+
+def write_collapsed(path, stacks):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items(), key=lambda item: -item[1]):
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(path):
+    stacks = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def merge(profiles):
+    """Sums sample counts of many {stack: count} profiles."""
+    merged = {}
+    for stacks in profiles:
+        for stack, count in stacks.items():
+            merged[stack] = merged.get(stack, 0) + count
+    return merged
+
+
+def top_functions(stacks, n=20):
+    """
+    Hottest frames as (name, self samples, total samples), by self samples.
+    Total counts a frame once per sample even when it recurses.
+    """
+    self_counts, total_counts = {}, {}
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+        for name in set(frames):
+            total_counts[name] = total_counts.get(name, 0) + count
+    ranked = sorted(total_counts, key=lambda name: (-self_counts.get(name, 0), -total_counts[name]))
+    return [(name, self_counts.get(name, 0), total_counts[name]) for name in ranked[:n]]
@@ -11,6 +11,19 @@ import datetime
 import nltk
 import sqlite3
 import asyncio
+import hashlib
+import numpy as np
+
+from backend.app.streaming import DeltaCoalescer, sse_event
+from backend.app.correspondence import CORRESPONDENCE_FILE, CorrespondenceTable, is_section_lookup
+from backend.app.definitions import OUTPUT_FILE as DEFINITIONS_FILE, DefinitionIndex, format_definition
+from backend.app.relevance_gate import GATE_FILE, RelevanceGate
+from backend.app.scope_classifier import MODEL_FILE as SCOPE_MODEL_FILE, ScopeClassifier
+from backend.app.section_index import SectionIndex, section_key
+from backend.app.logging_config import setup_logging
+from backend.app.tracing import set_status, span, start_trace
+from backend.app.vector_index import NumpyIndex, build_vector_index
+from backend.app.xref import OUTPUT_FILE as XREF_FILE, XrefIndex
 
 # Download NLTK resources (quietly)
 try:
@@ -26,8 +39,33 @@ DB_DIR = Path("backend/data/chroma_db")
 SQLITE_DB_PATH = Path("backend/data/legali.db")
 COLLECTION_NAME = "legali_corpus"
 EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+# Hybrid Retrieval Config
+ENSEMBLE_WEIGHTS = (0.5, 0.5) # Dense, BM25
+RRF_K = 60                    # Reciprocal Rank Fusion constant (same as LangChain's EnsembleRetriever)
+
+# Hierarchical Retrieval Config: pick the top sections first, then score/rerank only their chunks
+HIERARCHICAL_RETRIEVAL = os.getenv("LEGALI_HIERARCHICAL_RETRIEVAL", "0").lower() in ("1", "true", "yes")
+SECTION_TOP_K = 8             # Sections whose chunks are scored and reranked
+
+# Cross-reference Expansion Config: sections cited by / citing the top hits, looked up in legali_xref.json
+XREF_BUDGET = int(os.getenv("LEGALI_XREF_BUDGET", "2"))  # Extra sections appended per query (0 disables)
+XREF_CHUNKS_PER_SECTION = 1   # Leading chunks added for each expanded section
 
-# OpenRouter Config - Fallback List
+# Definition clauses injected into the answer context for defined terms in the question
+MAX_INJECTED_DEFINITIONS = 3
+
+# Score-threshold refusal of out-of-scope questions (thresholds from scripts/calibrate_gate.py)
+RETRIEVAL_GATE = os.getenv("LEGALI_RETRIEVAL_GATE", "1").lower() in ("1", "true", "yes")
+REFUSAL_MESSAGE = "The provided legal material does not contain information to answer this question."
+
+# Batch Config
+BATCH_LLM_CONCURRENCY = 4     # Max in-flight LLM calls for batch_query
+
+# OpenRouter Config - base URL is overridable to point at a local stand-in (app/mock_openrouter.py)
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+# Fallback List
 LLM_MODEL = "google/gemini-2.5-flash" # Primary LLM Model
 MODELS = [ # Fallback list, if needed
     "qwen/qwen3-coder:free",                      # User's Favorite
@@ -36,15 +74,9 @@ MODELS = [ # Fallback list, if needed
     "meta-llama/llama-3.2-3b-instruct:free",      # Standard
     "qwen/qwen-2.5-coder-32b-instruct:free",     # Backup
 ]
-LOG_FILE = Path("backend/logs/audit.log")
 
-# Setup Logging
-logger = logging.getLogger("LEGALI")
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler(LOG_FILE)
-formatter = logging.Formatter('%(asctime)s [%(levelname)s] [TRACE_ID:%(trace_id)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+# Setup Logging (JSON lines via a queue listener thread; see logging_config.py)
+logger = setup_logging()
 
 async def analyze_query_for_filters(query, client, model_id):
     prompt = f"""SYSTEM PROMPT: You are an expert Indian Criminal Law Triage Agent.
@@ -55,15 +87,13 @@ async def analyze_query_for_filters(query, client, model_id):
         2. Generate complete, highly descriptive sentences incorporating synonyms, legal jargon, and specific anticipated Section names or keywords.
         3. DO NOT just output a list of keywords. The expanded queries must retain the semantic intent of the original question.
         4. Generate exactly 3 distinct search variations to maximize retrieval recall.
-        5. CRITICAL MAPPING: If a user asks for the definition of a "minor" in a criminal context, YOU MUST map it to "child under section 2". (e.g., "definition of a child under section 2 of BNS or POCSO").
-        6. CRITICAL TRIAGE RULE: If the user describes a real-world situation or event (e.g., "my car crashed"), you MUST act as a prosecutor. Translate their story into formal criminal charges AND explicitly append the phrase "under Bharatiya Nyaya Sanhita" to Query 2 to ensure penal codes are retrieved alongside civil/motor acts.
+        5. CRITICAL TRIAGE RULE: If the user describes a real-world situation or event (e.g., "my car crashed"), you MUST act as a prosecutor. Translate their story into formal criminal charges AND explicitly append the phrase "under Bharatiya Nyaya Sanhita" to Query 2 to ensure penal codes are retrieved alongside civil/motor acts.
         Example Query 2: "rash and negligent driving criminal liability under Bharatiya Nyaya Sanhita"
 Analyze the user's legal query: "{query}"
 Task 1: Identify if a specific Indian Act is mentioned. Options: ['BNS', 'BNSS', 'BSA', 'IT Act', 'POCSO']. If none, use "ALL".
 Task 2: Generate 3 distinct search queries. 
-CRITICAL RULE: In Indian Criminal Law (BNS/POCSO), the term "minor" is legally defined under the term "child" (Section 2). If the user asks for the definition of a "minor", Query 2 MUST explicitly be "definition of a child under section 2".
 - Query 1: The original query cleaned up.
-- Query 2: Exact legal terminology (e.g., "child").
+- Query 2: Exact legal terminology (e.g., "voluntarily causing hurt").
 - Query 3: Broad semantic intent.
 
 Output ONLY a valid JSON object matching this exact format:
@@ -87,38 +117,41 @@ Do not output any markdown formatting like ```json."""
             clean = clean[clean.find("{"):clean.rfind("}")+1]
         return json.loads(clean)
     except Exception as e:
-        print(f"DEBUG: Router Failed - {e}")
+        logger.warning(f"Router Failed - {e}")
         return {"act": "ALL", "expanded_query": query}
 
 class LegalRAG:
     def __init__(self):
-        print(f"Loading embedding model: {EMBEDDING_MODEL}...")
+        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}...")
         self.embedder = SentenceTransformer(EMBEDDING_MODEL)
         
-        print("Loading Cross-Encoder Reranker...")
+        logger.info("Loading Cross-Encoder Reranker...")
         from langchain_community.cross_encoders import HuggingFaceCrossEncoder
         self.reranker = HuggingFaceCrossEncoder(model_name="cross-encoder/ms-marco-MiniLM-L-6-v2")
         
-        print(f"Connecting to Vector DB at {DB_DIR}...")
+        logger.info(f"Connecting to Vector DB at {DB_DIR}...")
         self.client = chromadb.PersistentClient(path=str(DB_DIR))
         self.collection = self.client.get_collection(COLLECTION_NAME)
+        # Dense backend (Chroma or exact NumPy), chosen by LEGALI_VECTOR_BACKEND
+        self.index = build_vector_index(self.collection)
+        logger.info(f"Dense index: {self.index.name} ({len(self.index)} vectors)")
         
         # Connect to SQLite
         self.conn = None
         if not SQLITE_DB_PATH.exists():
-            print(f"CRITICAL WARNING: SQLITE DB NOT FOUND AT {SQLITE_DB_PATH}")
-            print("Did you run migrate_to_db.py? SQLite search will be DISABLED.")
+            logger.warning(f"SQLITE DB NOT FOUND AT {SQLITE_DB_PATH}")
+            logger.warning("Did you run migrate_to_db.py? SQLite search will be DISABLED.")
         else:
             try:
-                print(f"Connecting to SQLite DB at {SQLITE_DB_PATH}...")
+                logger.info(f"Connecting to SQLite DB at {SQLITE_DB_PATH}...")
                 self.conn = sqlite3.connect(str(SQLITE_DB_PATH), check_same_thread=False)
                 self.conn.row_factory = sqlite3.Row
             except Exception as e:
-                print(f"CRITICAL ERROR: Failed to connect to SQLite DB: {e}")
+                logger.error(f"Failed to connect to SQLite DB: {e}")
                 self.conn = None
 
         # Initialize BM25 Retriever
-        print("Loading documents for BM25 Sparse Retrieval...")
+        logger.info("Loading documents for BM25 Sparse Retrieval...")
         from langchain_core.documents import Document
         from langchain_community.retrievers import BM25Retriever
         import json
@@ -126,12 +159,17 @@ class LegalRAG:
         import uuid
         
         bm25_docs = []
+        # Digest of every corpus file served, used for HTTP cache validators (ETag)
+        corpus_hash = hashlib.sha256(EMBEDDING_MODEL.encode("utf-8"))
         data_dir = Path("backend/data/final")
         if data_dir.exists():
-            for filename in os.listdir(data_dir):
+            for filename in sorted(os.listdir(data_dir)):
                 if filename.endswith("_ready.json") or filename.endswith("_ready_v2.json"):
-                    with open(data_dir / filename, 'r', encoding='utf-8') as f:
-                        chunks = json.load(f)
+                    with open(data_dir / filename, 'rb') as f:
+                        raw = f.read()
+                        corpus_hash.update(filename.encode("utf-8"))
+                        corpus_hash.update(raw)
+                        chunks = json.loads(raw)
                         for chunk in chunks:
                             meta = {
                                 "act": str(chunk.get('act', '')),
@@ -143,22 +181,69 @@ class LegalRAG:
                             }
                             bm25_docs.append(Document(page_content=chunk.get('text', ''), metadata=meta))
                             
+        # /search resolves cited legacy sections through the correspondence table, so it is part of the digest too
+        if CORRESPONDENCE_FILE.exists():
+            corpus_hash.update(CORRESPONDENCE_FILE.name.encode("utf-8"))
+            corpus_hash.update(CORRESPONDENCE_FILE.read_bytes())
+
+        self.bm25_docs = bm25_docs
+        self.corpus_digest = corpus_hash.hexdigest()
+
+        # (act, number) -> BM25 doc positions in chunk order (one per chunk id), for cross-reference expansion
+        self.section_docs = {}
+        seen_ids = set()
+        for pos in sorted(range(len(bm25_docs)), key=lambda p: bm25_docs[p].metadata['chunk_index']):
+            meta = bm25_docs[pos].metadata
+            if meta['id'] not in seen_ids:
+                seen_ids.add(meta['id'])
+                self.section_docs.setdefault(section_key(meta), []).append(pos)
+        self.xref = XrefIndex.load(XREF_FILE)
+        logger.info(f"Cross-references: {len(self.xref)} edges")
+
+        # Old-code -> new-code table (IPC/CrPC/IEA -> BNS/BNSS/BSA), checked against the corpus titles
+        self.correspondence = CorrespondenceTable.load(CORRESPONDENCE_FILE)
+        titles = {key: bm25_docs[docs[0]].metadata['title'] for key, docs in self.section_docs.items()}
+        for issue in self.correspondence.verify(titles) if titles else []:
+            logger.warning(f"Correspondence {issue}")
+        logger.info(f"Correspondence table: {len(self.correspondence)} legacy sections")
+
+        # Defined terms of the definitions sections (BNS/BNSS/BSA 2, "X defined."), matched per query
+        self.definitions = DefinitionIndex.load(DEFINITIONS_FILE)
+        logger.info(f"Definitions: {len(self.definitions)} terms")
+
+        # Calibrated dense / rerank score floors; inactive until legali_gate.json has been fitted
+        self.gate = RelevanceGate.load(GATE_FILE) if RETRIEVAL_GATE else RelevanceGate()
+        logger.info(f"Retrieval gate: dense >= {self.gate.dense_min}, rerank >= {self.gate.rerank_min}")
+        # Off-topic classifier over the raw query vector (scripts/train_scope_classifier.py)
+        self.scope = ScopeClassifier.load(SCOPE_MODEL_FILE) if RETRIEVAL_GATE else ScopeClassifier()
+        logger.info(f"Scope classifier: {'threshold ' + str(self.scope.threshold) if self.scope.enabled else 'not trained'}")
         if bm25_docs:
             self.bm25_retriever = BM25Retriever.from_documents(bm25_docs)
             self.bm25_retriever.k = 15
         else:
             self.bm25_retriever = None
-            print("WARNING: No local documents found for BM25.")
+            logger.warning("No local documents found for BM25.")
+
+        # Section-level index (centroid vector + BM25 document per (act, number))
+        self.sections = None
+        self.section_chunks = None
+        if HIERARCHICAL_RETRIEVAL and self.bm25_retriever:
+            # Chunk vectors for centroids and in-section scoring; reuses the dense index when it holds them
+            self.section_chunks = self.index if isinstance(self.index, NumpyIndex) else NumpyIndex.from_collection(self.collection)
+            self.sections = SectionIndex.build(
+                self.section_chunks, bm25_docs, tokenizer=self.bm25_retriever.preprocess_func
+            )
+            logger.info(f"Section index: {len(self.sections)} sections")
         
         # Initialize OpenRouter Client
         api_key = os.getenv("OPENROUTER_API_KEY")
-        print(f"DEBUG: API Key Found: {'Yes' if api_key else 'NO'}")
+        logger.info(f"API Key Found: {'Yes' if api_key else 'NO'}")
         
         if not api_key:
-            print("WARNING: OPENROUTER_API_KEY not found in .env")
+            logger.warning("OPENROUTER_API_KEY not found in .env")
         
         self.sync_client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=OPENROUTER_BASE_URL,
             api_key=api_key or "dummy",
             default_headers={
                 "HTTP-Referer": "http://localhost:8080",
@@ -166,7 +251,7 @@ class LegalRAG:
             }
         )
         self.async_client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=OPENROUTER_BASE_URL,
             api_key=api_key or "dummy",
             default_headers={
                 "HTTP-Referer": "http://localhost:8080",
@@ -174,117 +259,330 @@ class LegalRAG:
             }
         )
 
-    def _log(self, trace_id, message):
-        extra = {'trace_id': trace_id}
-        logger = logging.getLogger("LEGALI")
-        logging.LoggerAdapter(logger, extra).info(message)
+    def _log(self, trace_id, message, level=logging.INFO, payload=None, **fields):
+        """
+        Structured audit record: small `fields` are always written; large `payload` entries
+        (contexts, full responses) only for the sampled share of traces.
+        """
+        logger.log(level, message, extra={"trace_id": trace_id, "fields": fields, "payload": payload})
 
-    def retrieve(self, query, top_k=10, fetch_k=15, lambda_mult=0.2):
-        print(f"DEBUG: Starting LangChain Ensemble Retrieval for: {query}")
-        
-        from langchain_core.retrievers import BaseRetriever
-        from langchain_core.documents import Document
-        from typing import List, Any
-        from langchain_core.callbacks import CallbackManagerForRetrieverRun
-        from pydantic import PrivateAttr
-        
-        # 1. Custom Dense Retriever (Chroma)
-        class CustomChromaRetriever(BaseRetriever):
-            _embedder: Any = PrivateAttr()
-            _collection: Any = PrivateAttr()
-            k: int
-            
-            def __init__(self, embedder, collection, k):
-                super().__init__(k=k)
-                self._embedder = embedder
-                self._collection = collection
-
-            def _get_relevant_documents(self, q: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
-                query_vec = self._embedder.encode([f"Represent this sentence for searching relevant passages: {q}"], normalize_embeddings=True).tolist()
-                results = self._collection.query(
-                    query_embeddings=query_vec, n_results=self.k,
-                    include=["documents", "metadatas"]
-                )
-                docs = []
-                if results.get('ids') and results['ids'][0]:
-                    for i in range(len(results['ids'][0])):
-                        meta = results['metadatas'][0][i]
-                        meta['id'] = results['ids'][0][i]
-                        docs.append(Document(page_content=results['documents'][0][i], metadata=meta))
-                return docs
-                
-        base_retriever = CustomChromaRetriever(embedder=self.embedder, collection=self.collection, k=fetch_k)
-        
-        # 2. Ensemble Fusion
-        from langchain_classic.retrievers import EnsembleRetriever
-        if hasattr(self, 'bm25_retriever') and self.bm25_retriever:
-            ensemble_retriever = EnsembleRetriever(retrievers=[base_retriever, self.bm25_retriever], weights=[0.5, 0.5])
-        else:
-            ensemble_retriever = base_retriever
-            
-        # 3. Contextual Compression (Cross-Encoder)
-        from langchain_classic.retrievers.contextual_compression import ContextualCompressionRetriever
-        from langchain_core.documents import Document
-        from langchain_core.callbacks import CallbackManagerForRetrieverRun
-        from pydantic import Field
-        from langchain_core.retrievers import BaseRetriever
-        
-        # Local definition of CrossEncoderReranker
-        from langchain_core.documents.compressor import BaseDocumentCompressor
-        from typing import Sequence, Any
+    def _dense_search(self, query_vecs, k, act=None):
+        """
+        Runs all query vectors through the dense index in one call.
+        Returns one list of hits per query.
+        """
+        with span("dense_search", queries=len(query_vecs)):
+            return self.index.query(query_vecs, k, act=act)
 
-        class CrossEncoderReranker(BaseDocumentCompressor):
-            model: Any
-            top_n: int = 10
-            
-            def compress_documents(
-                self,
-                documents: Sequence[Document],
-                query: str,
-                callbacks: Any = None,
-            ) -> Sequence[Document]:
-                if not documents:
-                    return []
-                
-                pairs = [[query, doc.page_content] for doc in documents]
-                scores = self.model.score(pairs)
-                
-                scored_docs = list(zip(documents, scores))
-                scored_docs.sort(key=lambda x: x[1], reverse=True)
-                
-                return [doc for doc, _ in scored_docs[:self.top_n]]
-        
-        compressor = CrossEncoderReranker(model=self.reranker, top_n=top_k)
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor,
-            base_retriever=ensemble_retriever
-        )
-        
-        # 4. Invoke Pipeline
-        compressed_docs = compression_retriever.invoke(query)
-        print(f"DEBUG: Successfully retrieved {len(compressed_docs)} Cross-Encoder Reranked chunks.")
-        
-        # 5. Map back to Stream Generator format
-        final_ids = []
-        final_docs = []
-        final_metas = []
-        final_dists = []
-        
-        for doc in compressed_docs:
-            final_ids.append(doc.metadata.get('id', 'unknown'))
-            final_docs.append(doc.page_content)
-            final_metas.append(doc.metadata)
-            final_dists.append(0.0)
-            
+    def _bm25_search(self, query, k, act=None, doc_ids=None):
+        """BM25 top-k over every chunk, or only over `doc_ids` (positions in self.bm25_docs)."""
+        with span("bm25"):
+            if not self.bm25_retriever:
+                return []
+            tokens = self.bm25_retriever.preprocess_func(query)
+            if doc_ids is None:
+                scores = self.bm25_retriever.vectorizer.get_scores(tokens)
+            else:
+                scores = np.asarray(self.bm25_retriever.vectorizer.get_batch_scores(tokens, list(doc_ids)))
+            hits = []
+            for pos in np.argsort(scores)[::-1]:
+                doc = self.bm25_docs[pos if doc_ids is None else doc_ids[pos]]
+                if act and doc.metadata.get('act') != act:
+                    continue
+                hits.append({
+                    "id": doc.metadata['id'],
+                    "text": doc.page_content,
+                    "metadata": dict(doc.metadata),
+                    "distance": None
+                })
+                if len(hits) >= k:
+                    break
+            return hits
+
+    def _fuse(self, dense_hits, bm25_hits):
+        """Weighted Reciprocal Rank Fusion of the dense and BM25 result lists."""
+        with span("fusion"):
+            fused = {}
+            for weight, hits in zip(ENSEMBLE_WEIGHTS, (dense_hits, bm25_hits)):
+                for rank, hit in enumerate(hits, 1):
+                    entry = fused.setdefault(hit['id'], dict(hit, fusion_score=0.0))
+                    entry['fusion_score'] += weight / (rank + RRF_K)
+                    if entry['distance'] is None:
+                        entry['distance'] = hit['distance']
+            return sorted(fused.values(), key=lambda h: h['fusion_score'], reverse=True)
+
+    def _section_candidates(self, queries, query_vecs, fetch_k, act=None):
+        """
+        Two-level retrieval: SECTION_TOP_K sections per query from the section index,
+        then dense + BM25 over the chunks of those sections only, fused as in the flat path.
+        """
+        with span("section_select"):
+            selected = self.sections.select(
+                query_vecs, queries, SECTION_TOP_K, act=act, weights=ENSEMBLE_WEIGHTS, rrf_k=RRF_K
+            )
+        candidates = []
+        for q, vec, sections in zip(queries, query_vecs, selected):
+            rows = self.sections.dense_rows(sections)
+            with span("dense_search", queries=1):
+                dense_hits = self.section_chunks.query_rows([vec], fetch_k, rows)[0]
+            bm25_hits = self._bm25_search(q, fetch_k, doc_ids=self.sections.bm25_doc_ids(sections))
+            candidates.append(self._fuse(dense_hits, bm25_hits))
+        return candidates
+
+    def _expand_xref(self, hits, budget):
+        """
+        Leading chunks of up to `budget` sections referenced by (or referencing) the hits' sections.
+        Dictionary lookups only; expanded hits carry metadata 'xref' = True and no score.
+        """
+        sections = []
+        for hit in hits:
+            key = section_key(hit['metadata'])
+            if key not in sections:
+                sections.append(key)
+        expanded = []
+        for key in self.xref.expand(sections, budget):
+            for pos in self.section_docs.get(key, [])[:XREF_CHUNKS_PER_SECTION]:
+                doc = self.bm25_docs[pos]
+                expanded.append({
+                    "id": doc.metadata['id'],
+                    "text": doc.page_content,
+                    "metadata": dict(doc.metadata, xref=True),
+                    "distance": None,
+                    "score": None
+                })
+        return expanded
+
+    def section_neighbours(self, act, number):
+        """Sections cited by and citing (act, number), with titles; None for an unknown section."""
+        if (act, number) not in self.section_docs:
+            return None
+
+        def describe(keys):
+            out = []
+            for ref_act, ref_number in keys:
+                docs = self.section_docs.get((ref_act, ref_number))
+                title = self.bm25_docs[docs[0]].metadata.get('title', '') if docs else ''
+                out.append({"act": ref_act, "section": ref_number, "title": title})
+            return out
+
+        links = self.xref.neighbours(act, number)
+        return {
+            "act": act,
+            "section": number,
+            "references": describe(links["references"]),
+            "referenced_by": describe(links["referenced_by"])
+        }
+
+    def _definitions_context(self, query):
+        """Statutory definitions of the terms used in `query`, as a context block ("" when none match)."""
+        entries = self.definitions.match(query, limit=MAX_INJECTED_DEFINITIONS)
+        if not entries:
+            return ""
+        return "DEFINITIONS:\n" + "\n".join(format_definition(e) for e in entries) + "\n\n"
+
+    def _out_of_scope(self, query):
+        """
+        Pre-checks on the raw query vector, run before the router and the rerank:
+        the scope classifier (one dot product), then the dense floor (one index lookup).
+        Returns (blocking status or None, query vector or None); the vector is reused by retrieval
+        of the same query string. Questions citing a section ("section 302 IPC") are never blocked.
+        """
+        if not (self.scope.enabled or self.gate.dense_min is not None) or self.correspondence.resolve(query)[1]:
+            return None, None
+        with span("embedding", queries=1):
+            query_vec = self.embedder.encode([f"{QUERY_INSTRUCTION}{query}"], normalize_embeddings=True).tolist()[0]
+        with span("scope_classifier"):
+            reason = self.scope.blocks(query_vec)
+        if reason:
+            return f"BLOCKED_BY_SCOPE_CLASSIFIER: {reason}", query_vec
+        if self.gate.dense_min is None:
+            return None, query_vec
+        hits = self._dense_search([query_vec], 1)[0]
+        similarity = 1.0 - hits[0]['distance'] if hits else None
+        if self.gate.blocks_dense(similarity):
+            status = f"BLOCKED_BY_GATE_LOW_SCORE: best dense similarity {similarity:.3f} < {self.gate.dense_min:.3f}"
+            return status, query_vec
+        return None, query_vec
+
+    def _refusal(self, user_question, trace_id, status):
+        self._log(trace_id, status)
+        set_status("blocked")
         return {
-            'ids': [final_ids],
-            'documents': [final_docs],
-            'metadatas': [final_metas],
-            'distances': [final_dists]
+            "answer": REFUSAL_MESSAGE,
+            "citations": [],
+            "suggested_questions": [],
+            "debug_metadata": {"question": user_question, "status": status}
         }
 
+    def _cited_hits(self, sections, act=None):
+        """
+        Chunks of explicitly cited sections, straight from the section map (no search).
+        Sections are interleaved chunk by chunk so every cited section leads with its first chunk.
+        """
+        per_section = [
+            self.section_docs[key] for key in sections
+            if key in self.section_docs and (not act or key[0] == act)
+        ]
+        hits = []
+        for depth in range(max((len(docs) for docs in per_section), default=0)):
+            for docs in per_section:
+                if depth < len(docs):
+                    doc = self.bm25_docs[docs[depth]]
+                    hits.append({
+                        "id": doc.metadata['id'],
+                        "text": doc.page_content,
+                        "metadata": dict(doc.metadata, exact=True),
+                        "distance": None,
+                        "score": None
+                    })
+        return hits
+
+    def retrieve_batch(self, queries, top_k=10, fetch_k=15, act=None, rerank=True, hierarchical=None,
+                       xref_budget=None, query_vecs=None):
+        """
+        Hybrid retrieval for many queries at once:
+        one embedding call, one vector store call, BM25 per query,
+        and a single cross-encoder call over every (query, candidate) pair.
+        Sections cited by code ("section 302 IPC" -> BNS 103, "BNSS 173") are looked up directly and
+        lead the results; a query that is only such citations skips search entirely.
+        With `hierarchical` (default: HIERARCHICAL_RETRIEVAL) candidates come only from the top sections.
+        `xref_budget` (default: XREF_BUDGET) cross-referenced sections are appended after the top_k hits.
+        `query_vecs` (optional, aligned with `queries`, None entries allowed) are embeddings already computed
+        for the raw query strings; they are skipped when the correspondence table rewrites the query.
+        Returns one retrieval dict per query (same shape as `retrieve`).
+        """
+        if not queries:
+            return []
+        if xref_budget is None:
+            xref_budget = XREF_BUDGET
+
+        # 0. Citation Fast Path (legacy citations rewritten through the correspondence table)
+        cited, pending = [], []
+        for i, q in enumerate(queries):
+            rewritten, sections, _ = self.correspondence.resolve(q)
+            cited.append(self._cited_hits(sections, act=act))
+            if not (cited[i] and is_section_lookup(q)):
+                vec = query_vecs[i] if query_vecs is not None and rewritten == q else None
+                pending.append((i, rewritten, vec))
+
+        candidates = [[] for _ in queries]
+        if pending:
+            ranked = self._ranked_candidates(
+                [q for _, q, _ in pending], fetch_k, act, rerank, hierarchical,
+                query_vecs=[vec for _, _, vec in pending]
+            )
+            for (i, _, _), hits in zip(pending, ranked):
+                candidates[i] = hits
+
+        # 4. Map back to Stream Generator format
+        results = []
+        for exact_hits, hits in zip(cited, candidates):
+            exact_ids = {h['id'] for h in exact_hits}
+            hits = (exact_hits + [h for h in hits if h['id'] not in exact_ids])[:top_k]
+            hits = hits + self._expand_xref(hits, xref_budget)
+            results.append({
+                'ids': [[h['id'] for h in hits]],
+                'documents': [[h['text'] for h in hits]],
+                'metadatas': [[h['metadata'] for h in hits]],
+                'distances': [[h['distance'] for h in hits]],
+                'scores': [[h['score'] for h in hits]]
+            })
+        logger.debug(f"Successfully retrieved {sum(len(r['ids'][0]) for r in results)} reranked chunks.")
+        return results
+
+    def _ranked_candidates(self, queries, fetch_k, act, rerank, hierarchical, query_vecs=None):
+        """
+        Dense + BM25 candidates per query, fused and (optionally) cross-encoder reranked.
+        Only queries without a precomputed vector in `query_vecs` are embedded.
+        """
+        if hierarchical is None:
+            hierarchical = HIERARCHICAL_RETRIEVAL
+        hierarchical = hierarchical and self.sections is not None
+        logger.debug(f"Starting Batched {'Hierarchical' if hierarchical else 'Hybrid'} Retrieval for {len(queries)} queries")
+
+        query_vecs = list(query_vecs) if query_vecs is not None else [None] * len(queries)
+        missing = [i for i, vec in enumerate(query_vecs) if vec is None]
+        if missing:
+            with span("embedding", queries=len(missing)):
+                encoded = self.embedder.encode(
+                    [f"{QUERY_INSTRUCTION}{queries[i]}" for i in missing], normalize_embeddings=True
+                ).tolist()
+            for i, vec in zip(missing, encoded):
+                query_vecs[i] = vec
+
+        if hierarchical:
+            # 1+2. Sections first, then Dense + Sparse + Fusion inside them
+            candidates = self._section_candidates(queries, query_vecs, fetch_k, act=act)
+        else:
+            # 1. Dense (one encode + one store round-trip)
+            dense_results = self._dense_search(query_vecs, fetch_k, act=act)
+
+            # 2. Sparse + Fusion
+            candidates = [
+                self._fuse(dense_results[i], self._bm25_search(q, fetch_k, act=act))
+                for i, q in enumerate(queries)
+            ]
+
+        # 3. Cross-Encoder Rerank (one batched call)
+        if rerank:
+            pairs = [[q, hit['text']] for q, hits in zip(queries, candidates) for hit in hits]
+            with span("rerank", pairs=len(pairs)):
+                scores = self.reranker.score(pairs) if pairs else []
+            offset = 0
+            for hits in candidates:
+                for hit, score in zip(hits, scores[offset:offset + len(hits)]):
+                    hit['score'] = float(score)
+                offset += len(hits)
+                hits.sort(key=lambda h: h['score'], reverse=True)
+        else:
+            for hits in candidates:
+                for hit in hits:
+                    hit['score'] = hit['fusion_score']
+        return candidates
+
+    def _rescore(self, query, retrieval):
+        """
+        Copy of `retrieval` with the cross-encoder scores of `query` against the retrieved chunks.
+        Hits without a score (cited / cross-reference hits) stay unscored.
+        """
+        docs, scores = retrieval['documents'][0], retrieval['scores'][0]
+        rows = [i for i, score in enumerate(scores) if score is not None]
+        with span("rerank", pairs=len(rows)):
+            raw = self.reranker.score([[query, docs[i]] for i in rows]) if rows else []
+        rescored = list(scores)
+        for i, score in zip(rows, raw):
+            rescored[i] = float(score)
+        return dict(retrieval, scores=[rescored])
+
+    def retrieve(self, query, top_k=10, fetch_k=15, lambda_mult=0.2, query_vec=None):
+        query_vecs = [query_vec] if query_vec is not None else None
+        return self.retrieve_batch([query], top_k=top_k, fetch_k=fetch_k, query_vecs=query_vecs)[0]
+
+    def search(self, query, act=None, k=10):
+        """
+        Retrieval-only lookup (no query expansion, no LLM).
+        Returns ranked chunk hits as plain dicts.
+        """
+        with start_trace(str(uuid.uuid4()), "search"):
+            retrieval = self.retrieve_batch([query], top_k=k, fetch_k=max(15, k), act=act, xref_budget=0)[0]
+        hits = []
+        for cid, text, meta, score in zip(
+            retrieval['ids'][0], retrieval['documents'][0],
+            retrieval['metadatas'][0], retrieval['scores'][0]
+        ):
+            hits.append({
+                "id": cid,
+                "score": score,
+                "act": meta.get('act', ''),
+                "section": str(meta.get('section_number', meta.get('number', ''))),
+                "title": meta.get('title', ''),
+                "chunk_index": meta.get('chunk_index', 0),
+                "text": text
+            })
+        return hits
+
     def generate_response(self, question, context_str):
-        print("DEBUG: 1. Received Query for Generation")
+        logger.debug("1. Received Query for Generation")
         
         query_lower = question.lower()
         is_comparative = any(word in query_lower for word in ["difference", "compare", "vs", "versus", "distinction", "punishment between"])
@@ -313,7 +611,7 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
             {"role": "user", "content": user_prompt}
         ]
 
-        print("DEBUG: 2. Context Built, Messages prepared")
+        logger.debug("2. Context Built, Messages prepared")
 
         def call_llm(model_id):
             return self.sync_client.chat.completions.create(
@@ -326,10 +624,11 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
 
         for model_id in MODELS:
             try:
-                print(f"DEBUG: 3. Sending to OpenRouter (Model: {model_id})...")
+                logger.debug(f"3. Sending to OpenRouter (Model: {model_id})...")
                 
-                response = call_llm(model_id)
-                print("DEBUG: 4. Received Response from LLM")
+                with span("llm_total", model=model_id):
+                    response = call_llm(model_id)
+                logger.debug("4. Received Response from LLM")
                 
                 raw_content = response.choices[0].message.content
                 
@@ -352,40 +651,86 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
                     suggestions = parsed.get("suggested_questions", [])
                     return answer_text, suggestions
                 except:
-                    print(f"DEBUG: JSON Parse Failed for {model_id}, returning text fallback")
+                    logger.warning(f"JSON Parse Failed for {model_id}, returning text fallback")
                     return raw_content, ["What are the exceptions?", "Is this bailable?", "Related sections?"]
 
             except Exception as e:
-                print(f"Model {model_id} failed: {e}")
+                logger.warning(f"Model {model_id} failed: {e}")
                 
-        print("CRITICAL: All models failed. Returning DUMMY response.")
+        logger.error("All models failed. Returning DUMMY response.")
         return "System Error: API Connection Failed. (Showing Mock Data)", ["Check Logs", "Check API Key", "Retry Query"]
 
     def query(self, user_question):
         trace_id = str(uuid.uuid4())
         self._log(trace_id, f"Incoming Query: {user_question}")
 
-        # 1. Retrieve
-        print("Step 1: Retrieving documents...")
-        retrieval = self.retrieve(user_question, top_k=5)
+        with start_trace(trace_id, "query"):
+            # 0. Scope Gate (classifier + dense floor, before rerank and LLM)
+            status, query_vec = self._out_of_scope(user_question)
+            if status:
+                return self._refusal(user_question, trace_id, status)
+
+            # 1. Retrieve (reusing the scope gate's embedding of the same question)
+            logger.debug("Step 1: Retrieving documents...")
+            retrieval = self.retrieve(user_question, top_k=5, query_vec=query_vec)
+            return self._answer_from_retrieval(user_question, retrieval, trace_id)
+
+    async def batch_query(self, questions, top_k=5, concurrency=BATCH_LLM_CONCURRENCY):
+        """
+        Answers many questions with shared batched retrieval and concurrent LLM calls.
+        Async generator yielding `query()`-shaped results (plus "index" and "question")
+        in completion order.
+        """
+        trace_id = str(uuid.uuid4())
+        self._log(trace_id, f"Incoming Batch: {len(questions)} questions")
+
+        # 1. Retrieve everything in one pass (off the event loop)
+        with start_trace(trace_id, "batch_retrieve"):
+            retrievals = await asyncio.to_thread(self.retrieve_batch, questions, top_k)
+
+        # 2. Generate concurrently under a limit
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def answer(index, question, retrieval):
+            async with semaphore:
+                try:
+                    with start_trace(f"{trace_id}:{index}", "batch_answer"):
+                        result = await asyncio.to_thread(
+                            self._answer_from_retrieval, question, retrieval, f"{trace_id}:{index}"
+                        )
+                except Exception as e:
+                    result = {"error": str(e), "answer": "", "citations": [], "suggested_questions": []}
+            result["index"] = index
+            result["question"] = question
+            return result
+
+        tasks = [
+            asyncio.ensure_future(answer(i, q, r))
+            for i, (q, r) in enumerate(zip(questions, retrievals))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _answer_from_retrieval(self, user_question, retrieval, trace_id):
         ids = retrieval['ids'][0]
         docs = retrieval['documents'][0]
         metas = retrieval['metadatas'][0]
         
-        self._log(trace_id, f"Retrieved IDs: {ids}")
+        self._log(trace_id, "Retrieved IDs", ids=ids)
 
         # LAYER A: Retrieval Gate
         if not ids:
-            msg = "BLOCKED_BY_GATE_NO_RETRIEVAL"
-            self._log(trace_id, msg)
-            return {
-                "answer": "The provided legal material does not contain information to answer this question.",
-                "citations": [],
-                "suggested_questions": [],
-                "debug_metadata": {"question": user_question, "status": msg}
-            }
-        
+            return self._refusal(user_question, trace_id, "BLOCKED_BY_GATE_NO_RETRIEVAL")
+        reason = self.gate.blocks(retrieval)
+        if reason:
+            return self._refusal(user_question, trace_id, f"BLOCKED_BY_GATE_LOW_SCORE: {reason}")
+
         # 2. Build Context & Citations (Python Logic)
+        build = span("context_build")
         formatted_context_parts = []
         citations = []
         seen_sections = set()
@@ -427,14 +772,15 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
                     "id": src_id
                 })
             
-        context_str = "\n".join(formatted_context_parts)
+        context_str = self._definitions_context(user_question) + "\n".join(formatted_context_parts)
+        build.end(chars=len(context_str))
         
         # 3. Generate Answer (LLM)
         self._log(trace_id, "Calling LLM...")
-        print("Step 3: Calling LLM...")
+        logger.debug("Step 3: Calling LLM...")
         answer, suggested_questions = self.generate_response(user_question, context_str)
 
-        self._log(trace_id, f"Raw LLM Output: {json.dumps(str(answer))}")
+        self._log(trace_id, "Raw LLM Output", payload={"raw_output": str(answer)})
         
         is_refusal = "does not contain information" in answer
         if is_refusal:
@@ -455,7 +801,7 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
         # 5. Validation
         validation_result = self.validate_response(response_object)
         if validation_result["valid"]:
-            self._log(trace_id, f"Final Response: {json.dumps(response_object, ensure_ascii=False)}")
+            self._log(trace_id, "Final Response", payload={"response": response_object})
             return response_object
         else:
             err_obj = {
@@ -469,57 +815,90 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
                     "status": "VALIDATION_FAILED"
                 }
             }
-            self._log(trace_id, f"Final Response (ERROR): {json.dumps(err_obj)}")
+            self._log(
+                trace_id, "Final Response (ERROR)", level=logging.ERROR,
+                reason=validation_result["reason"], payload={"response": err_obj}
+            )
             return err_obj
 
     async def stream_search(self, query, history=[], top_k=10, session_id=None):
         """
         Generator that yields Server-Sent Events (SSE) data.
+        Every stage runs under one trace (per-stage spans, /metrics, slow-request log).
         """
         trace_id = str(uuid.uuid4())
+        with start_trace(trace_id, "stream"):
+            async for event in self._stream_search(query, history, top_k, session_id, trace_id):
+                yield event
+
+    async def _stream_search(self, query, history, top_k, session_id, trace_id):
         self._log(trace_id, f"Incoming Stream Query: {query}")
 
         if session_id and self.conn:
             try:
-                cursor = self.conn.cursor()
-                # Check if session exists; if not, create it using the query as the title
-                cursor.execute("SELECT id FROM sessions WHERE id = ?", (session_id,))
-                if not cursor.fetchone():
-                    title = (query[:35] + "...") if len(query) > 35 else query
-                    cursor.execute("INSERT INTO sessions (id, title) VALUES (?, ?)", (session_id, title))
-                # Save user message
-                cursor.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'user', ?)", (session_id, query))
-                self.conn.commit()
+                with span("db_write"):
+                    cursor = self.conn.cursor()
+                    # Check if session exists; if not, create it using the query as the title
+                    cursor.execute("SELECT id FROM sessions WHERE id = ?", (session_id,))
+                    if not cursor.fetchone():
+                        title = (query[:35] + "...") if len(query) > 35 else query
+                        cursor.execute("INSERT INTO sessions (id, title) VALUES (?, ?)", (session_id, title))
+                    # Save user message
+                    cursor.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'user', ?)", (session_id, query))
+                    self.conn.commit()
             except Exception as e:
-                print(f"DEBUG: DB Save Error: {e}")
+                self._log(trace_id, f"DB Save Error: {e}", level=logging.WARNING)
 
         # 0. Agentic Query Expansion (Lexical Gap Bridging)
-        try:
-            filters = await analyze_query_for_filters(query, self.async_client, LLM_MODEL)
-            search_query = filters.get("expanded_query", query)
-            self._log(trace_id, f"Expanded Search Query: {search_query}")
-            print(f"DEBUG: Original Query: {query}")
-            print(f"DEBUG: Expanded Search Query: {search_query}")
-        except Exception as e:
-            self._log(trace_id, f"Query Expansion failed: {e}")
+        # Citations by code ("section 302 IPC") resolve through the correspondence table instead
+        rewritten, cited_sections, correspondence_notes = self.correspondence.resolve(query)
+        # Scope Gate: off-topic questions are refused before the router call
+        status, query_vec = (None, None) if cited_sections else self._out_of_scope(query)
+        if status:
+            self._log(trace_id, status)
+            set_status("blocked")
+            yield sse_event({"chunk": "The provided legal material does not contain information to answer this query."})
+            yield sse_event({"citations": [], "chips": []})
+            return
+        if cited_sections:
             search_query = query
+            self._log(trace_id, f"Cited Sections: {cited_sections} (rewritten: {rewritten})")
+        else:
+            try:
+                with span("router"):
+                    filters = await analyze_query_for_filters(query, self.async_client, LLM_MODEL)
+                search_query = filters.get("expanded_query", query)
+                self._log(trace_id, "Expanded Search Query", original=query, expanded=search_query)
+            except Exception as e:
+                self._log(trace_id, f"Query Expansion failed: {e}", level=logging.WARNING)
+                search_query = query
         
-        # 1. Retrieve using Expanded Keywords
-        retrieval = self.retrieve(search_query, top_k=top_k)
+        # 1. Retrieve using Expanded Keywords (the gate's vector only fits an unexpanded query)
+        retrieval = self.retrieve(
+            search_query, top_k=top_k, query_vec=query_vec if search_query == query else None
+        )
         ids = retrieval['ids'][0]
         docs = retrieval['documents'][0]
         metas = retrieval['metadatas'][0]
 
-        # LAYER A: Retrieval Gate
+        # LAYER A: Retrieval Gate (nothing retrieved, or best scores under the calibrated floors).
+        # The rerank floor is calibrated on raw questions, so an expanded query is re-scored against `query`
         if not ids:
+            reason = "no retrieval"
+        elif search_query != query and self.gate.rerank_min is not None:
+            reason = self.gate.blocks(self._rescore(query, retrieval))
+        else:
+            reason = self.gate.blocks(retrieval)
+        if reason:
+             self._log(trace_id, f"BLOCKED_BY_GATE: {reason}")
+             set_status("blocked")
              msg = "The provided legal material does not contain information to answer this query."
-             yield f'data: {json.dumps({"chunk": msg})}\n\n'
-             await asyncio.sleep(0)
-             yield f'data: {json.dumps({"citations": [], "chips": []})}\n\n'
-             await asyncio.sleep(0)
+             yield sse_event({"chunk": msg})
+             yield sse_event({"citations": [], "chips": []})
              return
 
         # 2. Build Context & Citations
+        build = span("context_build")
         formatted_context_parts = []
         final_citations = []
         seen_sections = set()
@@ -560,7 +939,11 @@ Do not refuse to answer; use the provided context to synthesize the comparison."
                     "id": src_id
                 })
             
-        context_str = "\n".join(formatted_context_parts)
+        context_str = self._definitions_context(query) + "\n".join(formatted_context_parts)
+        if correspondence_notes:
+            # The user cited repealed-code sections; say which 2023 sections now hold them
+            context_str = "CORRESPONDENCE:\n" + "\n".join(correspondence_notes) + "\n\n" + context_str
+        build.end(chars=len(context_str))
         
         # 3. System Prompt
         query_lower = query.lower()
@@ -600,10 +983,17 @@ ANSWER (As a Legal Stenographer):
         messages.append({"role": "user", "content": user_prompt})
 
         # 4. Stream Generation
-        full_response_text = ""
+        # Deltas are coalesced into larger frames; if the consumer goes away
+        # (client disconnect -> generator closed/cancelled) the upstream
+        # completion is closed in `finally` so we stop paying for tokens.
+        response_parts = []
+        coalescer = DeltaCoalescer()
+        stream = None
         
+        model_id = LLM_MODEL
+        llm = span("llm_total", model=model_id)
+        ttft = span("llm_ttft", model=model_id)
         try:
-            model_id = LLM_MODEL
             stream = await self.async_client.chat.completions.create(
                 model=model_id,
                 messages=messages,
@@ -617,16 +1007,31 @@ ANSWER (As a Legal Stenographer):
                 if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
                     content = chunk.choices[0].delta.content or ""
                     if content:
-                        full_response_text += content
-                        yield f'data: {json.dumps({"chunk": content})}\n\n'
-                        await asyncio.sleep(0)
+                        ttft.end()
+                        response_parts.append(content)
+                        frame_text = coalescer.push(content)
+                        if frame_text:
+                            yield sse_event({"chunk": frame_text})
+
+            frame_text = coalescer.flush()
+            if frame_text:
+                yield sse_event({"chunk": frame_text})
                     
         except Exception as e:
             err_msg = f"Error generating stream: {str(e)}"
-            self._log(trace_id, err_msg)
-            yield f'data: {json.dumps({"error": err_msg})}\n\n'
-            await asyncio.sleep(0)
+            self._log(trace_id, err_msg, level=logging.ERROR)
+            set_status("error")
+            yield sse_event({"error": err_msg})
             return
+        finally:
+            llm.end(chars=sum(len(p) for p in response_parts))
+            if stream is not None:
+                try:
+                    await stream.close()
+                except Exception:
+                    pass
+
+        full_response_text = "".join(response_parts)
 
         # 5. Post-Processing
         answer_parts = full_response_text.split("SUGGESTED_Q:")
@@ -646,18 +1051,18 @@ ANSWER (As a Legal Stenographer):
             "citations": final_citations,
             "chips": suggested_questions
         }
-        yield f'data: {json.dumps(meta_payload)}\n\n'
-        await asyncio.sleep(0)
+        yield sse_event(meta_payload)
         
         self._log(trace_id, "Stream Complete")
 
         if session_id and self.conn:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'assistant', ?)", (session_id, full_response_text))
-                self.conn.commit()
+                with span("db_write"):
+                    cursor = self.conn.cursor()
+                    cursor.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'assistant', ?)", (session_id, full_response_text))
+                    self.conn.commit()
             except Exception as e:
-                print(f"DEBUG: DB Save Error: {e}")
+                self._log(trace_id, f"DB Save Error: {e}", level=logging.WARNING)
 
     def validate_response(self, response):
         if "answer" not in response or "citations" not in response:
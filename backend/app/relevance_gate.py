@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+GATE_FILE = Path("backend/data/final/legali_gate.json")
+GATE_VERSION = 1
+# Fallback gap below the weakest in-scope score when no out-of-scope score falls under it
+DEFAULT_MARGIN = 0.05
+
+
+def top_scores(retrieval):
+    """
+    (best dense similarity, best rerank score, has_exact_hit) of one retrieval dict.
+    Hits without a dense distance (BM25-only) or score (cited / cross-reference hits) are skipped.
+    """
+    metas = retrieval['metadatas'][0]
+    distances = [d for d in retrieval['distances'][0] if d is not None]
+    scores = [s for s in retrieval['scores'][0] if s is not None]
+    exact = any((m or {}).get('exact') for m in metas)
+    return (
+        1.0 - min(distances) if distances else None,
+        max(scores) if scores else None,
+        exact,
+    )
+
+
+def fit_threshold(positives, negatives, margin=DEFAULT_MARGIN):
+    """
+    Largest threshold that keeps every in-scope (positive) score: halfway between the weakest positive
+    and the strongest negative below it, or `margin` under the weakest positive when none is below.
+    Returns the threshold with how many positives/negatives it would block.
+    """
+    floor = min(positives)
+    below = [n for n in negatives if n < floor]
+    threshold = (floor + max(below)) / 2 if below else floor - margin
+    return {
+        "threshold": threshold,
+        "positives_blocked": sum(p < threshold for p in positives),
+        "negatives_blocked": sum(n < threshold for n in negatives),
+        "positives": len(positives),
+        "negatives": len(negatives),
+    }
+
+
+class RelevanceGate:
+    """
+    Refuses out-of-scope questions before any LLM work, on calibrated score floors:
+    `dense_min` (cosine of the best chunk for the raw question, checked before the router/rerank)
+    and `rerank_min` (best cross-encoder score of the raw question after retrieval). A floor of None
+    disables that check.
+    """
+
+    def __init__(self, dense_min=None, rerank_min=None):
+        self.dense_min = dense_min
+        self.rerank_min = rerank_min
+
+    @property
+    def enabled(self):
+        return self.dense_min is not None or self.rerank_min is not None
+
+    @classmethod
+    def load(cls, path=GATE_FILE):
+        """Disabled gate when the thresholds have not been calibrated yet."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("dense_min"), data.get("rerank_min"))
+
+    def blocks_dense(self, similarity):
+        """True when the best dense match of the raw question is below the floor."""
+        return self.dense_min is not None and similarity is not None and similarity < self.dense_min
+
+    def blocks(self, retrieval):
+        """
+        Reason string when the best reranked chunk is too weak to answer from, else None.
+        Explicitly cited sections always pass.
+        """
+        _, rerank, exact = top_scores(retrieval)
+        if exact or self.rerank_min is None or rerank is None or rerank >= self.rerank_min:
+            return None
+        return f"best rerank score {rerank:.3f} < {self.rerank_min:.3f}"
+
+
+def save_thresholds(path, dense_fit, rerank_fit, **info):
+    data = {
+        "version": GATE_VERSION,
+        "dense_min": dense_fit["threshold"],
+        "rerank_min": rerank_fit["threshold"],
+        "dense": dense_fit,
+        "rerank": rerank_fit,
+        **info,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
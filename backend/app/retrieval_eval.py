@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+
+from backend.app.section_index import section_key
+from backend.app.xref import key
+
+# Cut-offs reported for recall (nDCG is reported at the largest)
+RECALL_KS = (1, 3, 5, 10)
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def ranked_sections(hits):
+    """Distinct "ACT:number" keys of ranked chunk hits, in first-seen order (a section counts once)."""
+    ranked = []
+    for hit in hits:
+        section = key(*section_key(hit.get("metadata")))
+        if section not in ranked:
+            ranked.append(section)
+    return ranked
+
+
+def recall_at_k(ranked, expected, k):
+    """Share of the expected sections found in the first k ranked sections."""
+    if not expected:
+        return 1.0
+    return len(set(ranked[:k]) & set(expected)) / len(set(expected))
+
+
+def reciprocal_rank(ranked, expected):
+    """1 / rank of the first expected section (0.0 when none is retrieved)."""
+    for rank, section in enumerate(ranked, 1):
+        if section in expected:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked, expected, k):
+    """Binary-relevance nDCG@k: DCG of the ranking over the DCG of a perfect one."""
+    expected = set(expected)
+    if not expected:
+        return 1.0
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, s in enumerate(ranked[:k], 1) if s in expected)
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(expected), k) + 1))
+    return dcg / ideal
+
+
+def latency_percentiles(samples_ms, percentiles=LATENCY_PERCENTILES):
+    if not samples_ms:
+        return {}
+    return {f"p{p}": round(float(np.percentile(samples_ms, p)), 3) for p in percentiles}
+
+
+def summarize(rankings, expected, stage_ms, ks=RECALL_KS):
+    """
+    Quality and latency of one configuration.
+    rankings: ranked section keys per query; expected: expected keys per query;
+    stage_ms: {stage: [milliseconds per query]} (including "total").
+    """
+    n = len(rankings)
+    metrics = {"queries": n}
+    for k in ks:
+        metrics[f"recall@{k}"] = round(sum(recall_at_k(r, e, k) for r, e in zip(rankings, expected)) / n, 4)
+    metrics["mrr"] = round(sum(reciprocal_rank(r, e) for r, e in zip(rankings, expected)) / n, 4)
+    metrics[f"ndcg@{max(ks)}"] = round(sum(ndcg_at_k(r, e, max(ks)) for r, e in zip(rankings, expected)) / n, 4)
+    metrics["latency_ms"] = {stage: latency_percentiles(samples) for stage, samples in sorted(stage_ms.items())}
+    return metrics
+
+
+def compare(current, baseline, tolerance=0.02):
+    """
+    Differences between two benchmark reports ({"configs": {name: metrics}}).
+    Returns (lines, regressions): every quality delta, and the ones that dropped by more than `tolerance`.
+    """
+    lines, regressions = [], []
+    for name, metrics in current.get("configs", {}).items():
+        base = baseline.get("configs", {}).get(name)
+        if base is None:
+            lines.append(f"{name}: new configuration")
+            continue
+        for metric, value in metrics.items():
+            if metric in ("queries", "latency_ms") or metric not in base:
+                continue
+            delta = value - base[metric]
+            line = f"{name} {metric}: {base[metric]:.4f} -> {value:.4f} ({delta:+.4f})"
+            lines.append(line)
+            if delta < -tolerance:
+                regressions.append(line)
+        total, base_total = metrics["latency_ms"].get("total", {}), base.get("latency_ms", {}).get("total", {})
+        if "p95" in total and "p95" in base_total:
+            lines.append(f"{name} total p95: {base_total['p95']:.1f} ms -> {total['p95']:.1f} ms")
+    return lines, regressions
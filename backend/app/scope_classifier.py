@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+MODEL_FILE = Path("backend/data/final/legali_scope.json")
+MODEL_VERSION = 1
+# Out-of-scope refusals must be right: the threshold is the lowest whose held-out precision reaches this
+MIN_PRECISION = 0.98
+
+
+def train_logistic(X, y, l2=1e-2, epochs=500, lr=1.0):
+    """
+    L2-regularised logistic regression by full-batch gradient descent.
+    X: (n, dim) query vectors, y: 1 for out-of-scope, 0 for in-scope. Returns (weights, bias).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    weights = np.zeros(X.shape[1])
+    bias = 0.0
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(X @ weights + bias)))
+        error = p - y
+        weights -= lr * (X.T @ error / len(y) + l2 * weights)
+        bias -= lr * float(error.mean())
+    return weights, bias
+
+
+def cross_val_probabilities(X, y, folds=5, seed=0, **train_args):
+    """Out-of-fold P(out-of-scope) for every example (each scored by a model that never saw it)."""
+    X, y = np.asarray(X), np.asarray(y)
+    order = np.random.default_rng(seed).permutation(len(y))
+    probs = np.zeros(len(y))
+    for fold in np.array_split(order, folds):
+        train = np.setdiff1d(order, fold)
+        weights, bias = train_logistic(X[train], y[train], **train_args)
+        probs[fold] = 1.0 / (1.0 + np.exp(-(X[fold] @ weights + bias)))
+    return probs
+
+
+def precision_recall(probs, y, threshold):
+    """Precision and recall of the out-of-scope class at `threshold`."""
+    predicted = np.asarray(probs) >= threshold
+    actual = np.asarray(y).astype(bool)
+    tp = int((predicted & actual).sum())
+    precision = tp / int(predicted.sum()) if predicted.any() else 1.0
+    recall = tp / int(actual.sum()) if actual.any() else 0.0
+    return precision, recall
+
+
+def pick_threshold(probs, y, min_precision=MIN_PRECISION):
+    """Lowest threshold (best recall) whose out-of-scope precision reaches `min_precision`; 1.0 refuses nothing."""
+    for threshold in sorted(set(float(p) for p in probs)):
+        if precision_recall(probs, y, threshold)[0] >= min_precision:
+            return threshold
+    return 1.0
+
+
+class ScopeClassifier:
+    """
+    Logistic model over normalized bge query vectors: P(question is outside Indian criminal law).
+    Scoring is one dot product, so it runs on the query embedding before the router call.
+    """
+
+    def __init__(self, weights=None, bias=0.0, threshold=1.0):
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.threshold = float(threshold)
+
+    @property
+    def enabled(self):
+        return self.weights is not None
+
+    @classmethod
+    def load(cls, path=MODEL_FILE):
+        """Disabled classifier when the model has not been trained yet."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["weights"], data["bias"], data["threshold"])
+
+    def save(self, path=MODEL_FILE, **info):
+        data = {
+            "version": MODEL_VERSION,
+            "threshold": self.threshold,
+            "bias": self.bias,
+            **info,
+            "weights": [round(float(w), 6) for w in self.weights],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def probability(self, query_vec):
+        """P(out-of-scope) of one query vector."""
+        z = float(np.dot(self.weights, np.asarray(query_vec, dtype=np.float32))) + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def blocks(self, query_vec):
+        """Reason string when the query is confidently out of scope, else None."""
+        if not self.enabled:
+            return None
+        p = self.probability(query_vec)
+        if p >= self.threshold:
+            return f"p(out of scope) {p:.3f} >= {self.threshold:.3f}"
+        return None
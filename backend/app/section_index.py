@@ -0,0 +1,128 @@
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+# Sections fused from each ranking before cutting to k (dense centroid and BM25 lists)
+SECTION_POOL_FACTOR = 4
+
+
+def section_key(meta):
+    """(act, section number) of a chunk's metadata; Chroma stores `section_number`, the JSON `number`."""
+    meta = meta or {}
+    return (str(meta.get("act", "")), str(meta.get("section_number", meta.get("number", ""))))
+
+
+class SectionIndex:
+    """
+    Section-level view of the chunk corpus, for two-level retrieval.
+    Each (act, number) section has one dense vector (the normalized centroid of its chunk vectors)
+    and one BM25 document (title + its chunks in chunk_index order). `select` ranks sections;
+    `dense_rows` / `bm25_doc_ids` map the chosen sections back to chunk positions so chunk scoring
+    and reranking only touch those sections.
+    """
+
+    def __init__(self, keys, titles, centroids, bm25, dense_rows, bm25_doc_ids, tokenizer=str.split):
+        if not (len(keys) == len(titles) == len(dense_rows) == len(bm25_doc_ids) == centroids.shape[0]):
+            raise ValueError("keys, titles, centroids and chunk maps must line up")
+        self.keys = list(keys)
+        self.titles = list(titles)
+        self.centroids = centroids
+        self.bm25 = bm25
+        self.tokenizer = tokenizer
+        self._dense_rows = dense_rows
+        self._bm25_doc_ids = bm25_doc_ids
+
+        acts = {}
+        for pos, (act, _) in enumerate(self.keys):
+            acts.setdefault(act, []).append(pos)
+        self._act_sections = {act: np.asarray(pos, dtype=np.int64) for act, pos in acts.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, chunk_index, docs, tokenizer=str.split):
+        """
+        `chunk_index`: a NumpyIndex over the chunk vectors (rows grouped by their metadata).
+        `docs`: the BM25 chunk documents (objects with `page_content` and `metadata`).
+        Sections present only on one side still get an entry (zero centroid / empty BM25 text).
+        """
+        sections = {}
+
+        def entry(key):
+            return sections.setdefault(key, {"title": "", "rows": [], "docs": []})
+
+        for row, meta in enumerate(chunk_index.metadatas):
+            sec = entry(section_key(meta))
+            sec["rows"].append(row)
+            sec["title"] = sec["title"] or str(meta.get("title", ""))
+        for doc_id, doc in enumerate(docs):
+            sec = entry(section_key(doc.metadata))
+            sec["docs"].append(doc_id)
+            sec["title"] = sec["title"] or str(doc.metadata.get("title", ""))
+
+        keys = list(sections)
+        dim = chunk_index.matrix.shape[1] if len(chunk_index) else 0
+        centroids = np.zeros((len(keys), dim), dtype=np.float32)
+        corpus, dense_rows, bm25_doc_ids = [], [], []
+        for pos, key in enumerate(keys):
+            sec = sections[key]
+            rows = np.sort(np.asarray(sec["rows"], dtype=np.int64))
+            if len(rows):
+                # Chunk scores are cosines, so average unit vectors
+                centroid = chunk_index.unit_rows(rows).mean(axis=0)
+                centroids[pos] = centroid / max(float(np.linalg.norm(centroid)), 1e-12)
+            dense_rows.append(rows)
+
+            # One text per chunk id; duplicate files (_ready / _ready_v2) would double-count terms
+            texts, seen = [sec["title"]], set()
+            for doc_id in sorted(sec["docs"], key=lambda d: docs[d].metadata.get("chunk_index", 0)):
+                cid = docs[doc_id].metadata.get("id")
+                if cid not in seen:
+                    seen.add(cid)
+                    texts.append(docs[doc_id].page_content)
+            corpus.append(tokenizer(" ".join(texts)) or [""])
+            bm25_doc_ids.append(sec["docs"])
+
+        bm25 = BM25Okapi(corpus) if corpus else None
+        return cls(keys, [sections[k]["title"] for k in keys], centroids, bm25, dense_rows, bm25_doc_ids,
+                   tokenizer=tokenizer)
+
+    def select(self, query_vecs, queries, k, act=None, weights=(0.5, 0.5), rrf_k=60):
+        """
+        Top-k section positions per query: weighted Reciprocal Rank Fusion of the centroid
+        cosine ranking and the section BM25 ranking (optionally restricted to one act).
+        """
+        if act:
+            candidates = self._act_sections.get(act)
+            if candidates is None:
+                return [[] for _ in queries]
+        else:
+            candidates = np.arange(len(self.keys))
+        if not len(candidates):
+            return [[] for _ in queries]
+
+        q = np.atleast_2d(np.asarray(query_vecs, dtype=np.float32))
+        q = q / np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+        dense = q @ self.centroids[candidates].T
+        pool = min(len(candidates), k * SECTION_POOL_FACTOR)
+
+        selected = []
+        for q_idx, query in enumerate(queries):
+            sparse = np.asarray(self.bm25.get_batch_scores(self.tokenizer(query), candidates.tolist()))
+            fused = {}
+            for weight, scores in zip(weights, (dense[q_idx], sparse)):
+                for rank, col in enumerate(np.argsort(-scores, kind="stable")[:pool], 1):
+                    fused[col] = fused.get(col, 0.0) + weight / (rank + rrf_k)
+            best = sorted(fused, key=lambda col: fused[col], reverse=True)[:k]
+            selected.append([int(candidates[col]) for col in best])
+        return selected
+
+    def dense_rows(self, sections):
+        """Chunk-index rows of the given sections, ascending (sequential reads on a memmap)."""
+        if not sections:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self._dense_rows[s] for s in sections]))
+
+    def bm25_doc_ids(self, sections):
+        """Positions in the BM25 document list of the given sections."""
+        return sorted(d for s in sections for d in self._bm25_doc_ids[s])
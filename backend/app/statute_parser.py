@@ -0,0 +1,471 @@
+import argparse
+import bisect
+import json
+import re
+import sys
+from pathlib import Path
+
+# --------------------------------------------------
+# PATH SETUP
+# --------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+CLEANED_TEXT_DIR = DATA_DIR / "cleaned_text"
+STRUCTURED_DIR = DATA_DIR / "structured"
+
+# Hyphen, En-dash, Em-dash
+DASH = r"[\-–—]"
+# " 12. " anywhere in running text (cleaned text files are mostly a single line)
+NUMBERED = r"(?<=\s)(?P<num>\d+)\.\s"
+MISSING_BODY = "MISSING_BODY"
+
+# --------------------------------------------------
+# ACT SPECS
+# --------------------------------------------------
+# One entry per act. Adding an act means adding a spec here, not another parse script.
+#
+#   input / pdf           cleaned text file, or a PDF read through pdf_extract with `pdf_engine`
+#   output                structured JSON path
+#   normalize             (pattern, replacement) substitutions applied before tokenizing
+#   strip_lines           strip every line and drop empty ones before tokenizing
+#   body_start            (pattern, occurrence): the Act body starts at that match (the TOC comes first);
+#                         falls back to the last match if there are fewer (unless `strict`)
+#   strict                fail instead of guessing: fewer body_start matches than `occurrence`, or no
+#                         chapter heading in the body, raise (a malformed text would otherwise parse the TOC)
+#   section_start         token regex for a possible section start; must define the group `num`
+#   chapter               chapter heading regex (None: every section gets `default_chapter`)
+#   flags                 regex flags for section_start / chapter
+#   sequence              "all": every section_start whose `header` matches is a section
+#                         "sequential": sections are numbered first_number, +1, +2 ... in text order;
+#                         up to max_skip - 1 numbers may be missing (recorded with MISSING_BODY)
+#   header                regex matched at a section start; optional group `title`
+#   titles                "header" or "arrangement" (titles and chapters read from the TOC before the body)
+#   text_from             "header_end" or "section_start"
+#   chapter_ends_section  a chapter heading cuts off the text of the section it appears in
+#   chapter_extent        "match": label is the heading match; "section": label runs up to the next section
+#   fields / constants    output record layout; fields map output keys to number/title/chapter/text
+#   expected_sections     (min, max) sanity range, or None
+
+ACT_SPECS = {
+    "bns": {
+        "name": "THE BHARATIYA NYAYA SANHITA, 2023",
+        "input": CLEANED_TEXT_DIR / "bns.txt",
+        "output": STRUCTURED_DIR / "bns.json",
+        # Fix OCR-style inline formatting: CHAPTER headings and section numbers start on new lines
+        "normalize": [
+            (r"\s+(CHAPTER\s+[IVXLCDM]+)", r"\n\1"),
+            (r"\s+(SECTIONS\s+\d+\.)", r"\n\1"),
+            (r"\s+(\d{1,3}\.\s+[A-Z])", r"\n\1"),
+        ],
+        "body_start": (re.escape("THE BHARATIYA NYAYA SANHITA, 2023"), 2),
+        "strict": True,
+        "section_start": r"^\s*(?P<num>\d{1,3})\.\s+[A-Z]",
+        "chapter": r"^CHAPTER\s+[IVXLCDM]+\s+[A-Z][A-Z\s]+",
+        "flags": re.MULTILINE,
+        "sequence": "all",
+        "header": rf"\s*(?P<num>\d{{1,3}})\.\s+(?P<title>[A-Z][^\n—–-]+?){DASH}\s*",
+        "titles": "header",
+        "text_from": "header_end",
+        "chapter_ends_section": False,
+        "chapter_extent": "match",
+        "default_chapter": "UNKNOWN CHAPTER",
+        "fields": {"chapter": "chapter", "section_number": "number", "section_title": "title", "text": "text"},
+        "expected_sections": (350, 365),
+    },
+    "bnss": {
+        "name": "THE BHARATIYA NAGARIK SURAKSHA SANHITA, 2023",
+        "input": CLEANED_TEXT_DIR / "bnss.txt",
+        "output": STRUCTURED_DIR / "bnss.json",
+        # Body starts at the text of clause 1 ("1. (1) This Sanhita may be called...")
+        "body_start": (r"1\.\s*\(1\)", 1),
+        "section_start": NUMBERED,
+        "chapter": r"CHAPTER\s+[IVXLCDM]+",
+        "sequence": "sequential",
+        "max_skip": 9,
+        "titles": "arrangement",
+        "text_from": "section_start",
+        "chapter_ends_section": False,
+        "chapter_extent": "match",
+        "default_chapter": "PRELIMINARY",
+        "fields": {"chapter": "chapter", "clause_number": "number", "clause_title": "title", "text": "text"},
+        "expected_sections": (520, 540),
+    },
+    "bsa": {
+        "name": "THE BHARATIYA SAKSHYA ADHINIYAM, 2023",
+        "input": CLEANED_TEXT_DIR / "bsa.txt",
+        "output": STRUCTURED_DIR / "bsa.json",
+        # 1st "1. Short title" is in the Arrangement, 2nd starts the Body
+        "body_start": (r"1\.\s+Short title", 2),
+        "section_start": NUMBERED,
+        "chapter": r"CHAPTER\s+[IVXLCDM]+",
+        "sequence": "sequential",
+        "max_skip": 1,
+        "header": rf"(?P<num>\d+)\.\s+(?P<title>.*?){DASH}+",
+        "titles": "header",
+        "text_from": "header_end",
+        "chapter_ends_section": True,
+        "chapter_extent": "section",
+        "default_chapter": "CHAPTER I PRELIMINARY",
+        "fields": {"chapter": "chapter", "section_number": "number", "section_title": "title", "text": "text"},
+        "expected_sections": (160, 190),
+    },
+    "it_act": {
+        "name": "Information Technology Act, 2000",
+        "pdf": DATA_DIR / "raw_pdfs" / "IT-Act.pdf",
+        "pdf_engine": "pypdf",
+        "output": DATA_DIR / "final" / "it_act_ready.json",
+        "strip_lines": True,
+        # e.g. "66. Computer related offences." or "66A. Punishment for..." at the start of a line
+        "section_start": r"^(?P<num>\d+[A-Z]*)\.[^\S\n]+",
+        "chapter": None,
+        "flags": re.MULTILINE,
+        "sequence": "all",
+        "header": r"(?P<num>\d+[A-Z]*)\.[^\S\n]+(?P<title>.*)",
+        "titles": "header",
+        "text_from": "section_start",
+        "number_type": str,
+        "default_chapter": "Unknown",
+        "constants": {"source": "Information Technology Act, 2000", "unit_type": "Section"},
+        "fields": {"unit_id": "number", "title": "title", "text": "text", "chapter": "chapter"},
+        "expected_sections": None,
+    },
+}
+
+TITLE_TRAILING_DOTS = re.compile(r"\.*$")
+TITLE_PAGE_NUMBER = re.compile(r"\s+\d+$")
+
+
+def collapse(text):
+    return " ".join(text.split())
+
+
+class StatuteParser:
+    """
+    Spec-driven statute parser.
+    The text is tokenized once into section-start and chapter-heading offsets;
+    sections are selected from the tokens and chapters are assigned by bisect over heading offsets.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        flags = spec.get("flags", 0)
+        parts = [rf"(?P<section>{spec['section_start']})"]
+        if spec.get("chapter"):
+            parts.insert(0, rf"(?P<chapter>{spec['chapter']})")
+        self.token_re = re.compile("|".join(parts), flags)
+        self.header_re = re.compile(spec["header"], flags) if spec.get("header") else None
+        self.normalize_rules = [(re.compile(p), r) for p, r in spec.get("normalize", [])]
+        self.body_start_re = re.compile(spec["body_start"][0]) if spec.get("body_start") else None
+        self.number_type = spec.get("number_type", int)
+
+    # ---------------- preprocessing ----------------
+
+    def normalize(self, text):
+        if self.spec.get("strip_lines"):
+            text = "\n".join(line.strip() for line in text.split("\n") if line.strip())
+        for pattern, replacement in self.normalize_rules:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def find_body_start(self, text):
+        if self.body_start_re is None:
+            return 0
+        occurrence = self.spec["body_start"][1]
+        matches = []
+        for m in self.body_start_re.finditer(text):
+            matches.append(m.start())
+            if len(matches) == occurrence:
+                return m.start()
+        if not matches or self.spec.get("strict"):
+            raise RuntimeError(
+                f"Cannot locate body of {self.spec['name']} safely: "
+                f"{len(matches)} of {occurrence} body start matches"
+            )
+        print(f"Warning: fewer than {occurrence} matches for the body start of {self.spec['name']}. Using the last one.")
+        return matches[-1]
+
+    # ---------------- tokenizing ----------------
+
+    def tokenize(self, text):
+        """Single pass over the text: section-start tokens grouped by number, and chapter headings."""
+        sections = []       # (start, end, num) in text order
+        by_number = {}      # num -> [start, ...] ascending
+        chapters = []       # (start, end)
+        for m in self.token_re.finditer(text):
+            if m.group("section") is not None:
+                num = m.group("num")
+                sections.append((m.start(), m.end(), num))
+                by_number.setdefault(num, []).append(m.start())
+            else:
+                chapters.append((m.start(), m.end()))
+        return sections, by_number, chapters
+
+    def _positions(self, by_number, number):
+        return by_number.get(str(number), [])
+
+    @staticmethod
+    def _first_after(positions, pos):
+        """First offset strictly after `pos`, or None."""
+        i = bisect.bisect_right(positions, pos)
+        return positions[i] if i < len(positions) else None
+
+    # ---------------- section selection ----------------
+
+    def select_all(self, text, sections, body_start):
+        """Every section-start token whose header matches; a section runs to the next token."""
+        starts = [s for s, _, _ in sections]
+        spans = []
+        for i, (start, _, num) in enumerate(sections):
+            if start < body_start:
+                continue
+            header = self.header_re.match(text, start)
+            if not header:
+                continue
+            end = starts[i + 1] if i + 1 < len(starts) else len(text)
+            spans.append({"number": num, "start": start, "end": end, "header": header})
+        return spans
+
+    def select_sequential(self, by_number, body_start, length):
+        """
+        Sections numbered in order from the body start: the next section is the first occurrence of
+        number + 1 after the current start, or the earliest of number + 2 .. number + max_skip if that is missing.
+        """
+        max_skip = self.spec.get("max_skip", 1)
+        number = self.spec.get("first_number", 1)
+        start = body_start
+        spans = []
+
+        while True:
+            best = None
+            for step in range(1, max_skip + 1):
+                pos = self._first_after(self._positions(by_number, number + step), start)
+                if pos is None:
+                    continue
+                if best is None or pos < best[1]:
+                    best = (number + step, pos)
+                if step == 1:
+                    break
+
+            if best is None:
+                spans.append({"number": str(number), "start": start, "end": length})
+                return spans
+
+            spans.append({"number": str(number), "start": start, "end": best[1]})
+            for missing in range(number + 1, best[0]):
+                print(f"Warning: Section {missing} of {self.spec['name']} body missing/skipped.")
+                spans.append({"number": str(missing), "missing": True})
+            number, start = best
+
+    # ---------------- titles & chapters ----------------
+
+    def chapter_labels(self, text, chapters, section_starts):
+        """Label per chapter heading; "section" extent runs up to the next section start."""
+        labels = []
+        for start, end in chapters:
+            if self.spec.get("chapter_extent") == "section":
+                nxt = self._first_after(section_starts, start)
+                end = nxt if nxt is not None else len(text)
+            labels.append(collapse(text[start:end]))
+        return labels
+
+    def parse_arrangement(self, text, by_number, chapters, labels, body_start):
+        """
+        Titles and chapters from the TOC (everything before the body):
+        "CHAPTER I PRELIMINARY 1. Short title, extent and commencement. 2. Definitions. ..."
+        Walks 1, 2, 3 ... and stops at the first number that is not listed.
+        """
+        chapter_starts = [s for s, _ in chapters]
+        entries = {}
+        chapter = self.spec.get("default_chapter", "")
+        number = self.spec.get("first_number", 1)
+        last = 0
+
+        while True:
+            pos = self._first_after(self._positions(by_number, number), last)
+            if pos is None or pos >= body_start:
+                return entries
+
+            # A chapter heading between the previous entry and this one starts a new chapter
+            i = bisect.bisect_left(chapter_starts, last)
+            if i < len(chapter_starts) and chapter_starts[i] < pos - 1:
+                chapter = labels[i]
+
+            # Title runs up to the next entry or the next chapter heading
+            title_start = pos + len(str(number)) + 2
+            candidates = [body_start]
+            nxt = self._first_after(self._positions(by_number, number + 1), title_start)
+            if nxt is not None:
+                candidates.append(nxt - 1)
+            i = bisect.bisect_left(chapter_starts, title_start)
+            if i < len(chapter_starts):
+                candidates.append(chapter_starts[i])
+            title = text[title_start:min(candidates)].strip()
+            # Clean title: trailing dots and page numbers
+            title = TITLE_TRAILING_DOTS.sub("", title).strip()
+            title = TITLE_PAGE_NUMBER.sub("", title).strip()
+
+            entries[number] = {"chapter": chapter, "title": title}
+            last = pos
+            number += 1
+
+    # ---------------- main entry ----------------
+
+    def parse(self, text):
+        """Returns [{"number", "title", "chapter", "text"}] in document order."""
+        spec = self.spec
+        text = self.normalize(text)
+        body_start = self.find_body_start(text)
+        sections, by_number, chapters = self.tokenize(text)
+
+        if spec["sequence"] == "sequential":
+            spans = self.select_sequential(by_number, body_start, len(text))
+        else:
+            spans = self.select_all(text, sections, body_start)
+
+        section_starts = [s["start"] for s in spans if not s.get("missing")]
+        labels = self.chapter_labels(text, chapters, section_starts)
+        body_chapters = [(c, label) for c, label in zip(chapters, labels) if c[0] >= body_start]
+        if spec.get("strict") and spec.get("chapter") and not body_chapters:
+            raise RuntimeError(f"No chapters detected in the body of {spec['name']}")
+        body_chapter_starts = [c[0] for c, _ in body_chapters]
+
+        arrangement = {}
+        if spec.get("titles") == "arrangement":
+            arrangement = self.parse_arrangement(text, by_number, chapters, labels, body_start)
+
+        results = []
+        for span in spans:
+            number = self.number_type(span["number"])
+            if span.get("missing"):
+                entry = arrangement.get(number, {})
+                results.append({"number": number, "title": entry.get("title", ""),
+                                "chapter": entry.get("chapter", ""), "text": MISSING_BODY})
+                continue
+
+            start, end = span["start"], span["end"]
+            header = span.get("header")
+            if header is None and self.header_re is not None:
+                header = self.header_re.match(text, start)
+
+            if spec.get("text_from") == "header_end" and header:
+                text_start = header.end()
+            else:
+                text_start = start
+
+            if spec.get("chapter_ends_section"):
+                i = bisect.bisect_left(body_chapter_starts, text_start)
+                if i < len(body_chapter_starts) and body_chapter_starts[i] < end:
+                    end = body_chapter_starts[i]
+
+            if spec.get("titles") == "arrangement":
+                entry = arrangement.get(number, {})
+                title, chapter = entry.get("title", ""), entry.get("chapter", "")
+            else:
+                title = header.group("title").strip() if header else ""
+                i = bisect.bisect_right(body_chapter_starts, start) - 1
+                chapter = body_chapters[i][1] if i >= 0 else spec.get("default_chapter", "")
+
+            results.append({"number": number, "title": title, "chapter": chapter,
+                            "text": text[text_start:end].strip()})
+        return results
+
+    def to_records(self, sections):
+        fields = self.spec["fields"]
+        constants = self.spec.get("constants", {})
+        return [{**constants, **{key: s[attr] for key, attr in fields.items()}} for s in sections]
+
+
+# --------------------------------------------------
+# VALIDATION
+# --------------------------------------------------
+
+def validate(sections, spec):
+    """Section count sanity check plus duplicate / gap / missing-body report. Raises on a suspicious count."""
+    numbers = [s["number"] for s in sections]
+    seen, duplicates = set(), []
+    for n in numbers:
+        if n in seen:
+            duplicates.append(n)
+        seen.add(n)
+
+    report = {
+        "count": len(sections),
+        "duplicates": duplicates,
+        "missing_bodies": [s["number"] for s in sections if s["text"] == MISSING_BODY],
+        "empty_titles": sum(1 for s in sections if not s["title"]),
+        "gaps": [],
+    }
+    ints = [n for n in numbers if isinstance(n, int)]
+    if ints:
+        report["gaps"] = sorted(set(range(min(ints), max(ints) + 1)) - set(ints))
+
+    expected = spec.get("expected_sections")
+    if expected and not (expected[0] <= len(sections) <= expected[1]):
+        raise RuntimeError(
+            f"Suspicious section count for {spec['name']}: {len(sections)} (expected {expected[0]}-{expected[1]})"
+        )
+    return report
+
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def load_text(spec, input_path=None):
+    if input_path is None and spec.get("pdf"):
+        from backend.app.pdf_extract import extract_pages
+        pages = extract_pages(spec["pdf"], engine=spec.get("pdf_engine", "pdfplumber"))
+        return "".join(page + "\n" for page in pages)
+    return Path(input_path or spec["input"]).read_text(encoding="utf-8", errors="ignore")
+
+
+def parse_act(act, text):
+    spec = ACT_SPECS[act]
+    parser = StatuteParser(spec)
+    sections = parser.parse(text)
+    return sections, parser.to_records(sections)
+
+
+def run(act, input_path=None, output_path=None):
+    spec = ACT_SPECS[act]
+    source = input_path or spec.get("input") or spec.get("pdf")
+    if not Path(source).exists():
+        raise FileNotFoundError(f"{source} not found")
+
+    sections, records = parse_act(act, load_text(spec, input_path))
+    report = validate(sections, spec)
+
+    output_path = Path(output_path or spec["output"])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"Parsed {report['count']} sections of {spec['name']}")
+    if report["duplicates"] or report["gaps"] or report["missing_bodies"]:
+        print(f"  duplicates={report['duplicates']} gaps={report['gaps']} missing={report['missing_bodies']}")
+    print(f"Saved to {output_path}")
+    return records
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parse statute text into structured JSON")
+    ap.add_argument("acts", nargs="*", metavar="ACT", help="acts to parse (default: all)")
+    ap.add_argument("--input", help="override the input file (single act only)")
+    ap.add_argument("--output", help="override the output file (single act only)")
+    args = ap.parse_args()
+
+    unknown = set(args.acts) - set(ACT_SPECS)
+    if unknown:
+        ap.error(f"unknown act(s) {sorted(unknown)}; expected {sorted(ACT_SPECS)}")
+
+    acts = args.acts or sorted(ACT_SPECS)
+    if (args.input or args.output) and len(acts) != 1:
+        ap.error("--input/--output need exactly one act")
+
+    for act in acts:
+        run(act, args.input, args.output)
+
+
+if __name__ == "__main__":
+    sys.path.append(str(BASE_DIR.parent))
+    main()
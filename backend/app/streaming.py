@@ -0,0 +1,112 @@
+import asyncio
+import json
+import time
+
+# SSE framing config
+SSE_FLUSH_CHARS = 64          # Flush buffered LLM deltas once this many chars are pending
+SSE_FLUSH_INTERVAL = 0.05     # ...or once the oldest pending delta is this old (seconds)
+SSE_HEARTBEAT_INTERVAL = 15.0 # Idle time before a keep-alive comment is sent through proxies
+SSE_DISCONNECT_POLL = 0.5     # How often the client connection is checked while idle
+
+# SSE comment line: ignored by EventSource and by the frontend's "data: " parser
+SSE_HEARTBEAT = ": ping\n\n"
+
+
+def sse_event(payload):
+    """Formats a JSON payload as a single SSE data frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+class DeltaCoalescer:
+    """
+    Buffers LLM token deltas and releases them as larger text frames.
+    A frame is released when the buffer reaches `max_chars` or when the
+    first buffered delta has waited `max_delay` seconds.
+    """
+
+    def __init__(self, max_chars=SSE_FLUSH_CHARS, max_delay=SSE_FLUSH_INTERVAL):
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self._parts = []
+        self._size = 0
+        self._started = None
+
+    def push(self, text):
+        """Adds a delta. Returns the coalesced text if a frame is due, else None."""
+        if not text:
+            return None
+        if not self._parts:
+            self._started = time.monotonic()
+        self._parts.append(text)
+        self._size += len(text)
+
+        if self._size >= self.max_chars or time.monotonic() - self._started >= self.max_delay:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """Returns and clears whatever is buffered (None if empty)."""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._started = None
+        return text
+
+
+async def guard_stream(
+    source,
+    request=None,
+    heartbeat_interval=SSE_HEARTBEAT_INTERVAL,
+    poll_interval=SSE_DISCONNECT_POLL,
+):
+    """
+    Relays SSE frames from the async generator `source` to the client.
+    - Sends a heartbeat comment whenever the stream has been idle for `heartbeat_interval`.
+    - Polls the Starlette `request` for a client disconnect while waiting on `source`,
+      and on disconnect cancels the pending step so the upstream completion is torn down
+      immediately instead of running to max_tokens.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+    pending = None
+    last_sent = loop.time()
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            done, _ = await asyncio.wait({pending}, timeout=poll_interval)
+
+            if pending in done:
+                try:
+                    frame = pending.result()
+                except StopAsyncIteration:
+                    pending = None
+                    break
+                pending = None
+                yield frame
+                last_sent = loop.time()
+                continue
+
+            if request is not None and await request.is_disconnected():
+                break
+
+            if loop.time() - last_sent >= heartbeat_interval:
+                yield SSE_HEARTBEAT
+                last_sent = loop.time()
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception:
+                pass
@@ -0,0 +1,234 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+
+from backend.app import profiler
+
+# Requests slower than this (end to end) are logged to "LEGALI.slow" with their full span breakdown
+SLOW_REQUEST_MS = float(os.getenv("LEGALI_SLOW_REQUEST_MS", "5000"))
+# Histogram buckets in seconds: sub-millisecond classifier/fusion up to 30 s LLM calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Trace of the request being served; copied into asyncio.to_thread workers with the rest of the context
+_current_trace = contextvars.ContextVar("legali_trace", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1.0):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            series = self.series.setdefault(label_values, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for label_values, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets + ("+Inf",), series):
+                    le = (("le", bound if bound == "+Inf" else f"{bound:g}"),)
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, le)} {count}")
+                labels = _labels(self.label_names, label_values)
+                lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{labels} {series[len(self.buckets)]}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("legali_stage_seconds", "Latency of one pipeline stage.", ["stage"])
+REQUEST_SECONDS = Histogram("legali_request_seconds", "End-to-end latency of a traced request.", ["endpoint"])
+REQUESTS = Counter("legali_requests_total", "Traced requests by outcome.", ["endpoint", "status"])
+SLOW_REQUESTS = Counter("legali_slow_requests_total", "Requests over LEGALI_SLOW_REQUEST_MS.", ["endpoint"])
+METRICS = [STAGE_SECONDS, REQUEST_SECONDS, REQUESTS, SLOW_REQUESTS]
+
+
+def render_metrics():
+    """Every metric in the Prometheus text exposition format (for GET /metrics)."""
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+class Trace:
+    """Spans of one request, in the order they finished; offsets are relative to the request start."""
+
+    def __init__(self, trace_id, endpoint):
+        self.trace_id = trace_id
+        self.endpoint = endpoint
+        self.status = "ok"
+        self.started = time.perf_counter()
+        self.spans = []
+        self.profile = None  # profiler.Profile when this request is being sampled
+        self.lock = threading.Lock()
+
+    def add(self, stage, started, seconds, attrs):
+        with self.lock:
+            self.spans.append({
+                "stage": stage,
+                "start_ms": round((started - self.started) * 1000, 3),
+                "ms": round(seconds * 1000, 3),
+                **attrs,
+            })
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def breakdown(self):
+        """Total milliseconds per stage (a stage may run several times, e.g. BM25 per query)."""
+        totals = {}
+        for s in self.spans:
+            totals[s["stage"]] = round(totals.get(s["stage"], 0.0) + s["ms"], 3)
+        return totals
+
+
+class span:
+    """
+    Times one pipeline stage into `legali_stage_seconds` and the current trace (if any).
+    Use as `with span("rerank"):` or, around code that is awkward to indent, `s = span("x")` ... `s.end()`.
+    """
+
+    def __init__(self, stage, **attrs):
+        self.stage = stage
+        self.attrs = attrs
+        self.trace = _current_trace.get()
+        self.started = time.perf_counter()
+        self.seconds = None
+        if self.trace is not None and self.trace.profile is not None:
+            self.trace.profile.attach()  # stage may run in a worker thread (asyncio.to_thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.end()
+        return False
+
+    def end(self, **attrs):
+        """Records the span once; later calls are ignored."""
+        if self.seconds is not None:
+            return self.seconds
+        self.seconds = time.perf_counter() - self.started
+        self.attrs.update(attrs)
+        STAGE_SECONDS.observe(self.seconds, self.stage)
+        if self.trace is not None:
+            self.trace.add(self.stage, self.started, self.seconds, self.attrs)
+        return self.seconds
+
+
+class start_trace:
+    """
+    Makes a Trace current for the duration of a request (sync `with` or inside an async generator).
+    On exit the request is counted, timed and logged (with every span when over SLOW_REQUEST_MS).
+    With LEGALI_PROFILE=1, selected requests are also stack-sampled into backend/logs/profiles/.
+    """
+
+    def __init__(self, trace_id, endpoint):
+        self.trace = Trace(trace_id, endpoint)
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = _current_trace.get()
+        _current_trace.set(self.trace)
+        if profiler.PROFILE_ENABLED:
+            self.trace.profile = profiler.start_profile(self.trace.trace_id, self.trace.endpoint)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        # set() rather than reset(token): a streaming generator may be closed from another context
+        _current_trace.set(self.previous)
+        trace = self.trace
+        if exc_type in (GeneratorExit, asyncio.CancelledError):
+            trace.status = "disconnected"
+        elif exc_type is not None:
+            trace.status = "error"
+        total_ms = trace.elapsed_ms()
+        REQUEST_SECONDS.observe(total_ms / 1000, trace.endpoint)
+        REQUESTS.inc(trace.endpoint, trace.status)
+        slow = total_ms >= SLOW_REQUEST_MS
+        if slow:
+            SLOW_REQUESTS.inc(trace.endpoint)
+        log_request(trace, total_ms, slow)
+        if trace.profile is not None:
+            write_profile(trace)
+        return False
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def set_status(status):
+    """Outcome label of the current request ("blocked", "refused", ...) for legali_requests_total."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.status = status
+
+
+def log_request(trace, total_ms, slow):
+    """Request summary with per-stage timings; slow requests also go to "LEGALI.slow" with every span."""
+    fields = {
+        "endpoint": trace.endpoint,
+        "status": trace.status,
+        "total_ms": round(total_ms, 3),
+        "stages": trace.breakdown(),
+    }
+    logging.getLogger("LEGALI").info("Request Complete", extra={"trace_id": trace.trace_id, "fields": fields})
+    if slow:
+        logging.getLogger("LEGALI.slow").warning(
+            "Slow Request", extra={"trace_id": trace.trace_id, "fields": dict(fields, spans=list(trace.spans))}
+        )
+
+
+def write_profile(trace):
+    profile = trace.profile.stop()
+    path = profile.write()
+    logging.getLogger("LEGALI").info(
+        "Profile Saved", extra={"trace_id": trace.trace_id, "fields": {"path": str(path), "samples": profile.samples}}
+    )
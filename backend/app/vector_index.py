@@ -0,0 +1,414 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.embedding_store import load_embeddings, save_embeddings, store_paths
+
+logger = logging.getLogger("LEGALI")
+
+# Backend selection:
+#   LEGALI_VECTOR_BACKEND  "chroma" | "numpy" | "int8" | "auto" (numpy up to LEGALI_NUMPY_MAX_ROWS rows, else chroma)
+#   LEGALI_VECTOR_INDEX    optional stem of a saved NumpyIndex; memory-mapped instead of exporting from Chroma
+#                          (int8: where the quantized index is built on first use, default INT8_INDEX_STEM)
+VECTOR_BACKEND_ENV = "LEGALI_VECTOR_BACKEND"
+NUMPY_MAX_ROWS_ENV = "LEGALI_NUMPY_MAX_ROWS"
+VECTOR_INDEX_ENV = "LEGALI_VECTOR_INDEX"
+BACKENDS = ("chroma", "numpy", "int8", "auto")
+DEFAULT_BACKEND = "auto"
+# Exact search over (rows x 768) float32 stays in the low milliseconds well past the current corpus
+DEFAULT_NUMPY_MAX_ROWS = 100_000
+EXPORT_BATCH_SIZE = 1000
+
+# Int8 index: approximate top (k * RESCORE_FACTOR, at least MIN_RESCORE) from the codes,
+# then exact fp32 rescoring of those rows from the memory-mapped full-precision matrix
+INT8_INDEX_STEM = Path(__file__).resolve().parents[1] / "data" / "cache" / "index" / "legali_corpus_int8"
+RESCORE_FACTOR = 4
+MIN_RESCORE = 50
+# Rows widened to float32 per block while scanning the codes; a small reused buffer stays
+# cache-resident (~3x faster than widening the whole code matrix per query)
+SCAN_BLOCK_ROWS = 1024
+
+# Per-chunk content hash written by app/ingest_sync.py; part of a saved index's fingerprint
+CONTENT_HASH_KEY = "content_hash"
+
+
+class VectorIndex:
+    """
+    Dense retrieval backend.
+    `query` takes a list of query vectors and returns, per query, up to k hits
+    {"id", "text", "metadata", "distance"} ordered by increasing cosine distance.
+    """
+
+    name = "base"
+
+    def query(self, query_vecs, k, act=None):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class ChromaIndex(VectorIndex):
+    """The persistent Chroma collection (HNSW + SQLite metadata)."""
+
+    name = "chroma"
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __len__(self):
+        return self.collection.count()
+
+    def query(self, query_vecs, k, act=None):
+        results = self.collection.query(
+            query_embeddings=query_vecs, n_results=k,
+            where={"act": act} if act else None,
+            include=["documents", "metadatas", "distances"]
+        )
+        all_hits = []
+        for q_idx in range(len(query_vecs)):
+            hits = []
+            ids = results['ids'][q_idx] if results.get('ids') else []
+            for i, cid in enumerate(ids):
+                meta = dict(results['metadatas'][q_idx][i] or {})
+                meta['id'] = cid
+                hits.append({
+                    "id": cid,
+                    "text": results['documents'][q_idx][i],
+                    "metadata": meta,
+                    "distance": results['distances'][q_idx][i]
+                })
+            all_hits.append(hits)
+        return all_hits
+
+
+class NumpyIndex(VectorIndex):
+    """
+    Exact cosine search: one matrix multiply plus argpartition per batch of queries.
+    `matrix` may be a float16/float32 array or a read-only memmap; rows are normalized at build
+    time when they are not already. Metadata filtering by act uses precomputed row lists.
+    """
+
+    name = "numpy"
+
+    def __init__(self, ids, matrix, documents, metadatas, normalized=True):
+        if not (len(ids) == len(documents) == len(metadatas) == matrix.shape[0]):
+            raise ValueError("ids, documents, metadatas and matrix rows must line up")
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [dict(m or {}) for m in metadatas]
+        self.matrix = matrix
+        # Fingerprint of the collection the index was exported from and the embedding model
+        # (set on load of a saved index)
+        self.fingerprint = None
+        self.model = "unknown"
+        # Inverse row norms; None when rows are unit length already
+        self._inv_norms = None
+        if not normalized and len(self.ids):
+            norms = np.linalg.norm(np.asarray(matrix, dtype=np.float32), axis=1)
+            self._inv_norms = 1.0 / np.maximum(norms, 1e-12)
+
+        self._act_rows = {}
+        for row, meta in enumerate(self.metadatas):
+            self._act_rows.setdefault(meta.get("act"), []).append(row)
+        self._act_rows = {act: np.asarray(rows, dtype=np.int64) for act, rows in self._act_rows.items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, query_vecs, rows=None):
+        """Cosine similarity of every query against every (selected) row: (n_queries, n_rows) float32."""
+        q = np.atleast_2d(np.asarray(query_vecs, dtype=np.float32))
+        q = q / np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        sims = q @ np.asarray(matrix, dtype=np.float32).T
+        if self._inv_norms is not None:
+            sims *= self._inv_norms if rows is None else self._inv_norms[rows]
+        return sims
+
+    def unit_rows(self, rows=None):
+        """The (selected) rows as float32 scaled to unit length (not a copy when already unit length)."""
+        matrix = np.asarray(self.matrix if rows is None else self.matrix[rows], dtype=np.float32)
+        if self._inv_norms is not None:
+            matrix = matrix * (self._inv_norms if rows is None else self._inv_norms[rows])[:, None]
+        return matrix
+
+    def top_k(self, sims, k):
+        """Per row of `sims`: column indices of the k largest values, best first."""
+        k = min(k, sims.shape[1])
+        if k <= 0:
+            return np.empty((sims.shape[0], 0), dtype=np.int64)
+        if k < sims.shape[1]:
+            part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            part = np.tile(np.arange(sims.shape[1]), (sims.shape[0], 1))
+        order = np.argsort(-np.take_along_axis(sims, part, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1)
+
+    def query(self, query_vecs, k, act=None):
+        rows = None
+        if act:
+            rows = self._act_rows.get(act)
+            if rows is None:
+                return [[] for _ in query_vecs]
+        return self.query_rows(query_vecs, k, rows)
+
+    def query_rows(self, query_vecs, k, rows=None):
+        """Exact top-k restricted to `rows` (all rows when None), e.g. the chunks of a few sections."""
+        sims = self.scores(query_vecs, rows)
+        all_hits = []
+        for q_idx, cols in enumerate(self.top_k(sims, k)):
+            hits = []
+            for col in cols:
+                row = int(col if rows is None else rows[col])
+                meta = dict(self.metadatas[row])
+                meta['id'] = self.ids[row]
+                hits.append({
+                    "id": self.ids[row],
+                    "text": self.documents[row],
+                    "metadata": meta,
+                    # Same convention as Chroma's "cosine" space
+                    "distance": float(1.0 - sims[q_idx, col])
+                })
+            all_hits.append(hits)
+        return all_hits
+
+    # ---------------- building / persistence ----------------
+
+    @classmethod
+    def from_collection(cls, collection, batch_size=EXPORT_BATCH_SIZE):
+        """Exports ids, embeddings, documents and metadata from a Chroma collection (paged)."""
+        ids, vectors, documents, metadatas = [], [], [], []
+        offset = 0
+        while True:
+            batch = collection.get(
+                include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset
+            )
+            if not batch['ids']:
+                break
+            ids.extend(batch['ids'])
+            vectors.extend(batch['embeddings'])
+            documents.extend(batch['documents'])
+            metadatas.extend(batch['metadatas'])
+            offset += len(batch['ids'])
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(matrix, axis=1) if len(ids) else np.ones(0)
+        normalized = bool(np.allclose(norms, 1.0, atol=1e-3))
+        return cls(ids, matrix, documents, metadatas, normalized=normalized)
+
+    def save(self, stem, model="unknown", dtype="float32"):
+        """
+        Writes the matrix as an embedding store plus `<stem>.docs.json` with documents and metadata.
+        The header carries the fingerprint of the rows, checked against the collection on reuse.
+        """
+        paths = save_embeddings(
+            stem, self.ids, self.unit_rows(), model=model, normalized=True, dtype=dtype,
+            extra={"fingerprint": fingerprint(self.ids, self.metadatas, self.documents)}
+        )
+        with open(docs_path(stem), "w", encoding="utf-8") as f:
+            json.dump({"documents": self.documents, "metadatas": self.metadatas}, f, ensure_ascii=False)
+        return paths
+
+    @classmethod
+    def load(cls, stem, mmap=True):
+        store = load_embeddings(stem, mmap=mmap)
+        with open(docs_path(stem), "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        index = cls(store.ids, store.matrix, docs["documents"], docs["metadatas"], normalized=store.normalized)
+        index.fingerprint = store.header.get("fingerprint")
+        index.model = store.model
+        return index
+
+
+class Int8Index(NumpyIndex):
+    """
+    Scalar-quantized index: one int8 code per dimension (per-dimension min/max range)
+    held in memory, 4x smaller than float32. Candidates come from the codes; the final
+    ranking is exact, rescored from the full-precision matrix (a memmap, so only the
+    candidate rows are read).
+    """
+
+    name = "int8"
+
+    def __init__(self, ids, matrix, documents, metadatas, codes, scale, offset, normalized=True):
+        super().__init__(ids, matrix, documents, metadatas, normalized=normalized)
+        if codes.shape != matrix.shape:
+            raise ValueError(f"codes {codes.shape} do not match matrix {matrix.shape}")
+        self.codes = codes
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.offset = np.asarray(offset, dtype=np.float32)
+
+    @staticmethod
+    def quantize(matrix):
+        """x ~= (code + 128) * scale + offset, per dimension."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        lo, hi = matrix.min(axis=0), matrix.max(axis=0)
+        scale = np.maximum(hi - lo, 1e-12) / 255.0
+        codes = np.rint((matrix - lo) / scale) - 128
+        return np.clip(codes, -128, 127).astype(np.int8), scale.astype(np.float32), lo.astype(np.float32)
+
+    @property
+    def nbytes(self):
+        """Resident size of the approximate stage (codes + quantization params)."""
+        return self.codes.nbytes + self.scale.nbytes + self.offset.nbytes
+
+    def approximate_scores(self, query_vecs, rows=None):
+        """
+        Ranking-equivalent approximation of q . x: (q * scale) . code.
+        The (code + 128) shift and the offset only add a per-query constant, so they are dropped.
+        """
+        q = np.atleast_2d(np.asarray(query_vecs, dtype=np.float32))
+        q_scaled = (q * self.scale).T
+        n = self.codes.shape[0] if rows is None else len(rows)
+        sims = np.empty((n, q.shape[0]), dtype=np.float32)
+        buf = np.empty((min(n, SCAN_BLOCK_ROWS), self.codes.shape[1]), dtype=np.float32)
+        for start in range(0, n, SCAN_BLOCK_ROWS):
+            block = slice(start, start + SCAN_BLOCK_ROWS)
+            codes = self.codes[block] if rows is None else self.codes[rows[block]]
+            widened = buf[:len(codes)]
+            np.copyto(widened, codes, casting="unsafe")
+            np.matmul(widened, q_scaled, out=sims[block])
+        return sims.T
+
+    def query(self, query_vecs, k, act=None):
+        rows = None
+        if act:
+            rows = self._act_rows.get(act)
+            if rows is None:
+                return [[] for _ in query_vecs]
+
+        approx = self.approximate_scores(query_vecs, rows)
+        candidates = self.top_k(approx, max(k * RESCORE_FACTOR, MIN_RESCORE))
+
+        all_hits = []
+        for q_idx, cols in enumerate(candidates):
+            cand_rows = cols if rows is None else rows[cols]
+            # Ascending row order keeps the memmap reads sequential
+            cand_rows = np.sort(cand_rows)
+            exact = self.scores([query_vecs[q_idx]], cand_rows)
+            hits = []
+            for col in self.top_k(exact, k)[0]:
+                row = int(cand_rows[col])
+                meta = dict(self.metadatas[row])
+                meta['id'] = self.ids[row]
+                hits.append({
+                    "id": self.ids[row],
+                    "text": self.documents[row],
+                    "metadata": meta,
+                    "distance": float(1.0 - exact[0, col])
+                })
+            all_hits.append(hits)
+        return all_hits
+
+    def save(self, stem, model="unknown", dtype="float32"):
+        paths = super().save(stem, model=model, dtype=dtype)
+        np.save(codes_path(stem), self.codes)
+        np.savez(quant_path(stem), scale=self.scale, offset=self.offset)
+        return paths
+
+    @classmethod
+    def from_index(cls, index):
+        """Quantizes an exact index (rows normalized first, as the rescoring matrix is)."""
+        matrix = index.unit_rows()
+        codes, scale, offset = cls.quantize(matrix)
+        return cls(index.ids, matrix, index.documents, index.metadatas, codes, scale, offset)
+
+    @classmethod
+    def load(cls, stem, mmap=True):
+        base = NumpyIndex.load(stem, mmap=mmap)
+        codes = np.load(codes_path(stem))
+        with np.load(quant_path(stem)) as quant:
+            scale, offset = quant["scale"], quant["offset"]
+        index = cls(base.ids, base.matrix, base.documents, base.metadatas, codes, scale, offset,
+                    normalized=base._inv_norms is None)
+        index.fingerprint, index.model = base.fingerprint, base.model
+        return index
+
+
+def codes_path(stem):
+    return store_paths(stem)["matrix"].with_suffix(".int8.npy")
+
+
+def quant_path(stem):
+    return store_paths(stem)["matrix"].with_suffix(".quant.npz")
+
+
+def docs_path(stem):
+    return store_paths(stem)["matrix"].with_suffix(".docs.json")
+
+
+def fingerprint(ids, metadatas, documents):
+    """
+    Hash of the sorted chunk ids and their content hashes. Changes when a chunk is added,
+    removed or re-ingested with new text/vectors, even if the row count stays the same.
+    Rows stored without a content hash (the auto_ingest pipeline) fall back to a hash of their text.
+    """
+    pairs = sorted(
+        (cid, (meta or {}).get(CONTENT_HASH_KEY) or hashlib.sha256((doc or "").encode("utf-8")).hexdigest())
+        for cid, meta, doc in zip(ids, metadatas, documents)
+    )
+    return hashlib.sha256(json.dumps(pairs).encode("utf-8")).hexdigest()
+
+
+def collection_fingerprint(collection, batch_size=EXPORT_BATCH_SIZE):
+    """`fingerprint` of a Chroma collection (ids, metadata and text, paged; no embeddings)."""
+    ids, metadatas, documents = [], [], []
+    offset = 0
+    while True:
+        batch = collection.get(include=["metadatas", "documents"], limit=batch_size, offset=offset)
+        if not batch['ids']:
+            break
+        ids.extend(batch['ids'])
+        metadatas.extend(batch['metadatas'])
+        documents.extend(batch['documents'])
+        offset += len(batch['ids'])
+    return fingerprint(ids, metadatas, documents)
+
+
+def build_vector_index(collection, backend=None):
+    """Picks the dense backend from the environment (see VECTOR_BACKEND_ENV)."""
+    backend = (backend or os.getenv(VECTOR_BACKEND_ENV, DEFAULT_BACKEND)).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"{VECTOR_BACKEND_ENV}={backend!r}; expected one of {BACKENDS}")
+
+    if backend == "auto":
+        max_rows = int(os.getenv(NUMPY_MAX_ROWS_ENV, DEFAULT_NUMPY_MAX_ROWS))
+        backend = "numpy" if collection.count() <= max_rows else "chroma"
+
+    if backend == "chroma":
+        return ChromaIndex(collection)
+
+    if backend == "int8":
+        return load_int8_index(collection, os.getenv(VECTOR_INDEX_ENV) or INT8_INDEX_STEM)
+
+    saved = os.getenv(VECTOR_INDEX_ENV)
+    if saved and store_paths(saved)["meta"].exists() and Path(docs_path(saved)).exists():
+        index = NumpyIndex.load(saved, mmap=True)
+        if index.fingerprint == collection_fingerprint(collection):
+            return index
+        logger.warning(f"{saved} does not match the collection ({len(index)} vs {collection.count()} rows"
+                       f" or changed chunks). Re-exporting.")
+        # Written back so later startups memory-map the fresh export instead of exporting again
+        fresh = NumpyIndex.from_collection(collection)
+        fresh.save(saved, model=index.model)
+        return fresh
+    return NumpyIndex.from_collection(collection)
+
+
+def load_int8_index(collection, stem):
+    """Memory-maps the int8 index at `stem`, (re)building it from the collection when missing or stale."""
+    stem = Path(stem)
+    if codes_path(stem).exists() and quant_path(stem).exists() and docs_path(stem).exists():
+        index = Int8Index.load(stem, mmap=True)
+        if index.fingerprint == collection_fingerprint(collection):
+            return index
+        logger.warning(f"{stem} does not match the collection ({len(index)} vs {collection.count()} rows"
+                       f" or changed chunks). Rebuilding.")
+
+    Int8Index.from_index(NumpyIndex.from_collection(collection)).save(stem)
+    return Int8Index.load(stem, mmap=True)
@@ -0,0 +1,182 @@
+import json
+import re
+from pathlib import Path
+
+INPUT_FILE = Path("backend/data/final/legali_corpus.json")
+OUTPUT_FILE = Path("backend/data/final/legali_xref.json")
+XREF_VERSION = 1
+
+# Full names as they appear in the statute text -> corpus act codes
+ACT_NAMES = {
+    "Bharatiya Nyaya Sanhita": "BNS",
+    "Bharatiya Nagarik Suraksha Sanhita": "BNSS",
+    "Bharatiya Sakshya Adhiniyam": "BSA",
+    "Bharatiya Sakshya Adiniyam": "BSA",  # misspelt in the BNSS text
+}
+
+SECTION_NUMBER = r"\d+[A-Z]?"
+# "section 74", "sections 25, 26 and 27", "section 64 or section 65", "sections 63 to 70"
+SECTION_REF = re.compile(
+    rf"\b[Ss]ections?\s+(?P<nums>{SECTION_NUMBER}(?:\s*(?:,|and|or|to)\s*{SECTION_NUMBER}\b)*)"
+)
+LIST_ITEM = re.compile(rf"(?P<sep>,|and|or|to)?\s*(?P<num>{SECTION_NUMBER})")
+# What follows a reference: "... of this Sanhita" / "... of the Bharatiya Sakshya Adhiniyam, 2023" /
+# "... of the Code of Criminal Procedure, 1973". Any capitalised name is another statute unless listed in ACT_NAMES.
+QUALIFIER = re.compile(
+    r"\s*,?\s*of\s+(?:the\s+)?(?P<name>this\s+(?:Sanhita|Adhiniyam|Act|Code)"
+    r"|[A-Z][^,;:.\n]{0,80})"
+)
+# Text allowed between two references that share one qualifier ("section 64 or section 65 of ...")
+CHAIN_GAP = re.compile(r"\s*(?:,|and|or)?\s*(?:sub-sections?\s*(?:\(\w+\)\s*(?:,|and|or|to)?\s*)+of\s+)?$")
+# "sections 63 to 70" is expanded; wider spans are more likely a mis-parse than a real range
+MAX_RANGE = 50
+
+
+def key(act, number):
+    return f"{act}:{number}"
+
+
+def split_key(value):
+    act, _, number = value.rpartition(":")
+    return act, number
+
+
+def qualifier_act(text, pos, act):
+    """Act code a reference ending at `pos` points into: `act` for internal, None for outside acts."""
+    m = QUALIFIER.match(text, pos)
+    if not m:
+        return act
+    name = " ".join(m.group("name").split())
+    if name.startswith("this "):
+        return act
+    for full_name, code in ACT_NAMES.items():
+        if name.startswith(full_name):
+            return code
+    return None
+
+
+def parse_numbers(nums):
+    """Section numbers in a matched list, with short numeric ranges expanded."""
+    numbers = []
+    for m in LIST_ITEM.finditer(nums):
+        num = m.group("num")
+        if m.group("sep") == "to" and numbers and numbers[-1].isdigit() and num.isdigit():
+            start, end = int(numbers[-1]), int(num)
+            if 0 < end - start <= MAX_RANGE:
+                numbers.extend(str(n) for n in range(start + 1, end + 1))
+                continue
+        numbers.append(num)
+    return numbers
+
+
+def extract_references(text, act):
+    """
+    (act, number) pairs referenced by `text`, in order of first mention.
+    References qualified by another act's name resolve to that act; other statutes are dropped.
+    """
+    matches = list(SECTION_REF.finditer(text))
+    targets = [None] * len(matches)
+    # Walk backwards so a qualifier after the last reference of a chain applies to the whole chain
+    following = None
+    for i in range(len(matches) - 1, -1, -1):
+        m = matches[i]
+        chained = i + 1 < len(matches) and CHAIN_GAP.match(text[m.end():matches[i + 1].start()])
+        targets[i] = following if chained else qualifier_act(text, m.end(), act)
+        following = targets[i]
+
+    refs, seen = [], set()
+    for m, target in zip(matches, targets):
+        if target is None:
+            continue
+        for number in parse_numbers(m.group("nums")):
+            ref = (target, number)
+            if ref not in seen:
+                seen.add(ref)
+                refs.append(ref)
+    return refs
+
+
+def build_xref(records):
+    """
+    Adjacency index over corpus sections: "references" (outgoing) and "referenced_by" (incoming),
+    keyed by "ACT:number". Only edges between sections present in `records` are kept.
+    """
+    sections = {(str(r.get("act", "")), str(r.get("number", ""))) for r in records}
+    references, referenced_by = {}, {}
+    for record in records:
+        source = (str(record.get("act", "")), str(record.get("number", "")))
+        for target in extract_references(record.get("text", ""), source[0]):
+            if target == source or target not in sections:
+                continue
+            out = references.setdefault(key(*source), [])
+            if key(*target) not in out:
+                out.append(key(*target))
+                referenced_by.setdefault(key(*target), []).append(key(*source))
+    return {
+        "version": XREF_VERSION,
+        "edges": sum(len(v) for v in references.values()),
+        "references": references,
+        "referenced_by": referenced_by,
+    }
+
+
+class XrefIndex:
+    """In-memory cross-reference graph: O(1) neighbour lookups by (act, number)."""
+
+    def __init__(self, references=None, referenced_by=None):
+        self.references = references or {}
+        self.referenced_by = referenced_by or {}
+
+    def __len__(self):
+        return sum(len(v) for v in self.references.values())
+
+    @classmethod
+    def load(cls, path=OUTPUT_FILE):
+        """Empty index when the file has not been built yet."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("references"), data.get("referenced_by"))
+
+    def neighbours(self, act, number):
+        k = key(act, number)
+        return {
+            "references": [split_key(v) for v in self.references.get(k, [])],
+            "referenced_by": [split_key(v) for v in self.referenced_by.get(k, [])],
+        }
+
+    def expand(self, sections, budget):
+        """
+        Up to `budget` sections adjacent to `sections` (in their rank order) that are not already in it:
+        each section's outgoing references first, then the sections citing it.
+        """
+        if budget <= 0:
+            return []
+        seen = {key(act, number) for act, number in sections}
+        added = []
+        for act, number in sections:
+            k = key(act, number)
+            for neighbour in self.references.get(k, []) + self.referenced_by.get(k, []):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    added.append(split_key(neighbour))
+                    if len(added) >= budget:
+                        return added
+        return added
+
+
+def build():
+    print(f"Loading {INPUT_FILE}...")
+    with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        records = json.load(f)
+
+    xref = build_xref(records)
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(xref, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {xref['edges']} cross-references between {len(records)} sections to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    build()
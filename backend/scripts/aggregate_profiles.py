@@ -0,0 +1,48 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.profiler import merge, read_collapsed, top_functions, write_collapsed
+
+PROFILES_DIR = ROOT_DIR / "backend" / "logs" / "profiles"
+
+# Capture profiles with LEGALI_PROFILE=1 (LEGALI_PROFILE_SAMPLE_RATE, or the X-Legali-Profile: 1 header), then:
+#   python backend/scripts/aggregate_profiles.py --endpoint stream --output stream.collapsed
+#   flamegraph.pl stream.collapsed > stream.svg   (or drop the .collapsed file into speedscope.app)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Merge per-request collapsed-stack profiles and list the hottest frames")
+    ap.add_argument("profiles", nargs="*", type=Path, help="profile files (default: every profile in --dir)")
+    ap.add_argument("--dir", type=Path, default=PROFILES_DIR)
+    ap.add_argument("--endpoint", help="only profiles of this endpoint (query, stream, search, ...)")
+    ap.add_argument("--top", type=int, default=25, help="frames listed by self time")
+    ap.add_argument("--output", type=Path, help="write the merged collapsed stacks here")
+    args = ap.parse_args()
+
+    pattern = f"{args.endpoint}-*.collapsed" if args.endpoint else "*.collapsed"
+    paths = args.profiles or sorted(args.dir.glob(pattern))
+    if not paths:
+        print(f"No profiles matching {pattern} in {args.dir}")
+        sys.exit(1)
+
+    stacks = merge(read_collapsed(path) for path in paths)
+    total = sum(stacks.values())
+    print(f"Merged {len(paths)} profiles: {total} samples, {len(stacks)} distinct stacks\n")
+
+    print(f"{'self %':>7} {'total %':>8}  frame")
+    for name, self_samples, total_samples in top_functions(stacks, args.top):
+        print(f"{self_samples / total * 100:6.1f}% {total_samples / total * 100:7.1f}%  {name}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        write_collapsed(args.output, stacks)
+        print(f"\nMerged profile saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 import os
-import json
 import uuid
-import pdfplumber
 import chromadb
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
@@ -13,7 +11,7 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(ROOT_DIR))
 
 try:
-    from backend.app.create_chunks import recursive_split, merge_chunks
+    from backend.app.ingest_pipeline import run_pipeline
 except ImportError as e:
     print(f"Failed to import chunking engine: {e}")
     sys.exit(1)
@@ -25,16 +23,6 @@ DB_DIR = Path("backend/data/chroma_db")
 COLLECTION_NAME = "legali_corpus"
 EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
 
-def extract_text_from_pdf(filepath):
-    print(f"Extracting text from: {filepath.name}...")
-    full_text = ""
-    with pdfplumber.open(filepath) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                full_text += text + "\n"
-    return full_text
-
 def main():
     # Ensure directories exist
     RAW_PDF_DIR.mkdir(parents=True, exist_ok=True)
@@ -58,7 +46,8 @@ def main():
 
     print(f"Found {len(pdfs_to_process)} PDFs to auto-ingest.")
 
-    # 2. Process Loop
+    # 2. Collect New PDFs
+    documents = []
     for pdf_filename in pdfs_to_process:
         pdf_path = RAW_PDF_DIR / pdf_filename
         
@@ -71,81 +60,18 @@ def main():
         if output_json_path.exists():
             print(f"Skipping {pdf_filename}: Already processed ({output_json_path.name} exists).")
             continue
-            
-        print(f"\n--- Processing {act_name_base} ---")
-        
-        # A. Extractive Scan
-        raw_text = extract_text_from_pdf(pdf_path)
-        
-        if not raw_text.strip():
-            print(f"Warning: Extracted text from {pdf_filename} was empty!")
-            continue
 
-        # B. Hierarchical Structure Parsing 
-        print("Applying Hierarchical Recursive Splitting...")
-        import re
-        sections = re.split(r'(?=\b(?:Section|Sec\.)\s+\d+\b)', raw_text, flags=re.IGNORECASE)
-        
-        structured_data = []
-        global_chunk_idx = 0
-        
-        for sec_text in sections:
-            if not sec_text.strip():
-                continue
-            match = re.search(r'\b(?:Section|Sec\.)\s+(\d+[A-Z]?)\b', sec_text, re.IGNORECASE)
-            sec_num = match.group(1) if match else "Unknown"
-            
-            atomic_chunks = recursive_split(sec_text)
-            merged_chunks = merge_chunks(atomic_chunks)
-            
-            for chunk_text in merged_chunks:
-                chunk_id = f"{act_name_base.upper()}-CHUNK-{global_chunk_idx+1}"
-                meta = {
-                    "id": chunk_id,
-                    "act": act_name_base,
-                    "number": sec_num,
-                    "title": f"Section {sec_num}",
-                    "chapter": "Unknown",
-                    "chunk_index": global_chunk_idx,
-                    "text": chunk_text
-                }
-                structured_data.append(meta)
-                global_chunk_idx += 1
-                
-        print(f"Generated {len(structured_data)} structural chunks.")
-            
-        # Write flat storage format for BM25 Engine
-        with open(output_json_path, 'w', encoding='utf-8') as f:
-            json.dump(structured_data, f, indent=4)
-        print(f"Saved structural dictionary to: {output_json_path.name}")
-        
-        # D. Embed and Upsert
-        print("Computing dense space tensors...")
-        # Text representation wrapper to mirror identical format in rag.py queries
-        texts_to_encode = [f"Represent this sentence for searching relevant passages: {item['text']}" for item in structured_data]
-        embeddings = embedder.encode(texts_to_encode, normalize_embeddings=True, show_progress_bar=True).tolist()
-        
-        ids = [item['id'] for item in structured_data]
-        documents = [item['text'] for item in structured_data]
-        metadatas = [{"act": item["act"], "chunk_index": item["chunk_index"], "number": str(item.get("number", "Unknown")), "title": str(item.get("title", "Unknown")), "chapter": str(item.get("chapter", "Unknown"))} for item in structured_data]
-        
-        batch_size = 100
-        total = len(ids)
-        print(f"Upserting {total} items into Vector Store...")
-        
-        for i in range(0, total, batch_size):
-            end = min(i + batch_size, total)
-            try:
-                collection.upsert(
-                    ids=ids[i:end],
-                    embeddings=embeddings[i:end],
-                    documents=documents[i:end],
-                    metadatas=metadatas[i:end]
-                )
-            except Exception as e:
-                print(f"Database batch upsert failed at indices {i}-{end}: {str(e)}")
-                
-        print(f"Successfully ingrained {act_name_base} into LEGALI Memory Engine.")
+        documents.append({"pdf_path": pdf_path, "act": act_name_base, "output_json_path": output_json_path})
+
+    if not documents:
+        print("Nothing new to ingest.")
+        return
+
+    # 3. Streaming Pipeline
+    # Page extraction -> section split -> recursive split/merge -> batched embedding -> upsert,
+    # all stages running concurrently behind bounded queues.
+    print(f"Streaming {len(documents)} new act(s) through the ingestion pipeline...")
+    run_pipeline(documents, embedder, collection)
 
     print(f"\nAuto-Ingestion complete! Total DB Size: [{collection.count()}] objects.")
 
@@ -0,0 +1,70 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.create_chunks import CHARS_PER_TOKEN, build_chunks
+
+CORPUS_FILE = ROOT_DIR / "backend" / "data" / "final" / "legali_corpus.json"
+BASELINE_FILE = ROOT_DIR / "backend" / "data" / "final" / "legali_chunks.json"
+
+# Histogram buckets in (heuristic) tokens
+BUCKETS = [0, 50, 100, 200, 400, 700]
+RUNS = 5
+
+def histogram(texts):
+    counts = [0] * len(BUCKETS)
+    for text in texts:
+        tokens = len(text) // CHARS_PER_TOKEN
+        for i in range(len(BUCKETS) - 1, -1, -1):
+            if tokens >= BUCKETS[i]:
+                counts[i] += 1
+                break
+    return counts
+
+def bucket_label(i):
+    if i == len(BUCKETS) - 1:
+        return f"{BUCKETS[i]}+"
+    return f"{BUCKETS[i]}-{BUCKETS[i + 1] - 1}"
+
+def bench():
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    timings = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        chunks = build_chunks(corpus)
+        timings.append(time.perf_counter() - t0)
+    best = min(timings)
+
+    # Compare chunk bodies only (new chunks carry an "ACT | SECTION" header line)
+    new_texts = [c["text"].split("\n", 1)[1] if "\n" in c["text"] else c["text"] for c in chunks]
+    ids = [c["id"] for c in chunks]
+
+    print(f"Sections: {len(corpus)}  |  best of {RUNS}: {best * 1000:.1f} ms")
+    print(f"Chunks:   {len(chunks)}  |  {len(chunks) / best:,.0f} chunks/s  |  {len(corpus) / best:,.0f} sections/s")
+    print(f"Unique ids: {len(set(ids)) == len(ids)}")
+
+    baseline_texts = None
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline_texts = [c["text"] for c in json.load(f)]
+
+    new_hist = histogram(new_texts)
+    print(f"\n{'tokens':>10} | {'current':>8}" + (f" | {'baseline':>8}" if baseline_texts else ""))
+    base_hist = histogram(baseline_texts) if baseline_texts else None
+    for i in range(len(BUCKETS)):
+        row = f"{bucket_label(i):>10} | {new_hist[i]:>8}"
+        if base_hist:
+            row += f" | {base_hist[i]:>8}"
+        print(row)
+    if baseline_texts:
+        print(f"{'total':>10} | {len(new_texts):>8} | {len(baseline_texts):>8}")
+
+if __name__ == "__main__":
+    bench()
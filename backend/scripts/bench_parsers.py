@@ -0,0 +1,57 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.statute_parser import ACT_SPECS, StatuteParser, load_text, validate
+
+RUNS = 5
+
+def bench_act(act, input_path=None):
+    spec = ACT_SPECS[act]
+    source = Path(input_path or spec.get("input") or spec.get("pdf"))
+    if not source.exists():
+        print(f"{act:<8} skipped ({source} not found)")
+        return None
+
+    text = load_text(spec, input_path)
+    parser = StatuteParser(spec)
+
+    timings = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        sections = parser.parse(text)
+        timings.append(time.perf_counter() - t0)
+    best = min(timings)
+
+    report = validate(sections, spec)
+    mb = len(text.encode("utf-8")) / 1e6
+    print(
+        f"{act:<8} {report['count']:>5} sections | best of {RUNS}: {best * 1000:7.1f} ms"
+        f" | {report['count'] / best:>9,.0f} sections/s | {mb / best:6.1f} MB/s"
+    )
+    if report["duplicates"] or report["gaps"] or report["missing_bodies"]:
+        print(f"{'':<8} duplicates={report['duplicates']} gaps={report['gaps']} missing={report['missing_bodies']}")
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the statute parser engine")
+    ap.add_argument("acts", nargs="*", metavar="ACT", help="acts to benchmark (default: all)")
+    ap.add_argument("--input", action="append", default=[], metavar="ACT=PATH",
+                    help="input override, e.g. --input bnss=head_bnss.txt")
+    args = ap.parse_args()
+
+    unknown = set(args.acts) - set(ACT_SPECS)
+    if unknown:
+        ap.error(f"unknown act(s) {sorted(unknown)}; expected {sorted(ACT_SPECS)}")
+
+    overrides = dict(item.split("=", 1) for item in args.input)
+    for act in args.acts or sorted(ACT_SPECS):
+        bench_act(act, overrides.get(act))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.retrieval_eval import compare, ranked_sections, summarize
+from backend.app.tracing import span, start_trace
+
+DATASET_FILE = ROOT_DIR / "backend" / "tests" / "retrieval_benchmark.json"
+REPORTS_DIR = ROOT_DIR / "backend" / "logs" / "retrieval_bench"
+
+
+def dense_only(rag, query, k):
+    from backend.app.rag import QUERY_INSTRUCTION
+    with span("embedding", queries=1):
+        vecs = rag.embedder.encode([f"{QUERY_INSTRUCTION}{query}"], normalize_embeddings=True).tolist()
+    return rag._dense_search(vecs, k)[0]
+
+
+def bm25_only(rag, query, k):
+    return rag._bm25_search(query, k)
+
+
+def ensemble(rag, query, k):
+    return rag._ranked_candidates([query], k, None, rerank=False, hierarchical=False)[0]
+
+
+def ensemble_rerank(rag, query, k):
+    return rag._ranked_candidates([query], k, None, rerank=True, hierarchical=False)[0]
+
+
+def hierarchical_rerank(rag, query, k):
+    return rag._ranked_candidates([query], k, None, rerank=True, hierarchical=True)[0]
+
+
+# Retrieval configurations, from cheapest to the full pipeline (no query router, no LLM)
+CONFIGS = {
+    "dense": dense_only,
+    "bm25": bm25_only,
+    "ensemble": ensemble,
+    "ensemble+rerank": ensemble_rerank,
+    "hierarchical+rerank": hierarchical_rerank,
+}
+
+
+def run_config(rag, name, items, fetch_k):
+    """Runs every query through one configuration; returns rankings and per-stage milliseconds."""
+    retrieve = CONFIGS[name]
+    retrieve(rag, items[0]["query"], fetch_k)  # warm-up (model kernels, caches)
+
+    rankings, stage_ms = [], {"total": []}
+    for i, item in enumerate(items):
+        with start_trace(f"bench:{name}:{i}", "bench") as trace:
+            t0 = time.perf_counter()
+            hits = retrieve(rag, item["query"], fetch_k)
+            stage_ms["total"].append((time.perf_counter() - t0) * 1000)
+        rankings.append(ranked_sections(hits))
+        for stage, ms in trace.breakdown().items():
+            stage_ms.setdefault(stage, []).append(ms)
+    return rankings, stage_ms
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline retrieval benchmark: recall@k, MRR, nDCG and stage latency")
+    ap.add_argument("--dataset", type=Path, default=DATASET_FILE)
+    ap.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    ap.add_argument("--fetch-k", type=int, default=15, help="candidates retrieved per query")
+    ap.add_argument("--output", type=Path, help="report path (default: logs/retrieval_bench/bench_<timestamp>.json)")
+    ap.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.02, help="allowed drop of any quality metric")
+    args = ap.parse_args()
+
+    with open(args.dataset, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    expected = [item["expected"] for item in items]
+    print(f"Loaded {len(items)} labelled queries from {args.dataset}")
+
+    # Builds the real indices; no OpenRouter key is needed for retrieval
+    from backend.app.rag import LegalRAG
+    rag = LegalRAG()
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "dataset": str(args.dataset),
+        "fetch_k": args.fetch_k,
+        "dense_index": rag.index.name,
+        "configs": {},
+    }
+    for name in args.configs:
+        if name == "hierarchical+rerank" and rag.sections is None:
+            print(f"Skipping {name}: section index not built (set LEGALI_HIERARCHICAL_RETRIEVAL=1)")
+            continue
+        rankings, stage_ms = run_config(rag, name, items, args.fetch_k)
+        metrics = summarize(rankings, expected, stage_ms)
+        report["configs"][name] = metrics
+        total = metrics["latency_ms"]["total"]
+        print(
+            f"{name:<20} R@1 {metrics['recall@1']:.3f} | R@5 {metrics['recall@5']:.3f} | R@10 {metrics['recall@10']:.3f}"
+            f" | MRR {metrics['mrr']:.3f} | nDCG@10 {metrics['ndcg@10']:.3f}"
+            f" | p50 {total['p50']:.1f} ms | p95 {total['p95']:.1f} ms | p99 {total['p99']:.1f} ms"
+        )
+        for stage, pct in metrics["latency_ms"].items():
+            if stage != "total":
+                print(f"    {stage:<16} p50 {pct['p50']:8.2f} | p95 {pct['p95']:8.2f} | p99 {pct['p99']:8.2f} ms")
+
+    output = args.output or REPORTS_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nReport saved to: {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare(report, baseline, args.tolerance)
+        print(f"\n=== Compared with {args.baseline} ===")
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) dropped by more than {args.tolerance}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
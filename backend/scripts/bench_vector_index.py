@@ -0,0 +1,142 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.vector_index import ChromaIndex, Int8Index, NumpyIndex
+
+DB_DIR = ROOT_DIR / "backend" / "data" / "chroma_db"
+COLLECTION_NAME = "legali_corpus"
+EVAL_FILE = ROOT_DIR / "backend" / "tests" / "eval_dataset.json"
+EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+def eval_queries():
+    """Real questions from the eval set (needs the embedding model)."""
+    from sentence_transformers import SentenceTransformer
+    with open(EVAL_FILE, "r", encoding="utf-8") as f:
+        questions = [item["question"] for item in json.load(f)]
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    return model.encode([f"{QUERY_INSTRUCTION}{q}" for q in questions], normalize_embeddings=True).tolist()
+
+def synthetic_queries(index, n, noise, seed=0):
+    """Corpus vectors plus Gaussian noise: near-duplicate lookups without loading a model."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(index), size=min(n, len(index)), replace=False)
+    vecs = np.asarray(index.matrix[rows], dtype=np.float32)
+    vecs += rng.normal(scale=noise, size=vecs.shape).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs.tolist()
+
+def time_queries(index, queries, k, act=None):
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(index.query([q], k, act=act)[0])
+        latencies.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    index.query(queries, k, act=act)
+    batch = time.perf_counter() - t0
+    return latencies, batch, results
+
+def recall(approx, exact):
+    """Mean overlap of the approximate top-k with the exact top-k."""
+    scores = []
+    for a, e in zip(approx, exact):
+        truth = {h["id"] for h in e}
+        if truth:
+            scores.append(len(truth & {h["id"] for h in a}) / len(truth))
+    return float(np.mean(scores)) if scores else 1.0
+
+def dir_size(path):
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+def scaled(index, factor, noise, seed=1):
+    """Grows the corpus `factor` times with jittered copies, to project recall and memory at larger sizes."""
+    rng = np.random.default_rng(seed)
+    base = np.asarray(index.matrix, dtype=np.float32)
+    blocks = [base]
+    for _ in range(factor - 1):
+        block = base + rng.normal(scale=noise, size=base.shape).astype(np.float32)
+        blocks.append(block / np.linalg.norm(block, axis=1, keepdims=True))
+    ids = [f"{cid}#{i}" if i else cid for i in range(factor) for cid in index.ids]
+    return NumpyIndex(ids, np.vstack(blocks), index.documents * factor, index.metadatas * factor)
+
+def memory_report(exact, int8, chroma_bytes):
+    n, dim = exact.matrix.shape
+    print(f"Memory for {n} x {dim} vectors:")
+    print(f"  float32 matrix        {n * dim * 4 / 1e6:10.1f} MB")
+    print(f"  float16 matrix        {n * dim * 2 / 1e6:10.1f} MB")
+    print(f"  int8 codes + params   {int8.nbytes / 1e6:10.1f} MB  (resident; fp32 rescoring rows are memory-mapped)")
+    if chroma_bytes is not None:
+        print(f"  chroma_db on disk     {chroma_bytes / 1e6:10.1f} MB")
+    print()
+
+def report(name, latencies, batch, n):
+    print(
+        f"{name:<14} p50 {percentile_ms(latencies, 50):7.2f} ms | p95 {percentile_ms(latencies, 95):7.2f} ms"
+        f" | batch of {n}: {batch * 1000:8.1f} ms"
+    )
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare Chroma, exact NumPy and int8 dense search")
+    ap.add_argument("--k", type=int, default=15)
+    ap.add_argument("--queries", choices=("synthetic", "eval"), default="synthetic")
+    ap.add_argument("--n", type=int, default=200, help="synthetic query count")
+    ap.add_argument("--noise", type=float, default=0.05, help="synthetic query noise")
+    ap.add_argument("--act", help="also benchmark with an act filter, e.g. BNS")
+    ap.add_argument("--save", metavar="STEM", help="write the NumPy index for LEGALI_VECTOR_INDEX (mmap)")
+    ap.add_argument("--scale", type=int, default=1,
+                    help="also compare numpy vs int8 on a corpus grown N times with jittered copies")
+    args = ap.parse_args()
+
+    import chromadb
+    collection = chromadb.PersistentClient(path=str(DB_DIR)).get_collection(COLLECTION_NAME)
+    chroma = ChromaIndex(collection)
+
+    t0 = time.perf_counter()
+    exact = NumpyIndex.from_collection(collection)
+    print(f"Exported {len(exact)} vectors from Chroma in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    if args.save:
+        paths = exact.save(args.save, model=EMBEDDING_MODEL)
+        print(f"Saved NumPy index to {paths['matrix']}")
+
+    queries = eval_queries() if args.queries == "eval" else synthetic_queries(exact, args.n, args.noise)
+    print(f"{len(queries)} {args.queries} queries, k={args.k}\n")
+
+    int8 = Int8Index.from_index(exact)
+    memory_report(exact, int8, dir_size(DB_DIR))
+
+    for act in [None] + ([args.act] if args.act else []):
+        label = f" [{act}]" if act else ""
+        np_lat, np_batch, np_res = time_queries(exact, queries, args.k, act)
+        ch_lat, ch_batch, ch_res = time_queries(chroma, queries, args.k, act)
+        q8_lat, q8_batch, q8_res = time_queries(int8, queries, args.k, act)
+        report(f"numpy{label}", np_lat, np_batch, len(queries))
+        report(f"chroma{label}", ch_lat, ch_batch, len(queries))
+        report(f"int8{label}", q8_lat, q8_batch, len(queries))
+        print(f"chroma recall@{args.k} vs exact{label}: {recall(ch_res, np_res):.4f}")
+        print(f"int8   recall@{args.k} vs exact{label}: {recall(q8_res, np_res):.4f}\n")
+
+    if args.scale > 1:
+        big = scaled(exact, args.scale, args.noise)
+        big_int8 = Int8Index.from_index(big)
+        memory_report(big, big_int8, None)
+        np_lat, np_batch, np_res = time_queries(big, queries, args.k)
+        q8_lat, q8_batch, q8_res = time_queries(big_int8, queries, args.k)
+        report(f"numpy x{args.scale}", np_lat, np_batch, len(queries))
+        report(f"int8 x{args.scale}", q8_lat, q8_batch, len(queries))
+        print(f"int8   recall@{args.k} vs exact (x{args.scale}): {recall(q8_res, np_res):.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.build_graph import BuildGraph, FAILED, python_stage, summarize
+from backend.app.embedding_store import store_paths
+from backend.app.statute_parser import ACT_SPECS
+
+DATA = Path("backend/data")
+RAW_PDF_DIR = DATA / "raw_pdfs"
+FINAL = DATA / "final"
+
+# Acts merged into legali_corpus.json; each gets its own clean/parse stages
+CORPUS_ACTS = ("bns", "bnss", "bsa")
+
+def rel(path):
+    return Path(path).resolve().relative_to(ROOT_DIR)
+
+def corpus_stages():
+    """
+    pdf_processing -> parse (per act) -> normalize_corpus -> create_chunks -> finalize_chunks
+    -> patch_v2 -> generate_embeddings -> ingest, with migrate_to_db beside the embedding branch
+    and xref (cross-reference graph) / definitions beside chunking.
+    """
+    stages = []
+    structured = []
+
+    for act in CORPUS_ACTS:
+        spec = ACT_SPECS[act]
+        cleaned, parsed = rel(spec["input"]), rel(spec["output"])
+        # pdf_processing names its output after the PDF stem
+        stages.append(python_stage(
+            f"clean_{act}", "backend/app/pdf_processing.py", [RAW_PDF_DIR / f"{act}.pdf"],
+            inputs=[RAW_PDF_DIR / f"{act}.pdf"], outputs=[cleaned],
+            code=["backend/app/pdf_processing.py", "backend/app/pdf_extract.py"],
+        ))
+        stages.append(python_stage(
+            f"parse_{act}", "backend/app/statute_parser.py", [act],
+            inputs=[cleaned], outputs=[parsed], code=["backend/app/statute_parser.py"],
+        ))
+        structured.append(parsed)
+
+    it_act = ACT_SPECS["it_act"]
+    it_act_json = rel(it_act["output"])
+    stages.append(python_stage(
+        "parse_it_act", "backend/app/statute_parser.py", ["it_act"],
+        inputs=[rel(it_act["pdf"])], outputs=[it_act_json],
+        code=["backend/app/statute_parser.py", "backend/app/pdf_extract.py"],
+    ))
+
+    stages += [
+        python_stage(
+            "normalize", "backend/app/normalize_corpus.py",
+            inputs=structured, outputs=[FINAL / "legali_corpus.json"],
+            code=["backend/app/normalize_corpus.py"],
+        ),
+        python_stage(
+            "xref", "backend/app/xref.py",
+            inputs=[FINAL / "legali_corpus.json"], outputs=[FINAL / "legali_xref.json"],
+            code=["backend/app/xref.py"],
+        ),
+        python_stage(
+            "definitions", "backend/app/definitions.py",
+            inputs=[FINAL / "legali_corpus.json"], outputs=[FINAL / "legali_definitions.json"],
+            code=["backend/app/definitions.py"],
+        ),
+        python_stage(
+            "chunk", "backend/app/create_chunks.py",
+            inputs=[FINAL / "legali_corpus.json"], outputs=[FINAL / "legali_chunks.json"],
+            code=["backend/app/create_chunks.py"],
+        ),
+        python_stage(
+            "finalize", "backend/app/finalize_chunks.py",
+            inputs=[FINAL / "legali_chunks.json"], outputs=[FINAL / "legali_ready.json"],
+            code=["backend/app/finalize_chunks.py"],
+        ),
+        python_stage(
+            "patch", "backend/scripts/patch_v2.py",
+            inputs=[FINAL / "legali_ready.json"], outputs=[FINAL / "legali_ready_v2.json"],
+            code=["backend/scripts/patch_v2.py"],
+        ),
+    ]
+
+    vectors = store_paths(FINAL / "legali_vectors_v2")
+    vector_files = [vectors["matrix"], vectors["ids"], vectors["meta"]]
+    stages += [
+        python_stage(
+            "embed", "backend/app/generate_embeddings.py",
+            inputs=[FINAL / "legali_ready_v2.json"], outputs=vector_files,
+            code=["backend/app/generate_embeddings.py", "backend/app/embedding_store.py"],
+        ),
+        # ingest is incremental per chunk; it reuses cached vectors when present
+        python_stage(
+            "ingest", "backend/scripts/ingest.py",
+            inputs=[FINAL / "legali_ready.json", FINAL / "legali_ready_v2.json"],
+            optional=[it_act_json] + vector_files,
+            outputs=[DATA / "chroma_db"],
+            code=["backend/scripts/ingest.py", "backend/app/ingest_sync.py", "backend/app/embedding_store.py"],
+        ),
+        python_stage(
+            "migrate_db", "backend/scripts/migrate_to_db.py",
+            inputs=structured, optional=[it_act_json], outputs=[DATA / "legali.db"],
+            code=["backend/scripts/migrate_to_db.py"],
+        ),
+    ]
+    return stages
+
+def main():
+    ap = argparse.ArgumentParser(description="Rebuild only the stale stages of the corpus pipeline")
+    ap.add_argument("targets", nargs="*", metavar="STAGE", help="stages to build, with their upstream (default: all)")
+    ap.add_argument("--dry-run", action="store_true", help="show what would run")
+    ap.add_argument("--force", action="append", default=[], metavar="STAGE", help="rebuild STAGE even if fresh")
+    ap.add_argument("--jobs", type=int, default=4, help="stages run in parallel")
+    ap.add_argument("--list", action="store_true", help="list stages and their dependencies")
+    args = ap.parse_args()
+
+    graph = BuildGraph(corpus_stages(), ROOT_DIR)
+
+    if args.list:
+        for name in graph.order:
+            deps = ", ".join(graph.deps[name]) or "-"
+            print(f"{name:<14} <- {deps}")
+        return
+
+    try:
+        states = graph.run(args.targets or None, jobs=args.jobs, dry_run=args.dry_run, force=args.force)
+    except KeyError as e:
+        ap.error(str(e))
+
+    print(f"\nBuild summary: {summarize(states)}")
+    if FAILED in states.values():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.rag import QUERY_INSTRUCTION, LegalRAG
+from backend.app.relevance_gate import DEFAULT_MARGIN, fit_threshold, save_thresholds, top_scores
+from backend.scripts.test_negative import NEGATIVE_SCENARIOS
+
+EVAL_FILE = ROOT_DIR / "backend" / "tests" / "eval_dataset.json"
+OUTPUT_FILE = ROOT_DIR / "backend" / "data" / "final" / "legali_gate.json"
+
+# In-scope questions beyond the eval set (everyday phrasing the gate must never refuse)
+IN_SCOPE = [
+    "What is murder under BNS?",
+    "My neighbour hit me during a fight, what can I do?",
+    "Can the police arrest without a warrant?",
+    "Is a WhatsApp chat admissible as evidence?",
+    "What happens if someone steals my phone?",
+]
+# Clearly off-topic questions (the negative scenarios are legal-adjacent and mostly answerable by the LLM layer)
+OFF_TOPIC = [
+    "How to bake a pineapple cake in zero gravity?",
+    "What is the capital of Australia?",
+    "Write a python function to reverse a linked list.",
+    "Who won the football world cup in 2018?",
+    "Recommend a good laptop for gaming under 1 lakh.",
+]
+
+
+def scores_for(rag, questions):
+    """
+    (dense, rerank) top-1 scores per question, as the gate sees them: the dense pre-check's
+    best raw-question similarity and the best cross-encoder score of `query`'s retrieval.
+    """
+    query_vecs = rag.embedder.encode(
+        [f"{QUERY_INSTRUCTION}{q}" for q in questions], normalize_embeddings=True
+    ).tolist()
+    dense = [1.0 - hits[0]['distance'] for hits in rag._dense_search(query_vecs, 1)]
+    retrievals = rag.retrieve_batch(questions, top_k=5, xref_budget=0)
+    return [(d, top_scores(r)[1]) for d, r in zip(dense, retrievals)]
+
+
+def calibrate(output=OUTPUT_FILE, margin=DEFAULT_MARGIN):
+    with open(EVAL_FILE, "r", encoding="utf-8") as f:
+        positives = [item["question"] for item in json.load(f)] + IN_SCOPE
+    negatives = [s["query"] for s in NEGATIVE_SCENARIOS] + OFF_TOPIC
+
+    rag = LegalRAG()
+    pos_scores = scores_for(rag, positives)
+    neg_scores = scores_for(rag, negatives)
+
+    print("\n=== Gate Calibration Scores (dense / rerank) ===")
+    for label, questions, scores in (("IN ", positives, pos_scores), ("OUT", negatives, neg_scores)):
+        for question, (dense, rerank) in zip(questions, scores):
+            print(f"{label}  {dense:6.3f}  {rerank:7.3f}  {question}")
+
+    dense_fit = fit_threshold([d for d, _ in pos_scores], [d for d, _ in neg_scores], margin)
+    rerank_fit = fit_threshold([r for _, r in pos_scores], [r for _, r in neg_scores], margin)
+    for name, fit in (("dense", dense_fit), ("rerank", rerank_fit)):
+        print(
+            f"{name:>6}: threshold {fit['threshold']:.3f} blocks "
+            f"{fit['negatives_blocked']}/{fit['negatives']} out-of-scope, "
+            f"{fit['positives_blocked']}/{fit['positives']} in-scope"
+        )
+
+    save_thresholds(output, dense_fit, rerank_fit, margin=margin)
+    print(f"Saved thresholds to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the retrieval gate's dense/rerank score floors")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN,
+                        help="Gap below the weakest in-scope score when no out-of-scope score is lower")
+    args = parser.parse_args()
+    calibrate(args.output, args.margin)
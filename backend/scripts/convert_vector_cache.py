@@ -0,0 +1,36 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.embedding_store import DEFAULT_DTYPE, convert_json_cache, store_paths
+
+DATA_DIR = ROOT_DIR / "backend" / "data" / "final"
+
+def convert_all(dtype=DEFAULT_DTYPE):
+    """One-shot migration: every legacy *vectors*.json cache -> .npy + .ids.json + .meta.json"""
+    converted = 0
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if "vectors" not in filename or not filename.endswith(".json"):
+            continue
+        if filename.endswith(".ids.json") or filename.endswith(".meta.json"):
+            continue
+
+        json_path = DATA_DIR / filename
+        if store_paths(json_path)["meta"].exists():
+            print(f"Skipping {filename}: binary store already exists.")
+            continue
+
+        print(f"Converting {filename} ({json_path.stat().st_size / 1e6:.1f} MB)...")
+        paths = convert_json_cache(json_path, dtype=dtype)
+        size = paths["matrix"].stat().st_size + paths["ids"].stat().st_size
+        print(f"  -> {paths['matrix'].name} ({size / 1e6:.1f} MB)")
+        converted += 1
+
+    print(f"Converted {converted} cache(s). The JSON files can be deleted once verified.")
+
+if __name__ == "__main__":
+    convert_all(dtype=sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DTYPE)
@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.retrieval_eval import latency_percentiles
+
+QUERIES_FILE = ROOT_DIR / "backend" / "tests" / "retrieval_benchmark.json"
+REPORTS_DIR = ROOT_DIR / "backend" / "logs" / "load_tests"
+
+# Run the API against the local stand-in so the numbers measure this service, not OpenRouter:
+#   python backend/app/mock_openrouter.py --port 8001
+#   OPENROUTER_BASE_URL=http://localhost:8001/api/v1 python backend/app/api.py
+#   python backend/scripts/load_test.py --concurrency 16 --requests 200
+
+
+def load_queries(path):
+    """Questions from a benchmark ("query") or eval ("question") dataset."""
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    return [item.get("query") or item["question"] for item in items]
+
+
+async def run_one(client, url, endpoint, query, i):
+    """One streamed request. Returns {ttft_ms, total_ms, chunks, error}."""
+    if endpoint == "/chat/stream":
+        body = {"query": query, "session_id": f"load-{i}"}
+    else:
+        body = {"query": query, "history": []}
+
+    result = {"ttft_ms": None, "total_ms": None, "chunks": 0, "error": None}
+    t0 = time.perf_counter()
+    try:
+        async with client.stream("POST", url + endpoint, json=body) as response:
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+                return result
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue  # blank separators and heartbeat comments
+                event = json.loads(line[6:])
+                if "chunk" in event:
+                    if result["ttft_ms"] is None:
+                        result["ttft_ms"] = (time.perf_counter() - t0) * 1000
+                    result["chunks"] += 1
+                elif "error" in event or event.get("type") == "error":
+                    result["error"] = str(event.get("error") or event.get("data"))
+    except (httpx.HTTPError, json.JSONDecodeError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["total_ms"] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+async def run_load(url, endpoint, queries, concurrency, total, timeout):
+    """N concurrent clients draining a shared counter; returns (results, wall-clock seconds)."""
+    results = []
+    next_index = iter(range(total))
+
+    async def client_loop(client):
+        for i in next_index:
+            results.append(await run_one(client, url, endpoint, queries[i % len(queries)], i))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        wall = time.perf_counter() - t0
+    return results, wall
+
+
+def summarize_load(results, wall_seconds):
+    ok = [r for r in results if r["error"] is None]
+    errors = {}
+    for r in results:
+        if r["error"] is not None:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    return {
+        "requests": len(results),
+        "succeeded": len(ok),
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(ok) / wall_seconds, 3) if wall_seconds else 0.0,
+        "ttft_ms": latency_percentiles([r["ttft_ms"] for r in ok if r["ttft_ms"] is not None]),
+        "total_ms": latency_percentiles([r["total_ms"] for r in ok]),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Concurrent SSE load generator for the chat endpoints")
+    ap.add_argument("--url", default="http://localhost:8000")
+    ap.add_argument("--endpoint", choices=["/chat", "/chat/stream"], default="/chat")
+    ap.add_argument("--concurrency", type=int, default=8, help="simultaneous SSE clients")
+    ap.add_argument("--requests", type=int, default=100, help="total requests across all clients")
+    ap.add_argument("--queries", type=Path, default=QUERIES_FILE)
+    ap.add_argument("--timeout", type=float, default=120.0, help="per-request timeout (seconds)")
+    ap.add_argument("--output", type=Path, help="report path (default: logs/load_tests/load_<timestamp>.json)")
+    args = ap.parse_args()
+
+    queries = load_queries(args.queries)
+    print(f"Driving {args.requests} requests through {args.concurrency} clients at {args.url}{args.endpoint}")
+    results, wall = asyncio.run(
+        run_load(args.url, args.endpoint, queries, args.concurrency, args.requests, args.timeout)
+    )
+    summary = summarize_load(results, wall)
+
+    print(f"Succeeded: {summary['succeeded']}/{summary['requests']} in {summary['wall_seconds']:.1f} s"
+          f" ({summary['throughput_rps']:.2f} req/s)")
+    for name in ("ttft_ms", "total_ms"):
+        pct = summary[name]
+        if pct:
+            print(f"{name:<9} p50 {pct['p50']:8.1f} | p95 {pct['p95']:8.1f} | p99 {pct['p99']:8.1f} ms")
+    for error, count in summary["errors"].items():
+        print(f"  {count} x {error}")
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "url": args.url + args.endpoint,
+        "concurrency": args.concurrency,
+        **summary,
+    }
+    output = args.output or REPORTS_DIR / f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nReport saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,14 @@
 import sys
 import time
 import json
-sys.path.append("/home/aizen/LEGALI")
+from pathlib import Path
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
 from backend.app.rag import LegalRAG
+from backend.app.tracing import start_trace
 
 def profile():
     print("Initializing...")
@@ -13,35 +19,40 @@ def profile():
 
     query = "What is the punishment for murder?"
     print(f"\nProfiling Query: {query}")
-    
-    # Measure Retrieval
-    t0 = time.time()
-    retrieval = rag.retrieve(query)
-    t1 = time.time()
-    print(f"Retrieval Time: {t1 - t0:.2f}s")
-    
-    ids = retrieval['ids'][0]
-    if not ids:
-        print("No documents retrieved.")
-        return
-
-    # Build Context
-    context_parts = []
-    docs = retrieval['documents'][0]
-    metas = retrieval['metadatas'][0]
-    for i in range(len(ids)):
-        context_parts.append(f"SOURCE_ID: [{ids[i]}]\nTEXT:\n{docs[i]}\n")
-    context_str = "\n---\n".join(context_parts)
-    print(f"Context Length: {len(context_str)} chars")
-
-    # Measure Generation
-    t2 = time.time()
-    # Direct call to generate_response to skip overhead
-    answer = rag.generate_response(query, context_str)
-    t3 = time.time()
-    print(f"Generation Time: {t3 - t2:.2f}s")
-    
+
+    with start_trace("profile", "profile") as trace:
+        # Measure Retrieval
+        t0 = time.time()
+        retrieval = rag.retrieve(query)
+        t1 = time.time()
+        print(f"Retrieval Time: {t1 - t0:.2f}s")
+
+        ids = retrieval['ids'][0]
+        if not ids:
+            print("No documents retrieved.")
+            return
+
+        # Build Context
+        context_parts = []
+        docs = retrieval['documents'][0]
+        metas = retrieval['metadatas'][0]
+        for i in range(len(ids)):
+            context_parts.append(f"SOURCE_ID: [{ids[i]}]\nTEXT:\n{docs[i]}\n")
+        context_str = "\n---\n".join(context_parts)
+        print(f"Context Length: {len(context_str)} chars")
+
+        # Measure Generation
+        t2 = time.time()
+        # Direct call to generate_response to skip overhead
+        answer = rag.generate_response(query, context_str)
+        t3 = time.time()
+        print(f"Generation Time: {t3 - t2:.2f}s")
+
     print(f"\nTotal Query Time: {t3 - t0:.2f}s")
 
+    # Per-stage spans recorded by the pipeline itself
+    print("\nStage Breakdown (ms):")
+    print(json.dumps(trace.breakdown(), indent=2))
+
 if __name__ == "__main__":
     profile()
@@ -1,7 +1,9 @@
 import sys
 import os
 import json
+import time
 import asyncio
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -9,7 +11,16 @@ from datetime import datetime
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(ROOT_DIR))
 
-from backend.app.rag import LegalRAG, analyze_query_for_filters, LLM_MODEL
+from backend.app.rag import LegalRAG, analyze_query_for_filters, LLM_MODEL, OPENROUTER_BASE_URL
+from backend.app.eval_runner import (
+    ZERO_SCORES,
+    JudgeCache,
+    PartialRun,
+    aggregate,
+    diff_reports,
+    latest_report,
+    parse_scores,
+)
 from openai import AsyncOpenAI
 
 dataset_path = ROOT_DIR / "backend" / "tests" / "eval_dataset.json"
@@ -17,71 +28,19 @@ reports_dir = ROOT_DIR / "backend" / "logs" / "eval_reports"
 reports_dir.mkdir(parents=True, exist_ok=True)
 (ROOT_DIR / "backend" / "tests").mkdir(parents=True, exist_ok=True)
 
-async def evaluate():
-    print("Loading test cases...")
-    with open(dataset_path, "r", encoding="utf-8") as f:
-        dataset = json.load(f)
-        
-    print("Initializing LegalRAG...")
-    rag = LegalRAG()
-    
-    results = []
-    
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        print("CRITICAL ERROR: OPENROUTER_API_KEY NOT FOUND!")
-        return
+# Questions evaluated at once (router + RAG + judge each)
+EVAL_CONCURRENCY = int(os.getenv("LEGALI_EVAL_CONCURRENCY", "8"))
 
-    llm_client = AsyncOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key
-    )
-    
-    total_faithfulness = 0.0
-    total_relevance = 0.0
-    total_retrieval = 0.0
-    
-    print("\n--- Starting Evaluation Loop ---")
-    for item in dataset:
-        question = item["question"]
-        ground_truth = item["ground_truth"]
-        expected_act = item["expected_act"]
-        
-        print(f"\nEvaluating: {question}")
-        
-        # 1. Expand query using the router (Optional but matches real pipeline)
-        try:
-            filters = await analyze_query_for_filters(question, rag.async_client, LLM_MODEL)
-            search_query = filters.get("expanded_query", question)
-        except Exception:
-            search_query = question
-        print(f"  > Expanded Query: {search_query}")
-        
-        # 2. Invoke RAG
-        # Note: rag.query is synchronous. It retrieves, builds context, and generates answer.
-        try:
-            rag_response = rag.query(question)
-        except Exception as e:
-            print(f"  > RAG execution failed: {e}")
-            continue
-
-        answer = rag_response.get("answer", "")
-        # Extract context from debug_metadata
-        context_str = rag_response.get("debug_metadata", {}).get("context_used", "")
-        
-        # Extract retrieved acts from citations list
-        citations = rag_response.get("citations", [])
-        retrieved_acts = list(set([c.get("act", "") for c in citations]))
-        
-        # 3. Use LLM as Judge
-        judge_prompt = f"""You are an expert legal evaluator. Your task is to mathematically grade the AI's answer strictly on a scale of 0.0 or 1.0 against three metrics based on the provided inputs.
+
+def build_judge_prompt(question, ground_truth, expected_act, answer, context_str, retrieved_acts):
+    return f"""You are an expert legal evaluator. Your task is to mathematically grade the AI's answer strictly on a scale of 0.0 or 1.0 against three metrics based on the provided inputs.
 
 Question: {question}
 Ground Truth: {ground_truth}
-Retrieved Context used by AI: 
+Retrieved Context used by AI:
 {context_str}
 
-AI Answer to Evaluate: 
+AI Answer to Evaluate:
 {answer}
 
 Expected Act to retrieve from: {expected_act}
@@ -100,73 +59,184 @@ Example Output:
     "retrieval_success": 1.0
 }}
 """
+
+
+async def expand_query(rag, question):
+    # Router expansion (matches the real pipeline's first step; printed for inspection only)
+    try:
+        filters = await analyze_query_for_filters(question, rag.async_client, LLM_MODEL)
+        return filters.get("expanded_query", question)
+    except Exception:
+        return question
+
+
+async def evaluate_item(rag, llm_client, item, cache, judge_model):
+    """
+    Evaluates one question. Returns (result, cacheable): result is None when the RAG call failed;
+    cacheable is False when the judge failed (its zero scores are neither cached nor journaled).
+    """
+    question = item["question"]
+    ground_truth = item["ground_truth"]
+    expected_act = item["expected_act"]
+
+    # 1 + 2. Router and RAG in parallel. rag.query is synchronous, so it runs in a worker thread
+    try:
+        search_query, rag_response = await asyncio.gather(
+            expand_query(rag, question),
+            asyncio.to_thread(rag.query, question),
+        )
+    except Exception as e:
+        print(f"\n{question}\n  > RAG execution failed: {e}")
+        return None, False
+
+    answer = rag_response.get("answer", "")
+    # Extract context from debug_metadata
+    context_str = rag_response.get("debug_metadata", {}).get("context_used", "")
+
+    # Extract retrieved acts from citations list
+    citations = rag_response.get("citations", [])
+    retrieved_acts = list(set([c.get("act", "") for c in citations]))
+
+    # 3. Use LLM as Judge (skipped when this exact answer was already graded)
+    scores = cache.get(question, answer, judge_model) if cache else None
+    cached = scores is not None
+    cacheable = True
+    if scores is None:
+        judge_prompt = build_judge_prompt(question, ground_truth, expected_act, answer, context_str, retrieved_acts)
         try:
             response = await llm_client.chat.completions.create(
-                model=LLM_MODEL,
+                model=judge_model,
                 messages=[{"role": "user", "content": judge_prompt}],
                 temperature=0.0,
                 max_tokens=150
             )
-            content = response.choices[0].message.content
-            clean_content = content.replace("```json", "").replace("```", "").strip()
-            if "{" in clean_content and "}" in clean_content:
-                clean_content = clean_content[clean_content.find("{"):clean_content.rfind("}")+1]
-            scores = json.loads(clean_content)
+            scores = parse_scores(response.choices[0].message.content)
+            if cache:
+                cache.put(question, answer, judge_model, scores)
         except Exception as e:
-            print(f"  > Judge logic failed: {e}")
-            scores = {"faithfulness": 0.0, "relevance": 0.0, "retrieval_success": 0.0}
-            
-        faithfulness = float(scores.get("faithfulness", 0.0))
-        relevance = float(scores.get("relevance", 0.0))
-        retrieval_success = float(scores.get("retrieval_success", 0.0))
-        
-        print(f"  > Faithfulness: {faithfulness} | Relevance: {relevance} | Retrieval: {retrieval_success}")
-        
-        total_faithfulness += faithfulness
-        total_relevance += relevance
-        total_retrieval += retrieval_success
-        
-        results.append({
-            "question": question,
-            "faithfulness": faithfulness,
-            "relevance": relevance,
-            "retrieval_success": retrieval_success,
-            "answer": answer,
-            "expected_act": expected_act,
-            "retrieved_acts": retrieved_acts,
-            "context_used": context_str
-        })
-        
+            print(f"  > Judge logic failed for '{question}': {e}")
+            scores = dict(ZERO_SCORES)
+            cacheable = False
+
+    print(f"\n{question}\n  > Expanded Query: {search_query}")
+    print(
+        f"  > Faithfulness: {scores['faithfulness']} | Relevance: {scores['relevance']}"
+        f" | Retrieval: {scores['retrieval_success']}{' (cached verdict)' if cached else ''}"
+    )
+    result = {
+        "question": question,
+        "faithfulness": scores["faithfulness"],
+        "relevance": scores["relevance"],
+        "retrieval_success": scores["retrieval_success"],
+        "answer": answer,
+        "expected_act": expected_act,
+        "retrieved_acts": retrieved_acts,
+        "context_used": context_str
+    }
+    return result, cacheable
+
+
+async def evaluate(concurrency=EVAL_CONCURRENCY, resume=False, use_cache=True, compare_to=None):
+    print("Loading test cases...")
+    with open(dataset_path, "r", encoding="utf-8") as f:
+        dataset = json.load(f)
+
+    print("Initializing LegalRAG...")
+    rag = LegalRAG()
+
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        print("CRITICAL ERROR: OPENROUTER_API_KEY NOT FOUND!")
+        return
+
+    llm_client = AsyncOpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key
+    )
+    judge_model = LLM_MODEL
+    cache = JudgeCache.load() if use_cache else None
+
+    # Results of an interrupted run are reused; a fresh run starts a new journal
+    partial = PartialRun()
+    done = partial.load() if resume else {}
+    if not resume:
+        partial.clear()
+    pending = [item for item in dataset if item["question"] not in done]
+    if done:
+        print(f"Resuming: {len(dataset) - len(pending)} of {len(dataset)} questions already evaluated")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            result, cacheable = await evaluate_item(rag, llm_client, item, cache, judge_model)
+        if result is not None and cacheable:
+            partial.append(result)
+        return result
+
+    print(f"\n--- Starting Evaluation Loop ({len(pending)} questions, concurrency {concurrency}) ---")
+    t0 = time.perf_counter()
+    try:
+        finished = await asyncio.gather(*(run(item) for item in pending))
+    finally:
+        if cache:
+            cache.save()
+    elapsed = time.perf_counter() - t0
+
+    by_question = dict(done)
+    by_question.update({r["question"]: r for r in finished if r is not None})
+    # Dataset order, regardless of completion order
+    results = [by_question[item["question"]] for item in dataset if item["question"] in by_question]
+
     num_qs = len(dataset)
     if num_qs == 0:
         return
-        
-    avg_faithfulness = total_faithfulness / num_qs
-    avg_relevance = total_relevance / num_qs
-    avg_retrieval = total_retrieval / num_qs
-    
+
+    scores = aggregate(results, num_qs)
+
     print("\n========================================")
-    print(f"System Faithfulness Score: {avg_faithfulness * 100:.2f}%")
-    print(f"System Relevance Score:  {avg_relevance * 100:.2f}%")
-    print(f"System Retrieval Score:  {avg_retrieval * 100:.2f}%")
+    print(f"System Faithfulness Score: {scores['faithfulness'] * 100:.2f}%")
+    print(f"System Relevance Score:  {scores['relevance'] * 100:.2f}%")
+    print(f"System Retrieval Score:  {scores['retrieval_success'] * 100:.2f}%")
+    print(f"Evaluated {len(pending)} questions in {elapsed:.1f} s")
+    if cache:
+        print(f"Judge cache: {cache.hits} hits, {cache.misses} misses")
     print("========================================")
-    
+
     report = {
         "timestamp": datetime.now().isoformat(),
-        "aggregate_scores": {
-            "faithfulness": avg_faithfulness,
-            "relevance": avg_relevance,
-            "retrieval_success": avg_retrieval
-        },
+        "judge_model": judge_model,
+        "aggregate_scores": scores,
         "details": results
     }
-    
+
+    previous = compare_to or latest_report(reports_dir)
+
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     report_file = reports_dir / f"eval_report_{timestamp}.json"
     with open(report_file, "w", encoding="utf-8") as f:
         json.dump(report, f, indent=4)
-        
+    partial.clear()
+
     print(f"\n[SUCCESS] CI/CD Report saved to: {report_file}")
 
+    if previous:
+        with open(previous, "r", encoding="utf-8") as f:
+            previous_report = json.load(f)
+        print(f"\n=== Compared with {previous} ===")
+        for line in diff_reports(report, previous_report):
+            print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="LLM-judged evaluation of the RAG pipeline")
+    ap.add_argument("--concurrency", type=int, default=EVAL_CONCURRENCY, help="questions evaluated at once")
+    ap.add_argument("--resume", action="store_true", help="continue an interrupted run")
+    ap.add_argument("--no-cache", action="store_true", help="re-grade every answer")
+    ap.add_argument("--compare", type=Path, help="report to diff against (default: the latest in logs/eval_reports)")
+    args = ap.parse_args()
+    asyncio.run(evaluate(args.concurrency, args.resume, not args.no_cache, args.compare))
+
+
 if __name__ == "__main__":
-    asyncio.run(evaluate())
+    main()
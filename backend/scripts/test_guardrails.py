@@ -13,12 +13,9 @@ def test_guardrails():
     print("\n=== TEST 2: Retrieval Gate (Gibberish) ===")
     # Searching for something definitely not in Indian Law
     res2 = rag.query("How to bake a pineapple cake in zero gravity?")
-    # This might still retrieve something due to dense vector similarity, 
-    # but the dists would be high.
-    # However, our gate only checks EMPTY results.
-    # Chromadb always returns *something* if we ask for n_results=5 unless database is empty.
-    # To test the gate properly, we'd need to mock empty return or implement distance filtering.
-    # But let's see what happens. If it returns text, the LLM should say "Not relevant".
+    # Chromadb always returns *something*, so the gate refuses on scores instead:
+    # the best dense similarity / rerank score falls under the floors fitted by calibrate_gate.py.
+    # Without backend/data/final/legali_gate.json the gate is inactive and the LLM should say "Not relevant".
     debug2 = res2.get('debug_metadata', {})
     print(f"Status: {debug2.get('status', 'N/A')}")
     print(f"Answer: {res2['answer']}")
@@ -1,35 +1,40 @@
 from backend.app.rag import LegalRAG
 import json
 
+NEGATIVE_SCENARIOS = [
+    {
+        "name": "Constitutional Validity (Opinion)",
+        "query": "Is the Bharatiya Nyaya Sanhita constitutional?",
+        "expected_behavior": "Refusal or No Info"
+    },
+    {
+        "name": "US Law (Outside Scope)",
+        "query": "What is the punishment for murder in US law?",
+        "expected_behavior": "Refusal or No Info"
+    },
+    {
+        "name": "Intent (Interpretation)",
+        "query": "Explain the legislative intent behind replacing IPC with BNS.",
+        "expected_behavior": "Refusal or No Info (Statement of Objects was stripped)"
+    },
+    {
+        "name": "Summarize without Citations",
+        "query": "Summarize the punishment for theft without using any citations.",
+        "expected_behavior": "Refusal (Validator should reject if LLM obeys user over system prompt, OR LLM injects citations anyway)"
+    },
+    {
+        "name": "Off-topic (Outside Legal Domain)",
+        "query": "How to bake a pineapple cake in zero gravity?",
+        "expected_behavior": "Refusal by the scope classifier or score gate (no LLM call)"
+    }
+]
+
 def test_negative_scenarios():
     rag = LegalRAG()
     
-    scenarios = [
-        {
-            "name": "Constitutional Validity (Opinion)",
-            "query": "Is the Bharatiya Nyaya Sanhita constitutional?",
-            "expected_behavior": "Refusal or No Info"
-        },
-        {
-            "name": "US Law (Outside Scope)",
-            "query": "What is the punishment for murder in US law?",
-            "expected_behavior": "Refusal or No Info"
-        },
-        {
-            "name": "Intent (Interpretation)",
-            "query": "Explain the legislative intent behind replacing IPC with BNS.",
-            "expected_behavior": "Refusal or No Info (Statement of Objects was stripped)"
-        },
-        {
-            "name": "Summarize without Citations",
-            "query": "Summarize the punishment for theft without using any citations.",
-            "expected_behavior": "Refusal (Validator should reject if LLM obeys user over system prompt, OR LLM injects citations anyway)"
-        }
-    ]
-    
     print("\n=== STARTING NEGATIVE TESTING ===\n")
     
-    for scenario in scenarios:
+    for scenario in NEGATIVE_SCENARIOS:
         print(f"--- Scenario: {scenario['name']} ---")
         print(f"Query: {scenario['query']}")
         
@@ -49,7 +54,13 @@ def test_negative_scenarios():
              # Validator rejection is a PASS for negative tests
              is_safe = True
         elif result.get("answer") == "The provided legal material does not contain information to answer this question.":
-             outcome = "GATE: Blocked by No Retrieval"
+             status = result.get("debug_metadata", {}).get("status", "")
+             if status.startswith("BLOCKED_BY_SCOPE_CLASSIFIER"):
+                 outcome = "GATE: Blocked by Scope Classifier"
+             elif status.startswith("BLOCKED_BY_GATE_LOW_SCORE"):
+                 outcome = "GATE: Blocked by Score Threshold"
+             else:
+                 outcome = "GATE: Blocked by No Retrieval"
              is_safe = True
         elif "does not contain information" in result.get("answer", ""):
              outcome = "LLM/GATE: Refusal Message"
@@ -0,0 +1,85 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure backend imports work
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from backend.app.scope_classifier import (
+    MIN_PRECISION,
+    ScopeClassifier,
+    cross_val_probabilities,
+    pick_threshold,
+    precision_recall,
+    train_logistic,
+)
+
+DATASET_FILE = ROOT_DIR / "backend" / "tests" / "scope_dataset.json"
+OUTPUT_FILE = ROOT_DIR / "backend" / "data" / "final" / "legali_scope.json"
+EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+
+def train(dataset=DATASET_FILE, output=OUTPUT_FILE, min_precision=MIN_PRECISION, folds=5):
+    from sentence_transformers import SentenceTransformer
+
+    with open(dataset, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    questions = [item["question"] for item in items]
+    y = np.array([0 if item["in_scope"] else 1 for item in items])
+    print(f"Loaded {len(items)} questions ({int(y.sum())} out-of-scope) from {dataset}")
+
+    # Same vectors the pipeline computes for the raw question
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    X = model.encode([f"{QUERY_INSTRUCTION}{q}" for q in questions], normalize_embeddings=True)
+
+    # Held-out report: threshold and precision/recall from out-of-fold probabilities
+    probs = cross_val_probabilities(X, y, folds=folds)
+    threshold = pick_threshold(probs, y, min_precision)
+    precision, recall = precision_recall(probs, y, threshold)
+    false_refusals = [q for q, p, label in zip(questions, probs, y) if p >= threshold and not label]
+    missed = [q for q, p, label in zip(questions, probs, y) if p < threshold and label]
+
+    print(f"\n=== {folds}-fold Cross-Validation (out-of-scope class) ===")
+    print(f"Threshold: {threshold:.3f} (min precision {min_precision})")
+    print(f"Precision: {precision:.3f} | Recall: {recall:.3f}")
+    print(f"In-scope questions refused: {len(false_refusals)}")
+    for q in false_refusals:
+        print(f"  ! {q}")
+    print(f"Out-of-scope questions passed to the router: {len(missed)}")
+    for q in missed:
+        print(f"  - {q}")
+
+    # Final model on every example
+    weights, bias = train_logistic(X, y)
+    classifier = ScopeClassifier(weights, bias, threshold)
+    start = time.perf_counter()
+    for vec in X:
+        classifier.probability(vec)
+    per_query_ms = (time.perf_counter() - start) * 1000 / len(X)
+    print(f"\nScoring cost: {per_query_ms:.4f} ms/query")
+
+    classifier.save(output, report={
+        "examples": len(items),
+        "out_of_scope": int(y.sum()),
+        "folds": folds,
+        "precision": precision,
+        "recall": recall,
+        "false_refusals": false_refusals,
+    })
+    print(f"Saved classifier to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the out-of-scope query classifier")
+    parser.add_argument("--dataset", type=Path, default=DATASET_FILE)
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    parser.add_argument("--min-precision", type=float, default=MIN_PRECISION)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+    train(args.dataset, args.output, args.min_precision, args.folds)
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import `backend.app.*`; make the repository root importable wherever pytest is started from
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
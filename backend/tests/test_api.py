@@ -86,3 +86,103 @@ def test_query_rag_exception():
     response = client.post("/query", json={"query": "test"})
     assert response.status_code == 500
     assert response.json()["detail"] == "Catastrophic failure"
+
+def test_chat_batch_streams_ndjson():
+    import json
+    import app.api
+    mock_instance = app.api.rag
+
+    async def fake_batch_query(questions, top_k=5, concurrency=4):
+        for i, q in reversed(list(enumerate(questions))):
+            yield {"index": i, "question": q, "answer": f"A{i}", "citations": []}
+
+    mock_instance.batch_query = fake_batch_query
+
+    response = client.post("/chat/batch", json={"questions": ["q0", "q1"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(r["index"] for r in lines) == [0, 1]
+    assert {r["question"]: r["answer"] for r in lines} == {"q0": "A0", "q1": "A1"}
+
+def test_chat_batch_rejects_empty():
+    response = client.post("/chat/batch", json={"questions": []})
+    assert response.status_code == 400
+
+def test_search_returns_hits_with_cache_headers():
+    import app.api
+    mock_instance = app.api.rag
+    mock_instance.corpus_digest = "digest-v1"
+    mock_instance.search.reset_mock()
+    mock_instance.search.return_value = [
+        {"id": "BNS-103-1", "score": 7.5, "act": "BNS", "section": "103", "text": "Murder..."}
+    ]
+
+    response = client.get("/search", params={"q": "punishment for murder", "act": "BNS", "k": 3})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["id"] == "BNS-103-1"
+    assert "max-age" in response.headers["cache-control"]
+    mock_instance.search.assert_called_once_with("punishment for murder", act="BNS", k=3)
+
+    etag = response.headers["etag"]
+    cached = client.get(
+        "/search",
+        params={"q": "punishment for murder", "act": "BNS", "k": 3},
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert mock_instance.search.call_count == 1
+
+    mock_instance.corpus_digest = "digest-v2"
+    refreshed = client.get("/search", params={"q": "punishment for murder", "act": "BNS", "k": 3})
+    assert refreshed.headers["etag"] != etag
+
+def test_section_neighbours():
+    import app.api
+    mock_instance = app.api.rag
+    mock_instance.section_neighbours.reset_mock()
+    mock_instance.section_neighbours.return_value = {
+        "act": "BNS", "section": "66",
+        "references": [{"act": "BNS", "section": "64", "title": "Punishment for rape"}],
+        "referenced_by": [],
+    }
+
+    response = client.get("/sections/bns/66/neighbours")
+    assert response.status_code == 200
+    assert response.json()["references"][0]["section"] == "64"
+    mock_instance.section_neighbours.assert_called_once_with("BNS", "66")
+
+    mock_instance.section_neighbours.return_value = None
+    assert client.get("/sections/BNS/9999/neighbours").status_code == 404
+
+def test_correspondence_lookup_without_models():
+    import app.api
+    from backend.app.correspondence import CorrespondenceTable
+    mock_instance = app.api.rag
+    mock_instance.correspondence = CorrespondenceTable(
+        {"IPC": {"name": "Indian Penal Code, 1860", "act": "BNS"}},
+        {"IPC": {"302": [{"section": "103", "title": "Punishment for murder."}]}},
+    )
+    mock_instance.retrieve_batch.reset_mock()
+
+    response = client.get("/correspondence/ipc/302")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["code"] == "IPC"
+    assert data["targets"][0]["act"] == "BNS"
+    assert data["targets"][0]["section"] == "103"
+    mock_instance.retrieve_batch.assert_not_called()
+
+    assert client.get("/correspondence/IPC/9999").status_code == 404
+    assert client.get("/correspondence/XYZ/1").status_code == 404
+
+def test_metrics_exposes_stage_histograms():
+    from backend.app.tracing import span
+    with span("rerank"):
+        pass
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE legali_stage_seconds histogram" in response.text
+    assert 'legali_stage_seconds_bucket{stage="rerank",le="+Inf"}' in response.text
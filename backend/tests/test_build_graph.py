@@ -0,0 +1,86 @@
+import sys
+
+import pytest
+
+from backend.app.build_graph import BLOCKED, BUILT, FAILED, FRESH, UNAVAILABLE, BuildGraph, Stage
+
+# upper-cases the first line of argv[1] into argv[2] and appends a line to argv[3] as a run log
+COPY = (
+    "import sys; src, dst, log = sys.argv[1:4]; "
+    "open(dst, 'w').write(open(src).read().splitlines()[0].upper()); "
+    "open(log, 'a').write(dst + '\\n')"
+)
+
+
+def copy_stage(name, src, dst):
+    return Stage(name, [sys.executable, "-c", COPY, src, dst, "runs.log"], inputs=[src], outputs=[dst])
+
+
+def make_graph(tmp_path):
+    if not (tmp_path / "a.txt").exists():
+        (tmp_path / "a.txt").write_text("hello\nworld")
+    stages = [
+        copy_stage("first", "a.txt", "b.txt"),
+        copy_stage("second", "b.txt", "c.txt"),
+        copy_stage("other", "a.txt", "d.txt"),
+    ]
+    return BuildGraph(stages, tmp_path)
+
+
+def runs(tmp_path):
+    log = tmp_path / "runs.log"
+    runs = log.read_text().split() if log.exists() else []
+    log.unlink(missing_ok=True)
+    return sorted(runs)
+
+
+def test_builds_then_skips_fresh_stages(tmp_path):
+    graph = make_graph(tmp_path)
+    assert graph.deps == {"first": [], "second": ["first"], "other": []}
+    assert graph.run(log=lambda _: None) == {"first": BUILT, "other": BUILT, "second": BUILT}
+    assert (tmp_path / "c.txt").read_text() == "HELLO"
+    assert (tmp_path / "first.manifest.json").exists()
+    runs(tmp_path)
+
+    states = make_graph(tmp_path).run(log=lambda _: None)
+    assert set(states.values()) == {FRESH}
+    assert runs(tmp_path) == []
+
+
+def test_unchanged_intermediate_output_stops_the_cascade(tmp_path):
+    make_graph(tmp_path).run(log=lambda _: None)
+    runs(tmp_path)
+
+    # Second line is ignored by the stage, so b.txt comes out identical
+    (tmp_path / "a.txt").write_text("hello\nchanged")
+    states = make_graph(tmp_path).run(log=lambda _: None)
+    assert states == {"first": BUILT, "other": BUILT, "second": FRESH}
+    assert runs(tmp_path) == ["b.txt", "d.txt"]
+
+
+def test_modified_output_and_targets(tmp_path):
+    make_graph(tmp_path).run(log=lambda _: None)
+    runs(tmp_path)
+
+    (tmp_path / "c.txt").write_text("edited by hand")
+    states = make_graph(tmp_path).run(["second"], log=lambda _: None)
+    assert states == {"first": FRESH, "second": BUILT}
+    assert (tmp_path / "c.txt").read_text() == "HELLO"
+
+
+def test_failure_blocks_dependents_and_missing_inputs_are_unavailable(tmp_path):
+    (tmp_path / "a.txt").write_text("x")
+    stages = [
+        Stage("broken", [sys.executable, "-c", "raise SystemExit(3)"], inputs=["a.txt"], outputs=["b.txt"]),
+        copy_stage("after", "b.txt", "c.txt"),
+        copy_stage("no_source", "missing.txt", "e.txt"),
+    ]
+    states = BuildGraph(stages, tmp_path).run(log=lambda _: None)
+    assert states == {"broken": FAILED, "after": BLOCKED, "no_source": UNAVAILABLE}
+
+
+def test_cycles_and_duplicate_outputs_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        BuildGraph([copy_stage("x", "a", "b"), copy_stage("y", "b", "a")], tmp_path)
+    with pytest.raises(ValueError):
+        BuildGraph([copy_stage("x", "a", "b"), copy_stage("y", "c", "b")], tmp_path)
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from backend.app.correspondence import (
+    CorrespondenceTable,
+    find_citations,
+    is_section_lookup,
+    titles_match,
+)
+
+SHIPPED_TABLE = Path(__file__).resolve().parents[1] / "data" / "final" / "legali_correspondence.json"
+
+
+def make_table():
+    return CorrespondenceTable(
+        {
+            "IPC": {"name": "Indian Penal Code, 1860", "act": "BNS"},
+            "CRPC": {"name": "Code of Criminal Procedure, 1973", "act": "BNSS"},
+        },
+        {
+            "IPC": {
+                "302": [{"section": "103", "title": "Punishment for murder."}],
+                "420": [{"section": "318", "subsection": "(4)", "title": "Cheating."}],
+                "498A": [
+                    {"section": "85", "title": "Husband or relative of husband of a woman subjecting her to cruelty."},
+                    {"section": "86", "title": "Cruelty defined."},
+                ],
+            },
+            "CRPC": {"438": [{"section": "482", "title": "Direction for grant of bail to person apprehending arrest"}]},
+        },
+    )
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Section 302 IPC", [("IPC", "302")]),
+    ("what is s. 438 of the CrPC?", [("CRPC", "438")]),
+    ("u/s 482 Cr.P.C.", [("CRPC", "482")]),
+    ("IPC 420 punishment", [("IPC", "420")]),
+    ("498a IPC", [("IPC", "498A")]),
+    ("65B Evidence Act certificate", [("IEA", "65B")]),
+    ("section 103 of the Bharatiya Nyaya Sanhita", [("BNS", "103")]),
+    ("difference between IPC section 498A and BNSS 173", [("IPC", "498A"), ("BNSS", "173")]),
+    ("Section 302", []),
+])
+def test_find_citations(text, expected):
+    assert [(code, num) for code, num, _, _ in find_citations(text)] == expected
+
+
+def test_resolve_rewrites_legacy_citations():
+    table = make_table()
+    rewritten, sections, notes = table.resolve("punishment under Section 302 IPC and BNS 64")
+    assert rewritten == "punishment under BNS section 103 (formerly IPC section 302) and BNS 64"
+    assert sections == [("BNS", "103"), ("BNS", "64")]
+    assert notes == ["IPC section 302 corresponds to BNS section 103 (Punishment for murder.)"]
+
+    _, sections, _ = table.resolve("IPC 498A")
+    assert sections == [("BNS", "85"), ("BNS", "86")]
+    rewritten, _, _ = table.resolve("is 420 IPC bailable")
+    assert rewritten == "is BNS section 318(4) (formerly IPC section 420) bailable"
+    # Unknown legacy sections are left alone
+    assert table.resolve("IPC 9999") == ("IPC 9999", [], [])
+
+
+def test_verify_follows_corpus_numbering_drift():
+    table = make_table()
+    titles = {
+        ("BNS", "103"): "Punishment for murder.",
+        ("BNS", "318"): "Cheating.",
+        ("BNS", "85"): "Husband or relative of husband of a woman subjecting her to cruelty.",
+        ("BNS", "86"): "Cruelty defined.",
+        # Corpus parser drift: the provision sits two numbers later
+        ("BNSS", "482"): "When bail may be taken in case of non-bailable offence",
+        ("BNSS", "484"): "Direction for grant of bail to person apprehending arrest",
+        ("BNSS", "5"): "Saving",
+    }
+    issues = table.verify(titles)
+    assert issues == ["CRPC 438 -> BNSS 482: found in corpus as BNSS 484"]
+
+    [target] = table.lookup("crpc", "438")
+    assert (target["section"], target["corpus_section"]) == ("482", "484")
+    assert table.resolve("section 438 CrPC")[1] == [("BNSS", "484")]
+
+
+def test_titles_match_tolerates_formatting_but_not_stubs():
+    assert titles_match("Admissibility of electronic records.", "63. Admissibility of electronic records.")
+    assert titles_match("When police may arrest without warrant", "When policemay arrest without warrant")
+    assert not titles_match("Saving of inherent powers of High Court", "Saving")
+
+
+def test_is_section_lookup():
+    assert is_section_lookup("Section 302 IPC")
+    assert is_section_lookup("What is section 438 of the CrPC?")
+    assert not is_section_lookup("is section 302 IPC bailable for a first offender")
+
+
+def test_shipped_table_covers_headline_sections():
+    table = CorrespondenceTable.load(SHIPPED_TABLE)
+    assert len(table) > 0
+    assert [(t["act"], t["section"]) for t in table.lookup("IPC", "302")] == [("BNS", "103")]
+    assert [(t["act"], t["section"]) for t in table.lookup("IPC", "498A")] == [("BNS", "85"), ("BNS", "86")]
+    assert [(t["act"], t["section"], t["subsection"]) for t in table.lookup("IPC", "420")] == [("BNS", "318", "(4)")]
+    assert [(t["act"], t["section"]) for t in table.lookup("CRPC", "154")] == [("BNSS", "173")]
+    assert [(t["act"], t["section"]) for t in table.lookup("IEA", "65B")] == [("BSA", "63")]
+    for code, sections in table.sections.items():
+        for targets in sections.values():
+            assert targets and all(t["section"] and t["title"] for t in targets)
@@ -0,0 +1,36 @@
+try:
+    from app.create_chunks import MAX_TOKENS, build_chunks, count_tokens, merge_chunks, recursive_split
+except ImportError:
+    from backend.app.create_chunks import MAX_TOKENS, build_chunks, count_tokens, merge_chunks, recursive_split
+
+
+def test_merge_chunks_respects_limit_and_keeps_order():
+    atoms = ["a" * 1000, "b" * 1000, "c" * 1000, "d" * 10]
+    chunks = merge_chunks(atoms)
+    assert chunks == ["a" * 1000 + "\n" + "b" * 1000, "c" * 1000 + "\n" + "d" * 10]
+    assert all(count_tokens(c) <= MAX_TOKENS for c in chunks)
+
+
+def test_oversized_atom_is_kept_whole():
+    assert merge_chunks(["x" * 5000, "y"]) == ["x" * 5000, "y"]
+
+
+def test_sentence_level_split_is_remerged():
+    # One long line, no sub-structure markers: only Level 3 (sentences) can split it
+    text = " ".join(f"Sentence number {i} ends here." for i in range(400))
+    atoms = recursive_split(text)
+    assert len(atoms) > 1
+    assert all(count_tokens(a) <= MAX_TOKENS for a in atoms)
+    # Packed up to the target size, not one atom per sentence
+    assert len(atoms) < 10
+    assert " ".join(atoms) == text
+
+
+def test_build_chunks_ids_are_unique_for_repeated_sections():
+    corpus = [
+        {"act": "BNS", "number": 63, "chapter": "V", "title": "Rape.", "text": "First part."},
+        {"act": "BNS", "number": 63, "chapter": "V", "title": "Rape.", "text": "Second part."},
+    ]
+    chunks = build_chunks(corpus)
+    assert [c["id"] for c in chunks] == ["BNS-63-1", "BNS-63-2"]
+    assert chunks[1]["text"].startswith("ACT: BNS | SECTION: 63 - Rape.\n")
@@ -0,0 +1,94 @@
+from backend.app.definitions import DefinitionIndex, TermMatcher, build_definitions, format_definition, parse_definitions
+
+BNS_2 = {
+    "act": "BNS", "number": 2, "title": "Definitions.",
+    "text": (
+        "– In this Sanhita, unless the context otherwise requires,–– (1) “act” denotes as well a series of acts "
+        "as a single act; (3) “child” means any person below the age of eighteen years; (4) “counterfeit”.––A "
+        "person is said to “counterfeit” who causes one thing to resemble another thing; (a) A writing is a document."
+    ),
+}
+BNSS_2 = {
+    "act": "BNSS", "number": 2, "title": "Definitions",
+    "text": (
+        '(b) "bailable offence" means an offence which is shown as bailable in the First Schedule; and '
+        '"non-bailable offence" means any other offence; (c) "charge" includes any head of charge'
+    ),
+}
+BNS_86 = {
+    "act": "BNS", "number": 86, "title": "Cruelty defined.",
+    "text": "For the purposes of section 85, “cruelty” means— (a) any wilful conduct",
+}
+BNSS_2_MORE = {
+    "act": "BNSS", "number": 2, "title": "Definitions",
+    "text": (
+        '(h) "complaint" means any allegation made orally or in writing to a Magistrate; '
+        '(j) "court" means a Criminal Court; (u) "person" includes any company; '
+        '(y) "woman" means a female human being of any age; (z) "life" denotes the life of a human being'
+    ),
+}
+NOT_DEFINITIONS = {"act": "BNS", "number": 103, "title": "Punishment for murder.", "text": "“murder” means ..."}
+
+
+def test_parse_clause_structured_section():
+    entries = parse_definitions(BNS_2)
+    assert [(e["term"], e["clause"]) for e in entries] == [("act", "1"), ("child", "3"), ("counterfeit", "4")]
+    child = entries[1]
+    assert child["text"].startswith("(3) “child” means any person below the age of eighteen years")
+    assert "counterfeit" not in child["text"]
+    # Unquoted illustrations like "(a) A writing" do not start a clause
+    assert entries[2]["text"].endswith("(a) A writing is a document.")
+
+
+def test_parse_secondary_terms_and_defined_sections():
+    entries = parse_definitions(BNSS_2)
+    assert [(e["term"], e["clause"]) for e in entries] == [
+        ("bailable offence", "b"), ("non-bailable offence", "b"), ("charge", "c")
+    ]
+    assert [(e["term"], e["section"], e["clause"]) for e in parse_definitions(BNS_86)] == [("cruelty", "86", None)]
+    assert parse_definitions(NOT_DEFINITIONS) == []
+
+
+def test_matcher_finds_overlapping_terms_on_word_boundaries():
+    matcher = TermMatcher(["offence", "bailable offence", "non-bailable offence", "he", "child"])
+    found = [term for _, _, term in matcher.find("is a non-bailable offence worse than a bailable offence for children")]
+    # Longest leftmost wins; "he" inside "than"/"the" and "child" inside "children" are not words
+    assert found == ["non-bailable offence", "bailable offence"]
+    assert matcher.find("") == []
+
+
+def test_index_resolves_aliases_and_requires_cues_for_single_words():
+    data = build_definitions([BNS_2, BNSS_2, BNS_86])
+    index = DefinitionIndex(data["terms"], data["aliases"])
+
+    [child] = index.match("What is the definition of a minor?")
+    assert (child["act"], child["section"], child["clause"], child["term"]) == ("BNS", "2", "3", "child")
+    assert format_definition(child).startswith("BNS section 2(3): (3) “child” means")
+
+    # Single word without a definitional cue: no injection; multi-word terms always match
+    assert index.match("punishment for cruelty by husband") == []
+    assert [e["term"] for e in index.match("is theft a non-bailable offence")] == ["non-bailable offence"]
+    assert [e["term"] for e in index.match("meaning of cruelty")] == ["cruelty"]
+    assert index.match("what is a charge", act="BNS") == []
+    assert len(index.match("define act, child, charge and cruelty", limit=2)) == 2
+
+
+def test_everyday_questions_do_not_inject_single_word_definitions():
+    data = build_definitions([BNSS_2_MORE])
+    index = DefinitionIndex(data["terms"], data["aliases"])
+
+    assert index.match("what is the punishment for a person who commits theft in a dwelling house") == []
+    assert index.match("What is the procedure when police arrest a woman at night?") == []
+    assert index.match("what is the time limit for filing a complaint in court") == []
+    assert index.match("what is the punishment for murder, imprisonment for life?") == []
+
+    assert [e["term"] for e in index.match("What is a complaint?")] == ["complaint"]
+    assert [e["term"] for e in index.match("who is a person under the BNSS")] == ["person"]
+    assert [e["term"] for e in index.match("what does woman mean")] == ["woman"]
+    assert [e["term"] for e in index.match("define the court and a complaint")] == ["complaint", "court"]
+
+
+def test_empty_index(tmp_path):
+    index = DefinitionIndex.load(tmp_path / "missing.json")
+    assert len(index) == 0
+    assert index.match("what is a child") == []
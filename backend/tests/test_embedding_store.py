@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+
+try:
+    from app.embedding_store import convert_json_cache, find_stores, load_embeddings, save_embeddings
+except ImportError:
+    from backend.app.embedding_store import convert_json_cache, find_stores, load_embeddings, save_embeddings
+
+
+def _unit_vectors(n, dim, seed=0):
+    vecs = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def test_save_and_mmap_load_roundtrip(tmp_path):
+    ids = ["BNS-1-1", "BNS-2-1", "BSA-3-1"]
+    vecs = _unit_vectors(3, 8)
+    save_embeddings(tmp_path / "vectors", ids, vecs, model="test-model")
+
+    store = load_embeddings(tmp_path / "vectors")
+    assert isinstance(store.matrix, np.memmap)
+    assert store.matrix.dtype == np.float16
+    assert (store.model, store.dim, store.normalized) == ("test-model", 8, True)
+    assert "BNS-2-1" in store and "BNS-9-1" not in store
+    np.testing.assert_allclose(store.get("BNS-2-1"), vecs[1], atol=1e-3)
+    assert store.rows(["BSA-3-1", "BNS-1-1"]).shape == (2, 8)
+    assert find_stores(tmp_path) == [tmp_path / "vectors"]
+
+
+def test_convert_legacy_json_cache(tmp_path):
+    vecs = _unit_vectors(2, 4, seed=1)
+    legacy = {
+        "meta": {"model": "BAAI/bge-base-en-v1.5", "dim": 4, "count": 2},
+        "data": [{"id": "a", "vector": vecs[0].tolist()}, {"id": "b", "vector": vecs[1].tolist()}],
+    }
+    json_path = tmp_path / "legali_vectors_v2.json"
+    json_path.write_text(json.dumps(legacy), encoding="utf-8")
+
+    paths = convert_json_cache(json_path, dtype="float32")
+    assert paths["matrix"].name == "legali_vectors_v2.npy"
+
+    store = load_embeddings(json_path)
+    assert store.ids == ["a", "b"]
+    assert store.model == "BAAI/bge-base-en-v1.5"
+    np.testing.assert_allclose(store.get("b"), vecs[1], rtol=1e-6)
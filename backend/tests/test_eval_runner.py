@@ -0,0 +1,73 @@
+import pytest
+
+from backend.app.eval_runner import (
+    JudgeCache,
+    PartialRun,
+    aggregate,
+    diff_reports,
+    judge_key,
+    latest_report,
+    parse_scores,
+)
+
+
+def test_judge_key_depends_on_question_answer_and_model():
+    key = judge_key("q", "answer", "judge-a")
+    assert key == judge_key("q", "answer", "judge-a")
+    assert key != judge_key("q", "answer!", "judge-a")
+    assert key != judge_key("q", "answer", "judge-b")
+    assert key != judge_key("q2", "answer", "judge-a")
+
+
+def test_parse_scores_strips_fences():
+    content = 'Sure:\n```json\n{"faithfulness": 1, "relevance": 0.0}\n```'
+    assert parse_scores(content) == {"faithfulness": 1.0, "relevance": 0.0, "retrieval_success": 0.0}
+    with pytest.raises(ValueError):
+        parse_scores("no verdict")
+
+
+def test_judge_cache_round_trip(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = JudgeCache.load(path)
+    assert cache.get("q", "a", "m") is None
+    cache.put("q", "a", "m", {"faithfulness": 1.0})
+    cache.save()
+
+    reloaded = JudgeCache.load(path)
+    assert reloaded.get("q", "a", "m") == {"faithfulness": 1.0}
+    assert reloaded.get("q", "changed", "m") is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+def test_partial_run_skips_truncated_lines(tmp_path):
+    journal = PartialRun(tmp_path / "partial.jsonl")
+    journal.append({"question": "q1", "faithfulness": 1.0})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"question": "q2", "faith')
+    assert list(journal.load()) == ["q1"]
+    journal.clear()
+    assert journal.load() == {}
+
+
+def test_aggregate_counts_missing_questions_as_zero():
+    results = [{"faithfulness": 1.0, "relevance": 1.0, "retrieval_success": 0.0}]
+    assert aggregate(results, 2) == {"faithfulness": 0.5, "relevance": 0.5, "retrieval_success": 0.0}
+
+
+def test_diff_reports_and_latest(tmp_path):
+    def report(faith, details):
+        return {"aggregate_scores": {"faithfulness": faith, "relevance": 1.0, "retrieval_success": 1.0},
+                "details": details}
+
+    row = {"faithfulness": 1.0, "relevance": 1.0, "retrieval_success": 1.0}
+    previous = report(1.0, [dict(row, question="a"), dict(row, question="gone")])
+    current = report(0.5, [dict(row, question="a", faithfulness=0.0), dict(row, question="new")])
+    lines = diff_reports(current, previous)
+    assert lines[0] == "faithfulness: 100.00% -> 50.00% (-50.00)"
+    assert "~ a: faithfulness 1.0 -> 0.0" in lines
+    assert "+ new" in lines and "- gone" in lines
+
+    assert latest_report(tmp_path) is None
+    (tmp_path / "eval_report_20250101_000000.json").write_text("{}")
+    (tmp_path / "eval_report_20250301_000000.json").write_text("{}")
+    assert latest_report(tmp_path).name == "eval_report_20250301_000000.json"
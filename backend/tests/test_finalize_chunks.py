@@ -0,0 +1,51 @@
+import io
+import json
+import unicodedata
+
+from backend.app.finalize_chunks import clean_text, is_control_char, iter_cleaned, write_json_array
+
+
+def reference_clean(text):
+    text = unicodedata.normalize('NFKC', text)
+    text = "".join(
+        c for c in text
+        if c in ('\n', '\t', '\r') or not unicodedata.category(c).startswith("C")
+    )
+    return text
+
+
+def test_control_chars_removed_but_whitespace_kept():
+    assert is_control_char("\x00")
+    assert is_control_char("​")  # zero-width space (Cf)
+    assert not is_control_char("\n")
+    assert not is_control_char("\t")
+    assert not is_control_char("a")
+    assert clean_text("a\x00b\tc​d\n") == "ab\tcd"
+
+
+def test_translate_table_matches_per_char_category():
+    text = "".join(chr(cp) for cp in range(0, 0x3000))
+    assert clean_text("x" + text + "x") == reference_clean("x" + text + "x").strip()
+
+
+def test_page_lines_and_arrangement_headings_removed():
+    text = "ARRANGEMENT OF SECTIONS\n(1) Whoever commits murder\n  Page 12 \nshall be punished."
+    assert clean_text(text) == "(1) Whoever commits murder\n\nshall be punished."
+    assert clean_text("ARRANGEMENT OF ARRANGEMENT OF SECTIONSCLAUSES body") == "body"
+
+
+def test_nfkc_normalization():
+    assert clean_text("ﬁle ①") == "file 1"
+
+
+def test_iter_cleaned_keeps_order():
+    chunks = [{"id": str(i), "text": f" Page 1\n{i}\x07 "} for i in range(10)]
+    assert [c["text"] for c in iter_cleaned(chunks, workers=1)] == [str(i) for i in range(10)]
+
+
+def test_write_json_array_matches_json_dump():
+    items = [{"id": "BNS-1-1", "text": "एक\n\"quoted\""}, {"id": "BNS-2-1", "nested": {"a": [1, 2]}}]
+    for payload in (items, items[:1], []):
+        streamed = io.StringIO()
+        assert write_json_array(iter(payload), streamed) == len(payload)
+        assert streamed.getvalue() == json.dumps(payload, indent=2, ensure_ascii=False)
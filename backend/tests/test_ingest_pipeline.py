@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.app import ingest_pipeline
+from backend.app.ingest_pipeline import run_pipeline, split_sections
+
+PAGES = {
+    "bns.pdf": ["Preamble text. Section 1 Short title.", "More of one. Section 2 Definitions.", "Section 3 General."],
+    "bsa.pdf": ["Section 1 Evidence. Section 2 Interpretation."],
+}
+
+
+class FakeEmbedder:
+    def encode(self, texts, normalize_embeddings=True):
+        return np.ones((len(texts), 3))
+
+
+class FakeCollection:
+    def __init__(self):
+        self.ids = []
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        self.ids.extend(ids)
+
+
+def _documents(tmp_path, names):
+    return [
+        {"pdf_path": tmp_path / name, "act": name[:-4].upper(), "output_json_path": tmp_path / f"{name[:-4]}_ready_v2.json"}
+        for name in names
+    ]
+
+
+def _fake_pages(fail_on=None):
+    def iter_pages(pdf_path):
+        for i, text in enumerate(PAGES[pdf_path.name]):
+            if (pdf_path.name, i) == fail_on:
+                raise RuntimeError("extraction failed")
+            yield i, text
+    return iter_pages
+
+
+def test_split_sections_across_pages():
+    doc = {"act": "BNS"}
+    pages = [{"doc": doc, "text": t} for t in PAGES["bns.pdf"]] + [{"doc": doc, "end": True}]
+    texts = [item["text"].strip() for item in split_sections(pages) if not item.get("end")]
+    assert texts == [
+        "Preamble text.",
+        "Section 1 Short title.\nMore of one.",
+        "Section 2 Definitions.",
+        "Section 3 General.",
+    ]
+
+
+def test_run_pipeline_writes_ready_json_and_upserts(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_pipeline, "iter_pages", _fake_pages())
+    collection = FakeCollection()
+    docs = _documents(tmp_path, ["bns.pdf", "bsa.pdf"])
+    run_pipeline(docs, FakeEmbedder(), collection)
+
+    with open(docs[0]["output_json_path"], "r", encoding="utf-8") as f:
+        bns = json.load(f)
+    assert [c["number"] for c in bns] == ["Unknown", "1", "2", "3"]
+    assert [c["id"] for c in bns] == [f"BNS-CHUNK-{i}" for i in range(1, 5)]
+    assert len(collection.ids) == len(bns) + 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_interrupted_document_leaves_no_json(tmp_path, monkeypatch):
+    # BSA completes; BNS fails on its last page, after earlier chunks reached its temp file
+    monkeypatch.setattr(ingest_pipeline, "iter_pages", _fake_pages(fail_on=("bns.pdf", 2)))
+    docs = _documents(tmp_path, ["bsa.pdf", "bns.pdf"])
+    with pytest.raises(RuntimeError, match="extraction failed"):
+        run_pipeline(docs, FakeEmbedder(), FakeCollection())
+
+    assert docs[0]["output_json_path"].exists()
+    assert not docs[1]["output_json_path"].exists()
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,156 @@
+import numpy as np
+
+from backend.app.ingest_sync import chunk_metadata, content_hash, diff_chunks, sync_collection
+
+MODEL = "test-model"
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.ones((len(texts), 3))
+
+
+class FakeCollection:
+    """Minimal Chroma collection: {id: (document, metadata, embedding)} plus a log of writes."""
+
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})
+        self.writes = []
+
+    def get(self, ids=None, include=None, limit=None, offset=0):
+        keys = ids if ids is not None else sorted(self.rows)[offset:offset + limit]
+        keys = [cid for cid in keys if cid in self.rows]
+        return {
+            "ids": keys,
+            "documents": [self.rows[cid][0] for cid in keys],
+            "metadatas": [self.rows[cid][1] for cid in keys],
+        }
+
+    def delete(self, ids):
+        self.writes.append(("delete", list(ids)))
+        for cid in ids:
+            del self.rows[cid]
+
+    def update(self, ids, metadatas):
+        self.writes.append(("update", list(ids)))
+        for cid, meta in zip(ids, metadatas):
+            doc, _, vector = self.rows[cid]
+            self.rows[cid] = (doc, meta, vector)
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.writes.append(("upsert", list(ids)))
+        for row in zip(ids, documents, metadatas, embeddings):
+            self.rows[row[0]] = row[1:]
+
+    def count(self):
+        return len(self.rows)
+
+
+def _chunk(cid, text, number="1"):
+    return {"id": cid, "act": "BNS", "chapter": "I", "number": number, "title": "T", "chunk_index": 0, "text": text}
+
+
+def _row(chunk, hashed=True):
+    meta = chunk_metadata(chunk)
+    if hashed:
+        meta["content_hash"] = content_hash(chunk["text"], meta, MODEL)
+    return (chunk["text"], meta, [0.0, 0.0, 0.0])
+
+
+def _ids(diff, key):
+    return sorted(c if isinstance(c, str) else c[0] for c in diff[key])
+
+
+def test_diff_classifies_new_changed_unchanged_and_orphaned():
+    same, edited = _chunk("a", "kept"), _chunk("b", "old text")
+    existing = {
+        "a": _row(same)[1]["content_hash"],
+        "b": _row(edited)[1]["content_hash"],
+        "gone": "h",
+    }
+    chunks = {"a": same, "b": _chunk("b", "new text"), "c": _chunk("c", "fresh")}
+
+    diff = diff_chunks(chunks, existing, MODEL)
+    assert _ids(diff, "unchanged") == ["a"]
+    assert _ids(diff, "changed") == ["b"]
+    assert _ids(diff, "new") == ["c"]
+    assert _ids(diff, "orphaned") == ["gone"]
+    assert diff["backfill"] == []
+
+
+def test_metadata_or_model_change_counts_as_changed():
+    chunk = _chunk("a", "text")
+    existing = {"a": _row(chunk)[1]["content_hash"]}
+    assert _ids(diff_chunks({"a": _chunk("a", "text", number="2")}, existing, MODEL), "changed") == ["a"]
+    assert _ids(diff_chunks({"a": chunk}, existing, "other-model"), "changed") == ["a"]
+
+
+def test_sync_deletes_orphans_and_embeds_only_new_and_changed():
+    same, edited = _chunk("a", "kept"), _chunk("b", "old text")
+    collection = FakeCollection({"a": _row(same), "b": _row(edited), "gone": _row(_chunk("gone", "x"))})
+    embedder = FakeEmbedder()
+    chunks = {"a": same, "b": _chunk("b", "new text"), "c": _chunk("c", "fresh")}
+
+    sync_collection(chunks, collection, MODEL, load_embedder=lambda: embedder, batch_size=2)
+    assert "gone" not in collection.rows
+    assert ("delete", ["gone"]) in collection.writes
+    assert sorted(collection.rows) == ["a", "b", "c"]
+    assert collection.rows["b"][0] == "new text"
+    assert [t.rsplit(": ", 1)[-1] for t in embedder.encoded] == ["new text", "fresh"]
+
+    # A second run with the same chunks writes nothing
+    collection.writes.clear()
+    diff = sync_collection(chunks, collection, MODEL, load_embedder=lambda: embedder)
+    assert collection.writes == []
+    assert _ids(diff, "unchanged") == ["a", "b", "c"]
+
+
+def test_new_chunks_reuse_cached_vectors():
+    collection = FakeCollection()
+    sync_collection(
+        {"a": _chunk("a", "text")}, collection, MODEL,
+        load_embedder=lambda: None,  # never called: the cache covers every new chunk
+        load_vector_cache=lambda: {"a": np.full(3, 0.5, dtype=np.float32)},
+    )
+    assert collection.rows["a"][2] == [0.5, 0.5, 0.5]
+
+
+def test_dry_run_writes_nothing():
+    collection = FakeCollection({"a": _row(_chunk("a", "old")), "gone": _row(_chunk("gone", "x"))})
+    diff = sync_collection(
+        {"a": _chunk("a", "new"), "c": _chunk("c", "fresh")}, collection, MODEL,
+        load_embedder=lambda: None, dry_run=True,
+    )
+    assert collection.writes == []
+    assert (_ids(diff, "changed"), _ids(diff, "new"), diff["orphaned"]) == (["a"], ["c"], ["gone"])
+
+
+def test_unhashed_rows_are_backfilled_without_reembedding():
+    kept, edited = _chunk("a", "kept"), _chunk("b", "old text")
+    collection = FakeCollection({"a": _row(kept, hashed=False), "b": _row(edited, hashed=False)})
+    embedder = FakeEmbedder()
+    chunks = {"a": kept, "b": _chunk("b", "new text")}
+
+    diff = sync_collection(chunks, collection, MODEL, load_embedder=lambda: embedder)
+    assert _ids(diff, "backfill") == ["a"]
+    assert _ids(diff, "changed") == ["b"]
+    assert ("update", ["a"]) in collection.writes
+    assert collection.rows["a"][1]["content_hash"] == content_hash("kept", chunk_metadata(kept), MODEL)
+    assert [t.rsplit(": ", 1)[-1] for t in embedder.encoded] == ["new text"]
+
+    # Once backfilled the row is plain unchanged
+    diff = sync_collection(chunks, collection, MODEL, load_embedder=lambda: embedder)
+    assert _ids(diff, "unchanged") == ["a", "b"]
+
+
+def test_force_reembeds_everything():
+    chunk = _chunk("a", "kept")
+    collection = FakeCollection({"a": _row(chunk, hashed=False)})
+    embedder = FakeEmbedder()
+    diff = sync_collection({"a": chunk}, collection, MODEL, load_embedder=lambda: embedder, force=True)
+    assert _ids(diff, "changed") == ["a"] and diff["backfill"] == []
+    assert len(embedder.encoded) == 1
@@ -0,0 +1,49 @@
+import json
+import logging
+import queue
+
+from backend.app.logging_config import JsonFormatter, TraceQueueHandler, payload_sampled
+from backend.app.tracing import start_trace
+
+
+def enqueue(handler, message, **extra):
+    logger = logging.getLogger("LEGALI.test")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.info(message, extra=extra)
+    return handler.queue.get_nowait()
+
+
+def test_payload_sampling_is_per_trace():
+    assert payload_sampled("any", rate=1.0)
+    assert not payload_sampled("any", rate=0.0)
+    assert not payload_sampled(None, rate=0.5)
+    sampled = [payload_sampled(f"trace-{i}", rate=0.25) for i in range(2000)]
+    assert 0.2 < sum(sampled) / len(sampled) < 0.3
+    assert sampled == [payload_sampled(f"trace-{i}", rate=0.25) for i in range(2000)]
+
+
+def test_queue_handler_attaches_trace_and_drops_unsampled_payloads():
+    handler = TraceQueueHandler(queue.SimpleQueue(), sample_rate=0.0)
+    with start_trace("trace-9", "query"):
+        record = enqueue(handler, "Final Response", fields={"ids": ["a"]}, payload={"response": {"answer": "x"}})
+    assert record.trace_id == "trace-9"
+    assert record.payload is None
+    assert record.fields == {"ids": ["a"], "payload_omitted": ["response"]}
+
+    handler.sample_rate = 1.0
+    record = enqueue(handler, "Final Response", trace_id="t", payload={"response": {"answer": "x"}})
+    assert record.payload == {"response": {"answer": "x"}}
+
+
+def test_json_formatter_writes_fields_and_truncates_payloads():
+    handler = TraceQueueHandler(queue.SimpleQueue(), sample_rate=1.0)
+    record = enqueue(
+        handler, "Final Response", trace_id="t", fields={"stages": {"rerank": 12.5}},
+        payload={"context_used": "x" * 50}
+    )
+    entry = json.loads(JsonFormatter(payload_max_chars=10).format(record))
+    assert (entry["msg"], entry["level"], entry["trace_id"]) == ("Final Response", "INFO", "t")
+    assert entry["stages"] == {"rerank": 12.5}
+    assert entry["context_used"] == "x" * 10 + "... [40 chars truncated]"
@@ -0,0 +1,56 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app.mock_openrouter import create_app
+
+
+def _client(**kwargs):
+    return TestClient(create_app(ttft_ms=0, token_rate=0, **kwargs))
+
+
+def test_router_prompt_gets_canned_json():
+    client = _client(router_json='{"act": "BSA", "expanded_query": "confession"}')
+    r = client.post("/api/v1/chat/completions", json={
+        "model": "m", "messages": [{"role": "user", "content": "You are a Triage Agent ..."}],
+    })
+    assert r.status_code == 200
+    body = r.json()
+    assert body["object"] == "chat.completion"
+    assert json.loads(body["choices"][0]["message"]["content"]) == {"act": "BSA", "expanded_query": "confession"}
+
+
+def test_router_echoes_the_user_query_by_default():
+    client = _client()
+    prompt = 'You are a Triage Agent ...\nAnalyze the user\'s legal query: "Is "theft" of a bicycle bailable?"\nTask 1: ...'
+    r = client.post("/chat/completions", json={"messages": [{"role": "user", "content": prompt}]})
+    reply = json.loads(r.json()["choices"][0]["message"]["content"])
+    assert reply["expanded_query"] == 'Is "theft" of a bicycle bailable?'
+
+
+def test_answer_is_json_and_max_tokens_applies():
+    client = _client()
+    r = client.post("/chat/completions", json={"messages": [{"role": "user", "content": "Murder?"}]})
+    content = r.json()["choices"][0]["message"]["content"]
+    assert "answer" in json.loads(content)
+
+    r = client.post("/chat/completions", json={"messages": [{"role": "user", "content": "Murder?"}], "max_tokens": 3})
+    assert r.json()["usage"]["completion_tokens"] == 3
+
+
+def test_streaming_chunks_end_with_done():
+    client = _client(answer="one two three")
+    with client.stream("POST", "/chat/completions", json={"stream": True, "messages": []}) as r:
+        frames = [line[6:] for line in r.iter_lines() if line.startswith("data: ")]
+    assert frames[-1] == "[DONE]"
+    chunks = [json.loads(f) for f in frames[:-1]]
+    assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+    assert "".join(c["choices"][0]["delta"].get("content", "") for c in chunks) == "one two three"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+def test_error_rate():
+    client = _client(error_rate=1.0, error_status=429)
+    r = client.post("/chat/completions", json={"messages": []})
+    assert r.status_code == 429
+    assert client.get("/stats").json() == {"requests": 1, "errors": 1, "streams": 0}
@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.app import pdf_extract
+from backend.app.pdf_extract import _contiguous_ranges, file_sha256, iter_pages
+
+
+@pytest.fixture
+def fake_pdf(tmp_path, monkeypatch):
+    """A 40-page "PDF" whose page i extracts to "<engine> page <i>"; records every extracted range."""
+    pdf = tmp_path / "act.pdf"
+    pdf.write_bytes(b"%PDF-fake")
+    calls = []
+
+    def extract_range(pdf_path, engine, start, end):
+        calls.append((engine, start, end))
+        # Later ranges finish first, so worker results arrive out of page order
+        time.sleep(0.002 * (40 - start) / 8)
+        return [f"{engine} page {i}" for i in range(start, end)]
+
+    monkeypatch.setattr(pdf_extract, "count_pages", lambda pdf_path, engine: 40)
+    monkeypatch.setattr(pdf_extract, "_extract_range", extract_range)
+    monkeypatch.setattr(pdf_extract, "ProcessPoolExecutor", ThreadPoolExecutor)
+    return pdf, calls
+
+
+def test_contiguous_ranges():
+    assert _contiguous_ranges([], 8) == []
+    assert _contiguous_ranges([0, 1, 2, 5, 6], 8) == [(0, 3), (5, 7)]
+    assert _contiguous_ranges([4], 8) == [(4, 5)]
+    assert _contiguous_ranges(list(range(10)), 4) == [(0, 4), (4, 8), (8, 10)]
+    assert _contiguous_ranges([0, 1, 2, 3, 4, 9], 2) == [(0, 2), (2, 4), (4, 5), (9, 10)]
+
+
+def test_pool_results_are_yielded_in_page_order(fake_pdf, tmp_path):
+    pdf, calls = fake_pdf
+    pages = list(iter_pages(pdf, workers=4, cache_dir=tmp_path / "cache"))
+    assert [p for p, _ in pages] == list(range(40))
+    assert [t for _, t in pages] == [f"pdfplumber page {i}" for i in range(40)]
+    assert sorted(calls) == [("pdfplumber", s, min(s + 8, 40)) for s in range(0, 40, 8)]
+
+
+def test_cache_hit_and_miss_per_engine(fake_pdf, tmp_path):
+    pdf, calls = fake_pdf
+    cache = tmp_path / "cache"
+    list(iter_pages(pdf, workers=1, cache_dir=cache))
+    doc_dir = cache / file_sha256(pdf)
+    assert (doc_dir / "pdfplumber-00039.txt").read_text(encoding="utf-8") == "pdfplumber page 39"
+    assert (doc_dir / "manifest.json").exists()
+
+    # Same engine: every page is a cache hit
+    calls.clear()
+    assert pdf_extract.extract_pages(pdf, cache_dir=cache)[7] == "pdfplumber page 7"
+    assert calls == []
+
+    # Another engine has its own cache entries
+    assert pdf_extract.extract_pages(pdf, engine="pypdf", workers=1, cache_dir=cache)[7] == "pypdf page 7"
+    assert calls and all(engine == "pypdf" for engine, _, _ in calls)
+
+
+def test_only_missing_pages_are_extracted(fake_pdf, tmp_path):
+    pdf, calls = fake_pdf
+    cache = tmp_path / "cache"
+    list(iter_pages(pdf, workers=1, cache_dir=cache))
+    doc_dir = cache / file_sha256(pdf)
+    for page in (3, 4, 20):
+        (doc_dir / f"pdfplumber-{page:05d}.txt").unlink()
+
+    calls.clear()
+    pages = list(iter_pages(pdf, workers=1, cache_dir=cache))
+    assert calls == [("pdfplumber", 3, 5), ("pdfplumber", 20, 21)]
+    assert pages[4] == (4, "pdfplumber page 4")
+
+
+def test_unknown_engine(tmp_path):
+    with pytest.raises(ValueError, match="Unknown PDF engine"):
+        list(iter_pages(tmp_path / "act.pdf", engine="ocr"))
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+
+from backend.app import profiler
+from backend.app.profiler import Profile, merge, read_collapsed, top_functions, write_collapsed
+from backend.app.tracing import span, start_trace
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_samples_attached_worker_threads(tmp_path):
+    profile = Profile("trace:1", "query", interval=0.001).start()
+
+    def work():
+        profile.attach()
+        _busy(0.05)
+
+    asyncio.run(asyncio.to_thread(work))
+    profile.stop()
+    assert profile.samples > 0
+    assert any("_busy (test_profiler.py" in stack for stack in profile.stacks)
+
+    path = profile.write(tmp_path)
+    assert path.name == "query-trace_1.collapsed"
+    assert read_collapsed(path) == profile.stacks
+
+
+def test_disabled_profiling_starts_nothing(monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_ENABLED", False)
+    token = profiler.request_profile()
+    try:
+        with start_trace("t-off", "query") as trace:
+            with span("rerank"):
+                pass
+    finally:
+        profiler.reset_profile_request(token)
+    assert trace.profile is None
+
+
+def test_requested_profile_is_written(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiler, "PROFILE_INTERVAL", 0.001)
+
+    assert not profiler.should_profile(sample_rate=0.0)
+    token = profiler.request_profile()
+    try:
+        with start_trace("t-on", "stream") as trace:
+            with span("rerank"):
+                _busy(0.03)
+    finally:
+        profiler.reset_profile_request(token)
+    assert trace.profile.samples > 0
+    assert (tmp_path / "stream-t-on.collapsed").exists()
+
+
+def test_merge_and_top_functions(tmp_path):
+    a = {"main;rag;rerank": 6, "main;rag;embed": 2}
+    b = {"main;rag;rerank": 2, "main;rag": 1}
+    merged = merge([a, b])
+    assert merged == {"main;rag;rerank": 8, "main;rag;embed": 2, "main;rag": 1}
+
+    top = top_functions(merged, 3)
+    assert top[0] == ("rerank", 8, 8)
+    assert ("rag", 1, 11) in top
+
+    path = tmp_path / "merged.collapsed"
+    write_collapsed(path, merged)
+    assert read_collapsed(path) == merged
+
+
+def test_frame_name_without_qualname():
+    class OldCode:
+        co_name = "rerank"
+        co_filename = "/srv/backend/app/rag.py"
+        co_firstlineno = 42
+
+    assert profiler._frame_name(OldCode()) == "rerank (rag.py:42)"
+
+
+def test_failing_sample_is_logged_and_sampling_continues(monkeypatch):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("LEGALI")
+    profile = Profile("trace:err", "query", interval=0.001)
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(profile, "_sample", flaky)
+    logger.addHandler(handler)
+    try:
+        profile.start()
+        time.sleep(0.05)
+        profile.stop()
+    finally:
+        logger.removeHandler(handler)
+    assert calls["n"] > 1
+    assert any(r.getMessage() == "Profiler sample failed" for r in records)
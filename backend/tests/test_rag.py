@@ -0,0 +1,114 @@
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.app.relevance_gate import RelevanceGate
+from backend.app.section_index import SectionIndex
+from backend.app.vector_index import NumpyIndex
+
+for dependency in ("dotenv", "openai", "chromadb", "sentence_transformers", "nltk"):
+    pytest.importorskip(dependency)
+
+# test_api replaces backend.app.rag in sys.modules with a mock; load the real module under its own name
+_spec = importlib.util.spec_from_file_location("legali_rag", Path(__file__).resolve().parents[1] / "app" / "rag.py")
+rag = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rag)
+
+
+# (act, number, chunk texts); every section points along its own axis
+SECTIONS = [
+    ("BNS", "103", ["Whoever commits murder shall be punished", "with death or imprisonment for life"]),
+    ("BNS", "303", ["Whoever commits theft shall be punished"]),
+    ("BSA", "63", ["Any information contained in an electronic record"]),
+]
+
+
+def make_sections(dim=4):
+    ids, vectors, docs, metadatas = [], [], [], []
+    for axis, (act, number, texts) in enumerate(SECTIONS):
+        for i, text in enumerate(texts):
+            cid = f"{act}-{number}-{i}"
+            meta = {"act": act, "section_number": number, "title": "", "chunk_index": i}
+            vector = np.full(dim, 0.01, dtype=np.float32)
+            vector[axis] = 1.0 + i
+            ids.append(cid)
+            vectors.append(vector)
+            metadatas.append(meta)
+            docs.append(SimpleNamespace(page_content=text, metadata=dict(meta, id=cid)))
+    index = NumpyIndex(ids, np.asarray(vectors), [d.page_content for d in docs], metadatas, normalized=False)
+    return index, docs
+
+
+class FakeBM25:
+    """BM25Retriever stand-in: `get_batch_scores` counts query tokens in each document."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.vectorizer = self
+
+    def preprocess_func(self, text):
+        return text.lower().split()
+
+    def get_batch_scores(self, tokens, doc_ids):
+        return [sum(t in self.preprocess_func(self.docs[d].page_content) for t in tokens) for d in doc_ids]
+
+
+class FakeReranker:
+    """Scores a (query, text) pair by how many query words the text contains."""
+
+    def __init__(self):
+        self.pairs = []
+
+    def score(self, pairs):
+        self.pairs.extend(pairs)
+        return [float(sum(w in text.split() for w in query.split())) for query, text in pairs]
+
+
+def _bare_rag(**attrs):
+    instance = object.__new__(rag.LegalRAG)
+    for name, value in attrs.items():
+        setattr(instance, name, value)
+    return instance
+
+
+def test_rescore_scores_retrieved_chunks_against_the_raw_query():
+    reranker = FakeReranker()
+    instance = _bare_rag(reranker=reranker)
+    retrieval = {
+        "ids": [["a", "b", "x"]],
+        "documents": [["theft of property", "murder", "cross reference"]],
+        "metadatas": [[{}, {}, {}]],
+        "distances": [[0.1, 0.2, None]],
+        "scores": [[9.0, 8.0, None]],
+    }
+
+    rescored = instance._rescore("theft property", retrieval)
+    assert rescored["scores"] == [[2.0, 0.0, None]]
+    assert retrieval["scores"] == [[9.0, 8.0, None]]  # the retrieval itself is not modified
+    assert [q for q, _ in reranker.pairs] == ["theft property", "theft property"]
+
+    gate = RelevanceGate(rerank_min=1.0)
+    assert gate.blocks(retrieval) is None
+    assert gate.blocks(instance._rescore("weather today", retrieval)) is not None
+
+
+def test_section_candidates_only_score_chunks_of_the_selected_sections(monkeypatch):
+    index, docs = make_sections()
+    bm25 = FakeBM25(docs)
+    instance = _bare_rag(
+        bm25_docs=docs,
+        bm25_retriever=bm25,
+        section_chunks=index,
+        sections=SectionIndex.build(index, docs, tokenizer=bm25.preprocess_func),
+    )
+    monkeypatch.setattr(rag, "SECTION_TOP_K", 1)
+
+    queries = ["punished murder", "electronic record"]
+    candidates = instance._section_candidates(queries, [[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]], fetch_k=5)
+    assert {h["id"] for h in candidates[0]} == {"BNS-103-0", "BNS-103-1"}
+    assert {h["id"] for h in candidates[1]} == {"BSA-63-0"}
+    assert all(h["fusion_score"] > 0 for hits in candidates for h in hits)
+    assert candidates[0][0]["distance"] is not None
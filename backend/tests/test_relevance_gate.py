@@ -0,0 +1,61 @@
+import json
+
+from backend.app.relevance_gate import RelevanceGate, fit_threshold, save_thresholds, top_scores
+
+
+def retrieval(distances, scores, exact=False):
+    return {
+        'ids': [[f"c{i}" for i in range(len(scores))]],
+        'documents': [["text"] * len(scores)],
+        'metadatas': [[{"act": "BNS", "exact": True} if exact and i == 0 else {"act": "BNS"} for i in range(len(scores))]],
+        'distances': [distances],
+        'scores': [scores],
+    }
+
+
+def test_top_scores_skips_missing_values():
+    dense, rerank, exact = top_scores(retrieval([None, 0.4, 0.3], [2.5, None, -1.0]))
+    assert abs(dense - 0.7) < 1e-9
+    assert (rerank, exact) == (2.5, False)
+    assert top_scores(retrieval([], [])) == (None, None, False)
+
+
+def test_fit_threshold_keeps_every_positive():
+    fit = fit_threshold([3.0, 5.0, 4.0], [-6.0, -2.0, 4.5])
+    # Halfway between the weakest positive and the strongest negative below it
+    assert fit["threshold"] == 0.5
+    assert (fit["positives_blocked"], fit["negatives_blocked"]) == (0, 2)
+
+    # No negative below the weakest positive: fall back to the margin
+    fit = fit_threshold([0.8, 0.9], [0.85], margin=0.05)
+    assert abs(fit["threshold"] - 0.75) < 1e-9
+    assert (fit["positives_blocked"], fit["negatives_blocked"]) == (0, 0)
+
+
+def test_gate_blocks_weak_rerank_but_never_cited_sections():
+    gate = RelevanceGate(dense_min=0.6, rerank_min=0.0)
+    assert gate.enabled
+    assert gate.blocks(retrieval([0.5], [-4.2])) == "best rerank score -4.200 < 0.000"
+    assert gate.blocks(retrieval([0.5], [1.3])) is None
+    assert gate.blocks(retrieval([None, 0.5], [None, -4.2], exact=True)) is None
+
+    assert gate.blocks_dense(0.55)
+    assert not gate.blocks_dense(0.65)
+    assert not gate.blocks_dense(None)
+
+
+def test_uncalibrated_gate_is_inactive(tmp_path):
+    gate = RelevanceGate.load(tmp_path / "missing.json")
+    assert not gate.enabled
+    assert gate.blocks(retrieval([0.9], [-11.0])) is None
+    assert not gate.blocks_dense(0.0)
+
+
+def test_saved_thresholds_round_trip(tmp_path):
+    path = tmp_path / "gate.json"
+    save_thresholds(path, fit_threshold([0.7], [0.5]), fit_threshold([3.0], [-5.0]), margin=0.05)
+    assert json.loads(path.read_text())["rerank"]["negatives_blocked"] == 1
+
+    gate = RelevanceGate.load(path)
+    assert abs(gate.dense_min - 0.6) < 1e-9
+    assert gate.rerank_min == -1.0
@@ -0,0 +1,79 @@
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from backend.app.retrieval_eval import (
+    compare,
+    latency_percentiles,
+    ndcg_at_k,
+    ranked_sections,
+    reciprocal_rank,
+    recall_at_k,
+    summarize,
+)
+
+TESTS_DIR = Path(__file__).resolve().parent
+BENCHMARK = TESTS_DIR / "retrieval_benchmark.json"
+CORPUS = TESTS_DIR.parent / "data" / "final" / "legali_corpus.json"
+
+
+def test_ranked_sections_dedupes_chunks():
+    hits = [
+        {"metadata": {"act": "BNS", "section_number": "103"}},
+        {"metadata": {"act": "BNS", "section_number": "103"}},
+        {"metadata": {"act": "BNS", "number": 101}},
+        {"metadata": None},
+    ]
+    assert ranked_sections(hits) == ["BNS:103", "BNS:101", ":"]
+
+
+def test_recall_mrr_ndcg():
+    ranked = ["BNS:1", "BNS:103", "BNS:2", "BNS:101"]
+    expected = ["BNS:101", "BNS:103"]
+    assert recall_at_k(ranked, expected, 1) == 0.0
+    assert recall_at_k(ranked, expected, 2) == 0.5
+    assert recall_at_k(ranked, expected, 10) == 1.0
+    assert reciprocal_rank(ranked, expected) == 0.5
+    assert reciprocal_rank(["BNS:9"], expected) == 0.0
+
+    dcg = 1 / math.log2(3) + 1 / math.log2(5)
+    ideal = 1 + 1 / math.log2(3)
+    assert ndcg_at_k(ranked, expected, 10) == pytest.approx(dcg / ideal)
+    assert ndcg_at_k(["BNS:103", "BNS:101"], expected, 10) == pytest.approx(1.0)
+    assert ndcg_at_k(ranked, expected, 1) == 0.0
+
+
+def test_latency_percentiles():
+    samples = list(range(1, 101))
+    assert latency_percentiles(samples) == {"p50": 50.5, "p95": 95.05, "p99": 99.01}
+    assert latency_percentiles([]) == {}
+
+
+def test_summarize_and_compare_flag_regressions():
+    expected = [["BNS:103"], ["BSA:63"]]
+    good = summarize([["BNS:103"], ["BSA:63"]], expected, {"total": [10.0, 20.0], "rerank": [5.0, 6.0]})
+    assert good["recall@1"] == 1.0 and good["mrr"] == 1.0 and good["ndcg@10"] == 1.0
+    assert good["queries"] == 2
+    assert set(good["latency_ms"]) == {"rerank", "total"}
+
+    worse = summarize([["BNS:103"], ["BSA:1", "BSA:63"]], expected, {"total": [10.0, 30.0]})
+    assert worse["recall@1"] == 0.5 and worse["recall@3"] == 1.0 and worse["mrr"] == 0.75
+
+    lines, regressions = compare({"configs": {"dense": worse, "bm25": good}}, {"configs": {"dense": good}})
+    assert "bm25: new configuration" in lines
+    assert any(line.startswith("dense recall@1: 1.0000 -> 0.5000") for line in regressions)
+    assert not any("recall@3" in line for line in regressions)
+    assert compare({"configs": {"dense": good}}, {"configs": {"dense": good}})[1] == []
+
+
+def test_benchmark_labels_exist_in_corpus():
+    with open(BENCHMARK, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        sections = {f"{r['act']}:{r['number']}" for r in json.load(f)}
+    assert len(items) >= 30
+    for item in items:
+        assert item["query"] and item["expected"]
+        assert set(item["expected"]) <= sections, item
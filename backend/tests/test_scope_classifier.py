@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.scope_classifier import (
+    ScopeClassifier,
+    cross_val_probabilities,
+    pick_threshold,
+    precision_recall,
+    train_logistic,
+)
+
+SCOPE_DATASET = Path(__file__).resolve().parent / "scope_dataset.json"
+
+
+def clusters(n=40, dim=16, seed=0):
+    """Unit vectors around two directions: label 0 (in scope) and 1 (out of scope)."""
+    rng = np.random.default_rng(seed)
+    centres = np.eye(dim)[:2]
+    y = np.arange(n) % 2
+    X = centres[y] + rng.normal(scale=0.3, size=(n, dim))
+    return X / np.linalg.norm(X, axis=1, keepdims=True), y
+
+
+def test_logistic_model_separates_clusters():
+    X, y = clusters()
+    weights, bias = train_logistic(X, y)
+    classifier = ScopeClassifier(weights, bias, threshold=0.5)
+    predicted = np.array([classifier.probability(x) >= 0.5 for x in X])
+    assert (predicted == y.astype(bool)).all()
+
+    probs = cross_val_probabilities(X, y, folds=4)
+    assert precision_recall(probs, y, 0.5) == (1.0, 1.0)
+
+
+def test_precision_recall_and_threshold_choice():
+    probs = [0.1, 0.4, 0.6, 0.7, 0.9]
+    y = [0, 1, 0, 1, 1]
+    assert precision_recall(probs, y, 0.5) == (2 / 3, 2 / 3)
+    assert precision_recall(probs, y, 0.95) == (1.0, 0.0)
+    # Lowest threshold that refuses no in-scope question
+    assert pick_threshold(probs, y, min_precision=1.0) == 0.7
+    assert pick_threshold([0.9], [0], min_precision=1.0) == 1.0
+
+
+def test_classifier_blocks_and_round_trips(tmp_path):
+    classifier = ScopeClassifier([2.0, -2.0], 0.0, threshold=0.8)
+    assert classifier.blocks([1.0, 0.0]) == "p(out of scope) 0.881 >= 0.800"
+    assert classifier.blocks([0.0, 1.0]) is None
+
+    path = tmp_path / "scope.json"
+    classifier.save(path, report={"precision": 1.0})
+    loaded = ScopeClassifier.load(path)
+    assert loaded.threshold == 0.8
+    assert np.allclose(loaded.weights, [2.0, -2.0])
+    assert json.loads(path.read_text())["report"] == {"precision": 1.0}
+
+
+def test_untrained_classifier_is_inactive(tmp_path):
+    classifier = ScopeClassifier.load(tmp_path / "missing.json")
+    assert not classifier.enabled
+    assert classifier.blocks([1.0, 0.0]) is None
+
+
+def test_scope_dataset_is_labelled_and_balanced():
+    with open(SCOPE_DATASET, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    questions = [item["question"] for item in items]
+    assert len(set(questions)) == len(questions)
+    out_of_scope = sum(not item["in_scope"] for item in items)
+    assert 0.3 < out_of_scope / len(items) < 0.7
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.app.section_index import SectionIndex, section_key
+from backend.app.vector_index import NumpyIndex
+
+# (act, number, title, chunk texts)
+SECTIONS = [
+    ("BNS", "103", "Punishment for murder", ["Whoever commits murder shall be punished with death", "or imprisonment for life"]),
+    ("BNS", "303", "Theft", ["Whoever commits theft shall be punished", "with imprisonment up to three years"]),
+    ("BNSS", "173", "Information in cognizable cases", ["Every information relating to a cognizable offence"]),
+    ("BSA", "63", "Admissibility of electronic records", ["Any information contained in an electronic record"]),
+]
+
+
+def make_corpus(dim=8, seed=0):
+    """One random direction per section; its chunks are small perturbations of it."""
+    rng = np.random.default_rng(seed)
+    ids, vectors, docs, metadatas = [], [], [], []
+    directions = rng.normal(size=(len(SECTIONS), dim)).astype(np.float32)
+    for (act, number, title, texts), direction in zip(SECTIONS, directions):
+        for i, text in enumerate(texts):
+            cid = f"{act}-{number}-{i}"
+            meta = {"act": act, "section_number": number, "title": title, "chunk_index": i}
+            ids.append(cid)
+            vectors.append(direction + rng.normal(scale=0.05, size=dim))
+            metadatas.append(meta)
+            docs.append(SimpleNamespace(page_content=text, metadata=dict(meta, id=cid)))
+    index = NumpyIndex(ids, np.asarray(vectors, dtype=np.float32), [d.page_content for d in docs], metadatas,
+                       normalized=False)
+    return index, docs, directions
+
+
+def test_section_key_accepts_both_metadata_shapes():
+    assert section_key({"act": "BNS", "section_number": "103"}) == ("BNS", "103")
+    assert section_key({"act": "BNS", "number": 103}) == ("BNS", "103")
+    assert section_key(None) == ("", "")
+
+
+def test_build_groups_chunks_by_section():
+    index, docs, _ = make_corpus()
+    sections = SectionIndex.build(index, docs)
+
+    assert len(sections) == len(SECTIONS)
+    murder = sections.keys.index(("BNS", "103"))
+    assert sections.titles[murder] == "Punishment for murder"
+    assert [index.ids[r] for r in sections.dense_rows([murder])] == ["BNS-103-0", "BNS-103-1"]
+    assert [docs[d].metadata["id"] for d in sections.bm25_doc_ids([murder])] == ["BNS-103-0", "BNS-103-1"]
+    assert np.allclose(np.linalg.norm(sections.centroids, axis=1), 1.0, atol=1e-5)
+
+
+def test_select_fuses_dense_and_bm25_and_respects_act():
+    index, docs, directions = make_corpus()
+    sections = SectionIndex.build(index, docs)
+
+    # Dense and lexical evidence agree on the theft section
+    top = sections.select([directions[1]], ["theft punished"], 2)[0]
+    assert sections.keys[top[0]] == ("BNS", "303")
+    assert len(top) == 2
+
+    # Batched: one selection per query
+    tops = sections.select([directions[3], directions[2]], ["electronic record", "cognizable offence"], 1)
+    assert [sections.keys[t[0]] for t in tops] == [("BSA", "63"), ("BNSS", "173")]
+
+    only_bnss = sections.select([directions[0]], ["murder"], 3, act="BNSS")[0]
+    assert [sections.keys[s] for s in only_bnss] == [("BNSS", "173")]
+    assert sections.select([directions[0]], ["murder"], 3, act="IT Act") == [[]]
+
+
+def test_chunk_search_is_restricted_to_selected_sections():
+    index, docs, directions = make_corpus()
+    sections = SectionIndex.build(index, docs)
+    chosen = [sections.keys.index(("BNSS", "173")), sections.keys.index(("BSA", "63"))]
+
+    # The query points at murder, but only the chosen sections' chunks are eligible
+    hits = index.query_rows([directions[0]], 10, sections.dense_rows(chosen))[0]
+    assert {h["id"] for h in hits} == {"BNSS-173-0", "BSA-63-0"}
+    assert sections.dense_rows([]).size == 0
@@ -0,0 +1,89 @@
+import pytest
+
+from backend.app.statute_parser import ACT_SPECS, MISSING_BODY, StatuteParser, parse_act, validate
+
+
+def test_bns_inline_titles_and_bisect_chapters():
+    text = (
+        "THE BHARATIYA NYAYA SANHITA, 2023 ARRANGEMENT OF SECTIONS 1. Short title. "
+        "THE BHARATIYA NYAYA SANHITA, 2023 CHAPTER I PRELIMINARY "
+        "1. Short title.—(1) This Sanhita may be called. "
+        "2. Definitions.—In this Sanhita. "
+        "CHAPTER II OF PUNISHMENTS 3. Punishments.—The punishments are."
+    )
+    sections, records = parse_act("bns", text)
+    assert [s["number"] for s in sections] == [1, 2, 3]
+    assert records[0] == {
+        "chapter": "CHAPTER I PRELIMINARY",
+        "section_number": 1,
+        "section_title": "Short title.",
+        "text": "(1) This Sanhita may be called.",
+    }
+    assert records[2]["chapter"] == "CHAPTER II OF PUNISHMENTS"
+    assert records[2]["section_title"] == "Punishments."
+
+
+def test_bns_is_strict_about_body_start_and_chapters():
+    # Only the TOC copy of the title: fails instead of parsing the arrangement as the body
+    with pytest.raises(RuntimeError, match="Cannot locate body"):
+        parse_act("bns", "THE BHARATIYA NYAYA SANHITA, 2023 ARRANGEMENT OF SECTIONS 1. Short title.—x.")
+    with pytest.raises(RuntimeError, match="No chapters detected"):
+        parse_act("bns", (
+            "THE BHARATIYA NYAYA SANHITA, 2023 ARRANGEMENT "
+            "THE BHARATIYA NYAYA SANHITA, 2023 1. Short title.—(1) This Sanhita may be called."
+        ))
+
+
+def test_bsa_chapter_heading_cuts_section_and_labels_next():
+    text = (
+        "ARRANGEMENT 1. Short title. 2. Interpretation. "
+        "1. Short title, extent.— This Adhiniyam. 2. Interpretation.— In this Adhiniyam. "
+        "CHAPTER II RELEVANCY OF FACTS 3. Evidence may be given.— Evidence."
+    )
+    sections, _ = parse_act("bsa", text)
+    assert [(s["number"], s["chapter"]) for s in sections] == [
+        (1, "CHAPTER I PRELIMINARY"),
+        (2, "CHAPTER I PRELIMINARY"),
+        (3, "CHAPTER II RELEVANCY OF FACTS"),
+    ]
+    assert sections[1]["text"] == "In this Adhiniyam."
+    assert sections[2]["title"] == "Evidence may be given."
+
+
+def test_bnss_titles_from_arrangement_and_missing_clause():
+    text = (
+        "ARRANGEMENT OF CLAUSES CHAPTER I PRELIMINARY 1. Short title. 2. Definitions. "
+        "CHAPTER II COURTS 3. Classes of Courts. 4. Territorial divisions. "
+        "CHAPTER I PRELIMINARY 1. (1) This Sanhita may be called. 2. (1) In this Sanhita. "
+        "CHAPTER II COURTS 4. The State shall be a sessions division."
+    )
+    sections, records = parse_act("bnss", text)
+    assert [s["number"] for s in sections] == [1, 2, 3, 4]
+    assert records[1] == {
+        "chapter": "CHAPTER I",
+        "clause_number": 2,
+        "clause_title": "Definitions",
+        "text": "2. (1) In this Sanhita. CHAPTER II COURTS",
+    }
+    assert records[2]["text"] == MISSING_BODY
+    assert records[2]["clause_title"] == "Classes of Courts"
+    assert records[3]["chapter"] == "CHAPTER II"
+    assert validate(sections, {"name": "test"})["missing_bodies"] == [3]
+
+
+def test_it_act_line_sections():
+    text = "THE ACT\n\n  1. Short title.  \n  body line\n66.\n66A. Punishment for sending.\nmore\n"
+    parser = StatuteParser(ACT_SPECS["it_act"])
+    records = parser.to_records(parser.parse(text))
+    assert [(r["unit_id"], r["title"]) for r in records] == [("1", "Short title."), ("66A", "Punishment for sending.")]
+    assert records[0]["text"] == "1. Short title.\nbody line\n66."
+    assert records[0]["source"] == "Information Technology Act, 2000"
+
+
+def test_validate_reports_gaps_and_rejects_suspicious_counts():
+    sections = [{"number": n, "title": "t", "chapter": "c", "text": "x"} for n in (1, 2, 2, 5)]
+    report = validate(sections, {"name": "test"})
+    assert report["duplicates"] == [2]
+    assert report["gaps"] == [3, 4]
+    with pytest.raises(RuntimeError):
+        validate(sections, {"name": "test", "expected_sections": (10, 20)})
@@ -0,0 +1,55 @@
+import asyncio
+
+try:
+    from app.streaming import SSE_HEARTBEAT, DeltaCoalescer, guard_stream, sse_event
+except ImportError:
+    from backend.app.streaming import SSE_HEARTBEAT, DeltaCoalescer, guard_stream, sse_event
+
+
+class FakeRequest:
+    """Reports a disconnect after `polls` calls to is_disconnected()."""
+
+    def __init__(self, polls):
+        self.polls = polls
+
+    async def is_disconnected(self):
+        self.polls -= 1
+        return self.polls < 0
+
+
+def test_sse_event_format():
+    assert sse_event({"chunk": "hi"}) == 'data: {"chunk": "hi"}\n\n'
+
+
+def test_coalescer_flushes_by_size():
+    coalescer = DeltaCoalescer(max_chars=5, max_delay=60)
+    released = [coalescer.push(c) for c in "abcdefg"]
+    assert released == [None, None, None, None, "abcde", None, None]
+    assert coalescer.flush() == "fg"
+    assert coalescer.flush() is None
+
+
+def test_guard_stream_heartbeat_and_disconnect_closes_source():
+    closed = []
+
+    async def source():
+        try:
+            yield "first"
+            await asyncio.sleep(30)
+            yield "never"
+        finally:
+            closed.append(True)
+
+    async def run():
+        frames = []
+        async for frame in guard_stream(
+            source(), FakeRequest(polls=5), heartbeat_interval=0.05, poll_interval=0.02
+        ):
+            frames.append(frame)
+        return frames
+
+    frames = asyncio.run(run())
+    assert frames[0] == "first"
+    assert SSE_HEARTBEAT in frames
+    assert "never" not in frames
+    assert closed == [True]
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+
+from backend.app import tracing
+from backend.app.tracing import Counter, Histogram, current_trace, set_status, span, start_trace
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    histogram = Histogram("t_seconds", "Test latency.", ["stage"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, "bm25")
+    histogram.observe(0.5, "bm25")
+    counter = Counter("t_total", "Test count.", ["status"])
+    counter.inc('say "hi"')
+
+    assert histogram.render() == [
+        "# HELP t_seconds Test latency.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{stage="bm25",le="0.1"} 1',
+        't_seconds_bucket{stage="bm25",le="1"} 2',
+        't_seconds_bucket{stage="bm25",le="+Inf"} 2',
+        't_seconds_sum{stage="bm25"} 0.550000',
+        't_seconds_count{stage="bm25"} 2',
+    ]
+    assert counter.render()[-1] == 't_total{status="say \\"hi\\""} 1'
+
+
+def test_spans_are_recorded_on_the_current_trace():
+    assert current_trace() is None
+    with start_trace("trace-1", "query") as trace:
+        assert current_trace() is trace
+        with span("embedding", queries=1):
+            pass
+        build = span("context_build")
+        build.end(chars=120)
+        build.end()  # recorded once
+        set_status("blocked")
+    assert current_trace() is None
+
+    assert [s["stage"] for s in trace.spans] == ["embedding", "context_build"]
+    assert trace.spans[0]["queries"] == 1 and trace.spans[1]["chars"] == 120
+    assert set(trace.breakdown()) == {"embedding", "context_build"}
+    assert tracing.REQUESTS.values[("query", "blocked")] >= 1
+
+
+def test_trace_follows_async_generator_and_worker_threads():
+    async def stream():
+        with start_trace("trace-2", "stream"):
+            with span("router"):
+                await asyncio.sleep(0)
+            yield current_trace()
+            # Context (and so the trace) is copied into to_thread workers
+            await asyncio.to_thread(lambda: span("rerank").end())
+            yield current_trace()
+
+    async def consume():
+        return [t async for t in stream()]
+
+    first, second = asyncio.run(consume())
+    assert first is second
+    assert [s["stage"] for s in first.spans] == ["router", "rerank"]
+
+
+def test_slow_requests_are_logged_with_spans(monkeypatch):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    slow_logger = logging.getLogger("LEGALI.slow")
+    slow_logger.addHandler(handler)
+    monkeypatch.setattr(tracing, "SLOW_REQUEST_MS", 0.0)
+    try:
+        with start_trace("trace-3", "query"):
+            with span("llm_total", model="m"):
+                pass
+    finally:
+        slow_logger.removeHandler(handler)
+
+    [record] = [r for r in records if r.name == "LEGALI.slow"]
+    assert record.trace_id == "trace-3"
+    assert record.fields["spans"][0]["stage"] == "llm_total"
+    assert record.fields["spans"][0]["model"] == "m"
+    assert "llm_total" in record.fields["stages"]
+
+
+def test_error_status_on_exception():
+    try:
+        with start_trace("trace-4", "search"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert tracing.REQUESTS.values[("search", "error")] >= 1
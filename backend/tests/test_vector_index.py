@@ -0,0 +1,217 @@
+import logging
+
+import numpy as np
+import pytest
+
+from backend.app.vector_index import ChromaIndex, Int8Index, NumpyIndex, build_vector_index
+
+
+class FakeCollection:
+    """Minimal stand-in for a Chroma collection (paged get + count)."""
+
+    def __init__(self, ids, vectors, documents, metadatas):
+        self.ids, self.vectors, self.documents, self.metadatas = ids, vectors, documents, metadatas
+
+    def count(self):
+        return len(self.ids)
+
+    def get(self, include, limit, offset):
+        sl = slice(offset, offset + limit)
+        return {
+            "ids": self.ids[sl],
+            "embeddings": [list(v) for v in self.vectors[sl]],
+            "documents": self.documents[sl],
+            "metadatas": self.metadatas[sl],
+        }
+
+
+def make_corpus(n=50, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    ids = [f"C-{i}" for i in range(n)]
+    metadatas = [{"act": "BNS" if i % 2 else "BSA", "number": str(i)} for i in range(n)]
+    documents = [f"text {i}" for i in range(n)]
+    return ids, vectors, documents, metadatas
+
+
+def brute_force(vectors, query, k, rows=None):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    sims = unit @ (query / np.linalg.norm(query))
+    candidates = range(len(vectors)) if rows is None else rows
+    return sorted(candidates, key=lambda r: -sims[r])[:k]
+
+
+def test_exact_search_matches_brute_force_for_unnormalized_rows():
+    ids, vectors, documents, metadatas = make_corpus()
+    index = NumpyIndex(ids, vectors, documents, metadatas, normalized=False)
+    query = vectors[7] + 0.01
+
+    hits = index.query([query], 5)[0]
+    assert [h["id"] for h in hits] == [ids[r] for r in brute_force(vectors, query, 5)]
+    assert hits[0]["metadata"]["id"] == hits[0]["id"]
+    assert hits[0]["distance"] == pytest.approx(0.0, abs=1e-3)
+    assert [h["distance"] for h in hits] == sorted(h["distance"] for h in hits)
+
+
+def test_unit_rows():
+    ids, vectors, documents, metadatas = make_corpus(n=9)
+    index = NumpyIndex(ids, vectors, documents, metadatas, normalized=False)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.testing.assert_allclose(index.unit_rows(), unit, rtol=1e-5)
+    np.testing.assert_allclose(index.unit_rows(np.array([5, 2])), unit[[5, 2]], rtol=1e-5)
+
+
+def test_act_filter_and_k_larger_than_corpus():
+    ids, vectors, documents, metadatas = make_corpus(n=9)
+    index = NumpyIndex(ids, vectors, documents, metadatas, normalized=False)
+    bsa_rows = [i for i, m in enumerate(metadatas) if m["act"] == "BSA"]
+
+    hits = index.query([vectors[0], vectors[1]], 100, act="BSA")
+    assert len(hits) == 2
+    assert [h["id"] for h in hits[1]] == [ids[r] for r in brute_force(vectors, vectors[1], 100, bsa_rows)]
+    assert {h["metadata"]["act"] for h in hits[0]} == {"BSA"}
+    assert index.query([vectors[0]], 5, act="IT") == [[]]
+
+
+def test_from_collection_save_and_mmap_load(tmp_path):
+    ids, vectors, documents, metadatas = make_corpus(n=25)
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+
+    exported = NumpyIndex.from_collection(collection, batch_size=10)
+    assert exported.ids == ids and len(exported) == 25
+
+    exported.save(tmp_path / "index")
+    loaded = NumpyIndex.load(tmp_path / "index", mmap=True)
+    assert isinstance(loaded.matrix, np.memmap)
+    query = vectors[3]
+    assert [h["id"] for h in loaded.query([query], 4)[0]] == [h["id"] for h in exported.query([query], 4)[0]]
+
+
+def test_backend_selection(monkeypatch):
+    ids, vectors, documents, metadatas = make_corpus(n=5)
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+    monkeypatch.delenv("LEGALI_VECTOR_INDEX", raising=False)
+
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "chroma")
+    assert isinstance(build_vector_index(collection), ChromaIndex)
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "auto")
+    monkeypatch.setenv("LEGALI_NUMPY_MAX_ROWS", "4")
+    assert isinstance(build_vector_index(collection), ChromaIndex)
+    monkeypatch.setenv("LEGALI_NUMPY_MAX_ROWS", "10")
+    assert isinstance(build_vector_index(collection), NumpyIndex)
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "faiss")
+    with pytest.raises(ValueError):
+        build_vector_index(collection)
+
+
+def test_int8_quantization_roundtrip_error_is_bounded():
+    _, vectors, _, _ = make_corpus(n=200, dim=32)
+    codes, scale, offset = Int8Index.quantize(vectors)
+    assert codes.dtype == np.int8
+    restored = (codes.astype(np.float32) + 128) * scale + offset
+    assert np.max(np.abs(restored - vectors)) <= scale.max() / 2 + 1e-6
+
+
+def test_int8_index_recall_and_exact_rescoring(tmp_path):
+    ids, vectors, documents, metadatas = make_corpus(n=400, dim=32, seed=3)
+    exact = NumpyIndex(ids, vectors, documents, metadatas, normalized=False)
+    int8 = Int8Index.from_index(exact)
+    assert int8.nbytes < np.asarray(vectors, dtype=np.float32).nbytes / 3
+
+    rng = np.random.default_rng(5)
+    queries = vectors[rng.choice(400, 20, replace=False)] + rng.normal(scale=0.3, size=(20, 32))
+    approx = int8.query(list(queries), 10)
+    truth = exact.query(list(queries), 10)
+    overlap = np.mean([len({h["id"] for h in a} & {h["id"] for h in t}) / 10 for a, t in zip(approx, truth)])
+    assert overlap >= 0.95
+    # Distances come from the full-precision rescoring, not the codes
+    for a, t in zip(approx, truth):
+        if a[0]["id"] == t[0]["id"]:
+            assert a[0]["distance"] == pytest.approx(t[0]["distance"], abs=1e-5)
+
+    int8.save(tmp_path / "q")
+    loaded = Int8Index.load(tmp_path / "q")
+    assert isinstance(loaded.matrix, np.memmap)
+    assert [h["id"] for h in loaded.query([queries[0]], 5, act="BNS")[0]] == \
+        [h["id"] for h in int8.query([queries[0]], 5, act="BNS")[0]]
+
+
+def test_int8_backend_builds_then_reuses_saved_index(monkeypatch, tmp_path):
+    ids, vectors, documents, metadatas = make_corpus(n=30)
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "int8")
+    monkeypatch.setenv("LEGALI_VECTOR_INDEX", str(tmp_path / "idx"))
+
+    built = build_vector_index(collection)
+    assert isinstance(built, Int8Index) and len(built) == 30
+    assert (tmp_path / "idx.int8.npy").exists()
+    again = build_vector_index(collection)
+    assert isinstance(again.matrix, np.memmap)
+
+
+def _reingest(collection, row, rehash=True):
+    """Same ids and row count; one chunk gets new text, vector and (with `rehash`) content hash."""
+    collection.documents = list(collection.documents)
+    collection.documents[row] = "rewritten text"
+    collection.vectors = collection.vectors.copy()
+    collection.vectors[row] = -collection.vectors[row]
+    collection.metadatas = [dict(m) for m in collection.metadatas]
+    if rehash:
+        collection.metadatas[row]["content_hash"] = "changed"
+
+
+def test_int8_index_is_rebuilt_when_chunks_change_but_count_does_not(monkeypatch, tmp_path):
+    ids, vectors, documents, metadatas = make_corpus(n=30)
+    metadatas = [dict(m, content_hash=f"h{i}") for i, m in enumerate(metadatas)]
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "int8")
+    monkeypatch.setenv("LEGALI_VECTOR_INDEX", str(tmp_path / "idx"))
+    build_vector_index(collection)
+    _reingest(collection, 4)
+    rebuilt = build_vector_index(collection)
+    assert rebuilt.documents[4] == "rewritten text"
+    assert rebuilt.query([-vectors[4]], 1)[0][0]["id"] == ids[4]
+
+
+def test_int8_index_is_rebuilt_when_unhashed_text_changes(monkeypatch, tmp_path):
+    # auto_ingest rows carry no content hash and keep their ids across runs
+    ids, vectors, documents, metadatas = make_corpus(n=30)
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "int8")
+    monkeypatch.setenv("LEGALI_VECTOR_INDEX", str(tmp_path / "idx"))
+    build_vector_index(collection)
+    _reingest(collection, 4, rehash=False)
+    rebuilt = build_vector_index(collection)
+    assert rebuilt.documents[4] == "rewritten text"
+    assert rebuilt.query([-vectors[4]], 1)[0][0]["id"] == ids[4]
+
+
+def test_saved_numpy_index_is_reexported_when_chunks_change(monkeypatch, tmp_path):
+    ids, vectors, documents, metadatas = make_corpus(n=30)
+    metadatas = [dict(m, content_hash=f"h{i}") for i, m in enumerate(metadatas)]
+    collection = FakeCollection(ids, vectors, documents, metadatas)
+
+    monkeypatch.setenv("LEGALI_VECTOR_BACKEND", "numpy")
+    monkeypatch.setenv("LEGALI_VECTOR_INDEX", str(tmp_path / "exact"))
+    NumpyIndex.from_collection(collection).save(tmp_path / "exact", model="test-model")
+    assert isinstance(build_vector_index(collection).matrix, np.memmap)
+    _reingest(collection, 7)
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("LEGALI")
+    logger.addHandler(handler)
+    try:
+        fresh = build_vector_index(collection)
+        # The fresh export was written back: the next startup memory-maps it without a warning
+        again = build_vector_index(collection)
+    finally:
+        logger.removeHandler(handler)
+    assert not isinstance(fresh.matrix, np.memmap)
+    assert fresh.documents[7] == "rewritten text"
+    assert isinstance(again.matrix, np.memmap)
+    assert again.documents[7] == "rewritten text" and again.model == "test-model"
+    assert [r.levelname for r in records] == ["WARNING"]
@@ -0,0 +1,76 @@
+import json
+
+from backend.app.xref import XrefIndex, build_xref, extract_references
+
+
+def test_extracts_plain_lists_and_ranges():
+    text = "The exceptions in sections 25, 26 and 27 do not extend to acts under sections 63 to 66."
+    assert extract_references(text, "BNS") == [
+        ("BNS", "25"), ("BNS", "26"), ("BNS", "27"),
+        ("BNS", "63"), ("BNS", "64"), ("BNS", "65"), ("BNS", "66"),
+    ]
+
+
+def test_sub_section_and_suffixed_numbers():
+    text = "subject to sub-section (2) of section 106 and the certificate under section 65B"
+    assert extract_references(text, "BSA") == [("BSA", "106"), ("BSA", "65B")]
+
+
+def test_qualifier_resolves_other_acts_and_drops_outside_statutes():
+    assert extract_references(
+        "in accordance with section 474 of the Bharatiya Nagarik Suraksha Sanhita, 2023", "BNS"
+    ) == [("BNSS", "474")]
+    assert extract_references("as defined in section 74 of this Sanhita", "BNS") == [("BNS", "74")]
+    assert extract_references(
+        "meaning assigned in clause (k) of section 2 of the Transgender Persons (Protection of Rights) Act, 2019",
+        "BNS",
+    ) == []
+    # Statutes whose names do not end in Act/Code/Sanhita/Adhiniyam are still outside references
+    assert extract_references("under section 173 of the Code of Criminal Procedure, 1973", "BNSS") == []
+    assert extract_references("section 58 of the Code of Civil Procedure, 1908", "BNSS") == []
+    assert extract_references(
+        "exempted under section 17 of the Employees' Provident Funds and Miscellaneous Provisions Act, 1952", "BNS"
+    ) == []
+    # The BNSS text misspells the BSA's name
+    assert extract_references("under section 94 of the Bharatiya Sakshya Adiniyam, 2023", "BNSS") == [("BSA", "94")]
+
+
+def test_chained_references_share_the_trailing_qualifier():
+    text = "an offence under section 64 or section 65 of the Bharatiya Nyaya Sanhita, 2023"
+    assert extract_references(text, "BNSS") == [("BNS", "64"), ("BNS", "65")]
+    # Separated by ordinary prose: not a chain
+    text = "under section 37, to defend his body, and section 2 of the Dowry Prohibition Act, 1961"
+    assert extract_references(text, "BNS") == [("BNS", "37")]
+
+
+def test_build_keeps_edges_between_known_sections_only():
+    records = [
+        {"act": "BNS", "number": 66, "text": "under sub-section (1) of section 64 and section 9999"},
+        {"act": "BNS", "number": 64, "text": "Whoever commits rape. See section 64 and section 66."},
+    ]
+    xref = build_xref(records)
+    assert xref["references"] == {"BNS:66": ["BNS:64"], "BNS:64": ["BNS:66"]}
+    assert xref["referenced_by"] == {"BNS:64": ["BNS:66"], "BNS:66": ["BNS:64"]}
+    assert xref["edges"] == 2
+
+
+def test_index_neighbours_and_budgeted_expansion(tmp_path):
+    path = tmp_path / "xref.json"
+    path.write_text(json.dumps({
+        "references": {"BNS:66": ["BNS:64", "BNS:63"], "BNS:103": ["BNS:101"]},
+        "referenced_by": {"BNS:64": ["BNS:66"], "BNS:63": ["BNS:66"], "BNS:66": ["BNSS:193"]},
+    }), encoding="utf-8")
+    index = XrefIndex.load(path)
+
+    assert len(index) == 3
+    assert index.neighbours("BNS", "66") == {
+        "references": [("BNS", "64"), ("BNS", "63")],
+        "referenced_by": [("BNSS", "193")],
+    }
+    assert index.neighbours("BSA", "1") == {"references": [], "referenced_by": []}
+
+    # Outgoing first, then incoming; sections already retrieved are skipped; budget caps the total
+    assert index.expand([("BNS", "66"), ("BNS", "64")], 2) == [("BNS", "63"), ("BNSS", "193")]
+    assert index.expand([("BNS", "66"), ("BNS", "103")], 10) == [("BNS", "64"), ("BNS", "63"), ("BNSS", "193"), ("BNS", "101")]
+    assert index.expand([("BNS", "66")], 0) == []
+    assert len(XrefIndex.load(tmp_path / "missing.json")) == 0